@@ -0,0 +1,114 @@
+"""
+CLI の起動時間の計測
+
+`corporate-reports` を短いコマンドで繰り返し起動し、インタプリタ単体の起動と
+比べた上乗せ分を測る。--max-overhead-ms を超えたら終了コード 1 で終わるため、
+重いモジュールの読み込みがトップレベルに戻っていないかの確認に使える。
+
+    uv run python benchmarks/bench_cli_startup.py --runs 20 --max-overhead-ms 60
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+VALUATION_INPUT = {
+    "stock_price": 1668,
+    "shares_outstanding": 33794,
+    "shares_unit": "thousands",
+    "bps": 1861.66,
+    "eps_actual": 134.8,
+    "eps_forecast": 163,
+    "dividend_annual": 65,
+    "revenue": 130000,
+    "operating_profit": 7800,
+    "net_income": 5500,
+    "operating_cf": 8781,
+    "fcf": 5800,
+    "net_cash": 5486,
+    "ebitda": 12000,
+    "net_assets": 62918,
+}
+
+# valuation の起動で読み込まれてはいけないモジュール
+HEAVY_MODULES = ("requests", "urllib3", "dotenv", "corporate_reports.edinet")
+
+
+def _median_ms(argv: list[str], runs: int) -> float:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(argv, check=True, capture_output=True)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument(
+        "--max-overhead-ms",
+        type=float,
+        help="インタプリタ単体との差の上限（ミリ秒、超えたら失敗）",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_file = Path(tmp) / "input.json"
+        input_file.write_text(json.dumps(VALUATION_INPUT), encoding="utf-8")
+        commands = {
+            "python -c pass": [sys.executable, "-c", "pass"],
+            "valuation": [
+                sys.executable,
+                "-m",
+                "corporate_reports.cli",
+                "valuation",
+                str(input_file),
+            ],
+            "edinet --help": [
+                sys.executable,
+                "-m",
+                "corporate_reports.cli",
+                "edinet",
+                "--help",
+            ],
+        }
+        results = {name: _median_ms(argv, args.runs) for name, argv in commands.items()}
+
+        probe = (
+            "import runpy, sys\n"
+            f"sys.argv = ['corporate-reports', 'valuation', {str(input_file)!r}]\n"
+            "runpy.run_module('corporate_reports.cli', run_name='__main__')\n"
+        )
+        loaded_check = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                probe + f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules], "
+                "file=sys.stderr)",
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+
+    baseline = results["python -c pass"]
+    for name, ms in results.items():
+        print(f"{name:<16} {ms:8.1f} ms  (+{ms - baseline:6.1f} ms)")
+    loaded = loaded_check.stderr.strip().splitlines()[-1]
+    print(f"heavy modules loaded by valuation: {loaded}")
+
+    overhead = results["valuation"] - baseline
+    if loaded != "[]" or (
+        args.max_overhead_ms is not None and overhead > args.max_overhead_ms
+    ):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
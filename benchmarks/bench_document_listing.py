@@ -0,0 +1,63 @@
+"""
+DocumentListing（転置インデックス）の検索速度の計測
+
+1日分の合成書類一覧を多数の証券コードで検索し、全件走査と比べる。
+
+    uv run python benchmarks/bench_document_listing.py --rows 3000 --codes 500
+"""
+
+import argparse
+import random
+import time
+
+from corporate_reports.edinet import DocumentListing
+
+
+def scan(results: list[dict], sec_code: str, form_code: str) -> list[dict]:
+    """インデックス導入前と同じ全件走査"""
+    prefix = sec_code[:4]
+    results = [r for r in results if r.get("secCode") and r["secCode"][:4] == prefix]
+    return [r for r in results if r.get("formCode") == form_code]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=3000)
+    parser.add_argument("--codes", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    forms = ["030000", "043000", "050000", "010000"]
+    results = [
+        {
+            "docID": f"S1{i:06d}",
+            "secCode": f"{rng.randrange(1000, 10000)}0",
+            "edinetCode": f"E{rng.randrange(100000):05d}",
+            "ordinanceCode": "010",
+            "formCode": rng.choice(forms),
+            "docTypeCode": "120",
+        }
+        for i in range(args.rows)
+    ]
+    codes = [str(rng.randrange(1000, 10000)) for _ in range(args.codes)]
+
+    start = time.perf_counter()
+    expected = [scan(results, code, "030000") for code in codes]
+    scan_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    listing = DocumentListing(results)
+    build_time = time.perf_counter() - start
+    start = time.perf_counter()
+    actual = [listing.query(sec_code=code, form_code="030000") for code in codes]
+    query_time = time.perf_counter() - start
+
+    assert actual == expected
+    print(f"rows={args.rows} codes={args.codes}")
+    print(f"full scan          {scan_time * 1000:8.2f} ms")
+    print(f"index build        {build_time * 1000:8.2f} ms")
+    print(f"index queries      {query_time * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+EDINET クライアントのスループット計測
+
+合成したカセットを MockEdinetServer で配信し、書類一覧検索・逐次ダウンロード・
+一括ダウンロードの所要時間をオフラインで再現性よく測る。
+
+    uv run python benchmarks/bench_edinet_client.py --docs 50 --latency 0.05
+
+実 API で記録したカセットを使う場合は --cassette で指定する
+（`corporate-reports edinet --cassette DIR --record ...` で記録できる）。
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("EDINET_API_KEY", "benchmark")
+
+from corporate_reports.edinet import EdinetClient, RateLimiter
+from corporate_reports.edinet_async import AsyncEdinetClient
+from corporate_reports.edinet_batch import download_batch
+from corporate_reports.edinet_mock import MockEdinetServer
+
+
+def build_cassette(path: Path, dates: int, docs: int, size: int) -> list[str]:
+    """合成カセットを作り、書類管理番号のリストを返す"""
+    (path / "documents").mkdir(parents=True, exist_ok=True)
+    (path / "files").mkdir(exist_ok=True)
+    doc_ids = [f"S1{i:06d}" for i in range(docs)]
+    for d in range(dates):
+        results = [
+            {
+                "docID": f"{doc_id}D{d}",
+                "secCode": f"{1000 + i % 3000}0",
+                "formCode": "030000",
+                "ordinanceCode": "010",
+            }
+            for i, doc_id in enumerate(doc_ids)
+        ]
+        listing = {"metadata": {"status": "200"}, "results": results}
+        (path / "documents" / f"2025-03-{d + 1:02d}.json").write_text(
+            json.dumps(listing), encoding="utf-8"
+        )
+    body = os.urandom(size)
+    for doc_id in doc_ids:
+        (path / "files" / f"{doc_id}_5").write_bytes(body)
+    return doc_ids
+
+
+def _timed(label: str, count: int, func) -> None:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {count:>5} req  {elapsed:8.3f}s  {count / elapsed:8.1f} req/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cassette", help="既存のカセット（省略時は合成）")
+    parser.add_argument("--dates", type=int, default=5)
+    parser.add_argument("--docs", type=int, default=50)
+    parser.add_argument("--size", type=int, default=64 * 1024, help="書類のバイト数")
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--rate", type=float, default=1000.0, help="クライアント側の毎秒リクエスト数"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        os.environ["EDINET_CACHE_DIR"] = str(tmp_path / "cache")
+        if args.cassette:
+            cassette = Path(args.cassette)
+            dates = sorted(p.stem for p in (cassette / "documents").glob("*.json"))
+            doc_ids = sorted(
+                {p.name.rsplit("_", 1)[0] for p in (cassette / "files").glob("*_5")}
+            )
+        else:
+            cassette = tmp_path / "cassette"
+            doc_ids = build_cassette(cassette, args.dates, args.docs, args.size)
+            dates = [f"2025-03-{d + 1:02d}" for d in range(args.dates)]
+
+        with MockEdinetServer(
+            cassette, latency=args.latency, error_rate=args.error_rate, retry_after=None
+        ) as server:
+
+            def make_client() -> EdinetClient:
+                return EdinetClient(
+                    base_url=server.base_url,
+                    pool_size=args.concurrency,
+                    rate_limiter=RateLimiter(rate=args.rate, burst=args.concurrency),
+                )
+
+            with make_client() as client:
+                _timed(
+                    "search (no cache)",
+                    len(dates),
+                    lambda: [
+                        client.search_documents(d, sec_code="1000", use_cache=False)
+                        for d in dates
+                    ],
+                )
+                _timed(
+                    "search (cached)",
+                    len(dates),
+                    lambda: [
+                        client.search_documents(d, sec_code="1000") for d in dates
+                    ],
+                )
+                _timed(
+                    "download (serial)",
+                    len(doc_ids),
+                    lambda: [
+                        client.download_document(
+                            doc_id, "5", str(tmp_path / "serial" / f"{doc_id}.zip")
+                        )
+                        for doc_id in doc_ids
+                    ],
+                )
+
+            async_client = AsyncEdinetClient(
+                make_client(), max_concurrency=args.concurrency
+            )
+            _timed(
+                f"download-batch (x{args.concurrency})",
+                len(doc_ids),
+                lambda: download_batch(
+                    doc_ids, "5", tmp_path / "batch", client=async_client
+                ),
+            )
+            print(f"server stats: {server.stats}")
+
+
+if __name__ == "__main__":
+    main()
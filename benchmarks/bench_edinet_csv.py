@@ -0,0 +1,172 @@
+"""
+EDINET CSV 読み込みの速度とピークメモリの計測
+
+テキストブロックを含む合成の有価証券報告書 CSV（UTF-16LE TSV）を作り、
+全行を読む場合と経営指標等の要素だけに絞って読む場合を、csv モジュールで
+1行ずつ読む方法、一括デコードして分割する方法（bulk=True）、バイナリのまま読んで
+テキストブロックの値を参照（TextBlockRef）にする方法とで比べる。
+抽出結果キャッシュに当たった場合の時間も計る。--csv で実際の有報 CSV も計れる。
+
+    uv run python benchmarks/bench_edinet_csv.py --rows 50000 --textblock-kb 20
+    uv run python benchmarks/bench_edinet_csv.py --csv path/to/jpcrp030000-asr-*.csv
+"""
+
+import argparse
+import csv
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from corporate_reports.edinet import (
+    _SUMMARY_ELEMENT_IDS,
+    extract_financial_data,
+    iter_edinet_binary,
+    iter_edinet_csv,
+)
+
+HEADER = [
+    "\ufeff要素ID",
+    "項目名",
+    "コンテキストID",
+    "相対年度",
+    "連結・個別",
+    "期間・時点",
+    "ユニットID",
+    "単位",
+    "値",
+]
+CONTEXTS = [
+    "Prior4YearDuration",
+    "Prior3YearDuration",
+    "Prior2YearDuration",
+    "Prior1YearDuration",
+    "CurrentYearDuration",
+    "CurrentYearInstant_NonConsolidatedMember",
+]
+
+
+def make_sample_csv(dirpath: Path, rows: int, textblock_kb: int) -> Path:
+    """合成の jpcrp030000-asr-*.csv を書き出す"""
+    rng = random.Random(0)
+    path = dirpath / "jpcrp030000-asr-001_E00000-000_2024-12-31_01_2025-03-21.csv"
+    summary = sorted(_SUMMARY_ELEMENT_IDS)
+    text = "あ" * (textblock_kb * 1024 // 2)
+    with open(path, "w", encoding="utf-16le", newline="") as f:
+        writer = csv.writer(f, delimiter="\t", quoting=csv.QUOTE_ALL)
+        writer.writerow(HEADER)
+        for i in range(rows):
+            context = rng.choice(CONTEXTS)
+            if i % 50 == 0:
+                row = [
+                    f"jpcrp_cor:Note{i}TextBlock",
+                    "注記",
+                    context,
+                    "",
+                    "",
+                    "",
+                    "",
+                    "",
+                    text,
+                ]
+            elif i < len(summary) * len(CONTEXTS):
+                elem = summary[i % len(summary)]
+                context = CONTEXTS[i // len(summary)]
+                row = [elem, "経営指標等", context, "", "", "期間", "JPY", "円", str(i)]
+            else:
+                row = [
+                    f"jppfs_cor:Item{i % 3000}",
+                    "項目",
+                    context,
+                    "",
+                    "",
+                    "期間",
+                    "JPY",
+                    "円",
+                    str(rng.randrange(10**9)),
+                ]
+            writer.writerow(row)
+    return path
+
+
+def _measure(label: str, func) -> None:
+    # 時間は tracemalloc なしで計り、ピークメモリは別に計る
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{label:<28} {elapsed * 1000:9.1f} ms  peak {peak / 1024 / 1024:8.2f} MiB  ({result})"
+    )
+
+
+def _read_binary(path: Path, elements=None, text_pattern=None) -> int:
+    with open(path, "rb") as raw:
+        rows = iter_edinet_binary(raw, elements, text_pattern, path=str(path))
+        return len(list(rows))
+
+
+def _measure_reads(path: Path) -> None:
+    for bulk in (False, True):
+        mode = "bulk" if bulk else "csv"
+        _measure(
+            f"all rows (list, {mode})",
+            lambda: f"{len(list(iter_edinet_csv(path, bulk=bulk)))} rows",
+        )
+        _measure(
+            f"summary elements ({mode})",
+            lambda: (
+                f"{sum(1 for _ in iter_edinet_csv(path, _SUMMARY_ELEMENT_IDS, bulk=bulk))} rows"
+            ),
+        )
+    # テキストブロックの値を TextBlockRef にした場合
+    _measure("all rows (list, binary)", lambda: f"{_read_binary(path)} rows")
+    _measure(
+        "all rows (list, text refs)",
+        lambda: f"{_read_binary(path, text_pattern='*TextBlock')} rows",
+    )
+    _measure(
+        "summary elements (binary)",
+        lambda: f"{_read_binary(path, _SUMMARY_ELEMENT_IDS)} rows",
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--textblock-kb", type=int, default=20)
+    parser.add_argument(
+        "--csv", action="append", default=[], help="計測する実際の CSV（複数可）"
+    )
+    args = parser.parse_args()
+
+    for name in args.csv:
+        path = Path(name)
+        print(f"{path.name}: {path.stat().st_size / 1024 / 1024:.1f} MiB")
+        _measure_reads(path)
+    if args.csv:
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_sample_csv(Path(tmp), args.rows, args.textblock_kb)
+        print(
+            f"{path.name}: {path.stat().st_size / 1024 / 1024:.1f} MiB, {args.rows} rows"
+        )
+        _measure_reads(path)
+        _measure(
+            "extract_financial_data",
+            lambda: "ok" if extract_financial_data(tmp, use_cache=False) else "",
+        )
+        extract_financial_data(tmp)
+        _measure(
+            "extract_financial_data (hit)",
+            lambda: "ok" if extract_financial_data(tmp) else "",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+経営指標等の振り分け（_summarize_rows）の速度の計測
+
+合成の有価証券報告書 CSV の全行を読み込んでおき、要素ID・コンテキストIDを
+行ごとに全コンテキストと照合する従来の方式と、(要素ID, 正規化した
+コンテキスト) の振り分け表を1回引く方式を比べる。
+
+    uv run python benchmarks/bench_summarize.py --rows 50000 --repeat 200
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from bench_edinet_csv import make_sample_csv
+
+from corporate_reports.edinet import (
+    _CONTEXT_YEAR_MAP,
+    _NON_CONSOLIDATED_ELEMENTS,
+    _SUMMARY_ELEMENT_IDS,
+    _SUMMARY_ELEMENTS,
+    _normalize_context,
+    _parse_value,
+    _summarize_rows,
+    iter_edinet_csv,
+)
+
+
+def summarize_rows_loop(rows) -> dict[str, dict]:
+    """比較用: 行ごとに _CONTEXT_YEAR_MAP を走査する従来の実装"""
+    summary: dict[str, dict] = {label: {} for label in _CONTEXT_YEAR_MAP.values()}
+    for row in rows:
+        elem_id = row.element_id
+        context_id = row.context_id
+        if elem_id in _SUMMARY_ELEMENTS:
+            for ctx_prefix, year_label in _CONTEXT_YEAR_MAP.items():
+                if (
+                    context_id.startswith(ctx_prefix)
+                    and "NonConsolidated" not in context_id
+                ):
+                    summary[year_label][_SUMMARY_ELEMENTS[elem_id]] = _parse_value(
+                        row.value
+                    )
+        if elem_id in _NON_CONSOLIDATED_ELEMENTS:
+            for ctx_prefix, year_label in _CONTEXT_YEAR_MAP.items():
+                if (
+                    context_id.startswith(ctx_prefix)
+                    and "NonConsolidated" in context_id
+                ):
+                    summary[year_label][_NON_CONSOLIDATED_ELEMENTS[elem_id]] = (
+                        _parse_value(row.value)
+                    )
+    return summary
+
+
+def _time(label: str, func, rows, repeat: int) -> None:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(rows)
+    elapsed = (time.perf_counter() - start) / repeat
+    print(
+        f"{label:<20} {elapsed * 1000:8.2f} ms/pass  "
+        f"{elapsed / len(rows) * 1e9:7.1f} ns/row"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_sample_csv(Path(tmp), args.rows, textblock_kb=1)
+        all_rows = list(iter_edinet_csv(path))
+        summary_rows = list(iter_edinet_csv(path, _SUMMARY_ELEMENT_IDS))
+
+    for label, rows in (("all rows", all_rows), ("summary rows", summary_rows)):
+        assert summarize_rows_loop(rows) == _summarize_rows(rows)
+        print(f"{label}: {len(rows)} rows")
+        _time("  loop (before)", summarize_rows_loop, rows, args.repeat)
+        _normalize_context.cache_clear()
+        _time("  dispatch table", _summarize_rows, rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
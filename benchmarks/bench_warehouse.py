@@ -0,0 +1,63 @@
+"""
+ファクトウェアハウスの会社横断パネル検索の速度の計測
+
+合成のファクト（会社数 × 書類数 × 要素数 × 5期）を FactWarehouse に登録し、
+「全社の ROE 5年分」のパネルを引く時間を計る。
+
+    uv run python benchmarks/bench_warehouse.py --companies 4000 --filings 5
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from corporate_reports.edinet import _CONTEXT_YEAR_MAP, _SUMMARY_ELEMENTS, EdinetFact
+from corporate_reports.edinet_warehouse import FactWarehouse
+
+
+def populate(
+    warehouse: FactWarehouse, companies: int, filings: int, elements: int
+) -> None:
+    rng = random.Random(0)
+    element_ids = list(_SUMMARY_ELEMENTS) + [
+        f"jppfs_cor:Item{i}" for i in range(max(0, elements - len(_SUMMARY_ELEMENTS)))
+    ]
+    contexts = [f"{prefix}Duration" for prefix in _CONTEXT_YEAR_MAP]
+    for c in range(companies):
+        for year in range(2025 - filings, 2025):
+            label = f"jpcrp030000-asr-001_E{c:05d}-000_{year}-03-31_01_{year}-06-27.csv"
+            facts = [
+                EdinetFact(elem, ctx, "", "", "", "JPY", rng.randrange(10**9))
+                for elem in element_ids
+                for ctx in contexts
+            ]
+            warehouse.add_filing(label, facts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--companies", type=int, default=4000)
+    parser.add_argument("--filings", type=int, default=5)
+    parser.add_argument("--elements", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with FactWarehouse(Path(tmp) / "facts.sqlite3") as warehouse:
+            start = time.perf_counter()
+            populate(warehouse, args.companies, args.filings, args.elements)
+            print(f"ingest: {time.perf_counter() - start:.1f} s  {warehouse.stats()}")
+            for label, kwargs in (
+                ("ROE, all companies, 5 years", {"year_from": 2020}),
+                ("ROE, all companies, 1 year", {"year_from": 2024, "year_to": 2024}),
+                ("ROE, 1 company", {"edinet_codes": ["E00042"]}),
+            ):
+                start = time.perf_counter()
+                rows = warehouse.panel("ROE", **kwargs)
+                elapsed = time.perf_counter() - start
+                print(f"{label:<30} {elapsed * 1000:8.1f} ms  {len(rows)} rows")
+
+
+if __name__ == "__main__":
+    main()
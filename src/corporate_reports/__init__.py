@@ -1,13 +1,51 @@
-from corporate_reports.edinet import (
-    EdinetAPIError,
-    check_api_key,
-    download_document,
-    search_documents,
-)
+"""
+corporate-reports
+
+EDINET 関連の関数は最初に使われたときに読み込む（requests と .env の読み込みを
+valuation / build-report の起動時に発生させないため）。
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from corporate_reports.edinet import (
+        EdinetAPIError,
+        EdinetClient,
+        check_api_key,
+        download_document,
+        search_documents,
+    )
+    from corporate_reports.edinet_index import search_documents_range
+
+# 公開名 → 定義しているモジュール
+_LAZY_ATTRIBUTES = {
+    "EdinetAPIError": "corporate_reports.edinet",
+    "EdinetClient": "corporate_reports.edinet",
+    "check_api_key": "corporate_reports.edinet",
+    "download_document": "corporate_reports.edinet",
+    "search_documents": "corporate_reports.edinet",
+    "search_documents_range": "corporate_reports.edinet_index",
+}
 
 __all__ = [
     "EdinetAPIError",
+    "EdinetClient",
     "check_api_key",
     "download_document",
     "search_documents",
+    "search_documents_range",
 ]
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + __all__)
@@ -3,15 +3,515 @@ corporate-reports CLI エントリポイント
 """
 
 import json
+import os
 import sys
 import argparse
 
-from corporate_reports.edinet import (
-    search_documents,
-    download_document,
-    extract_financial_data,
-    EdinetAPIError,
-)
+
+def _run_edinet(
+    args, edinet_parser, index_parser, codes_parser, warehouse_parser
+) -> None:
+    """edinet サブコマンドを実行（requests などの依存はここで初めて読み込む）"""
+    from corporate_reports.edinet import (
+        EdinetAPIError,
+        EdinetClient,
+        FileRateLimiter,
+        RetryPolicy,
+        download_document,
+        extract_document,
+        extract_financial_data,
+        get_default_client,
+        search_documents,
+        set_default_client,
+    )
+
+    if args.shared_rate_limit or args.max_retries is not None:
+        set_default_client(
+            EdinetClient(
+                rate_limiter=(
+                    FileRateLimiter(args.shared_rate_limit)
+                    if args.shared_rate_limit
+                    else None
+                ),
+                retry=(
+                    RetryPolicy(max_retries=args.max_retries)
+                    if args.max_retries is not None
+                    else None
+                ),
+            )
+        )
+    if args.cassette:
+        from corporate_reports.edinet_mock import use_cassette
+
+        use_cassette(
+            get_default_client(),
+            args.cassette,
+            "record" if args.record else "replay",
+        )
+
+    store_dir = args.store or os.getenv("EDINET_STORE_DIR")
+
+    if args.edinet_command == "search":
+        results = search_documents(
+            date=args.date,
+            sec_code=args.sec_code,
+            ordinance_code=args.ordinance_code,
+            form_code=args.form_code,
+            use_cache=not args.no_cache,
+        )
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+
+    elif args.edinet_command == "extract":
+        if args.facts or args.element_map:
+            from corporate_reports.edinet import extract_facts, load_element_map
+
+            element_map = (
+                load_element_map(args.element_map) if args.element_map else None
+            )
+            if args.doc_id and store_dir:
+                from corporate_reports.edinet_store import BlobStore
+
+                with BlobStore(store_dir) as store:
+                    source = store.fetch(args.doc_id, "5")
+            elif args.doc_id:
+                source = get_default_client().fetch_document(args.doc_id, "5")
+            else:
+                source = args.csv_dir
+            data = extract_facts(source, element_map=element_map)
+            if args.doc_id:
+                member = data["source"].rsplit("!", 1)[-1]
+                data["source"] = f"{args.doc_id}!{member}"
+            data["facts"] = [fact._asdict() for fact in data["facts"]]
+        elif args.doc_id and store_dir:
+            from corporate_reports.edinet_store import BlobStore
+
+            with BlobStore(store_dir) as store:
+                data = extract_document(
+                    args.doc_id, store=store, use_cache=not args.no_cache
+                )
+        elif args.doc_id:
+            data = extract_document(args.doc_id, use_cache=not args.no_cache)
+        else:
+            data = extract_financial_data(
+                csv_dir=args.csv_dir, use_cache=not args.no_cache
+            )
+        output_json = json.dumps(data, ensure_ascii=False, indent=2)
+        if args.output:
+            from pathlib import Path
+
+            out = Path(args.output)
+            out.parent.mkdir(parents=True, exist_ok=True)
+            out.write_text(output_json + "\n", encoding="utf-8")
+            print(
+                json.dumps(
+                    {"status": "success", "file": str(out)},
+                    ensure_ascii=False,
+                )
+            )
+        else:
+            print(output_json)
+
+    elif args.edinet_command == "extract-batch":
+        import glob
+        from pathlib import Path
+
+        from corporate_reports.edinet_batch import extract_batch
+
+        sources = list(args.csv_dirs or [])
+        for pattern in args.glob or []:
+            sources.extend(sorted(glob.glob(pattern)))
+        if args.csv_dirs_file:
+            lines = Path(args.csv_dirs_file).read_text(encoding="utf-8")
+            sources.extend(line.strip() for line in lines.splitlines())
+        sources = [source for source in sources if source]
+        if not sources:
+            raise EdinetAPIError("抽出対象の CSV ディレクトリがありません")
+
+        counts = {"success": 0, "error": 0}
+        for result in extract_batch(sources, max_workers=args.workers):
+            counts[result["status"]] += 1
+            print(json.dumps(result, ensure_ascii=False), flush=True)
+        print(
+            json.dumps(
+                {"status": "error" if counts["error"] else "success", **counts},
+                ensure_ascii=False,
+            ),
+            file=sys.stderr,
+        )
+        if counts["error"]:
+            sys.exit(1)
+
+    elif args.edinet_command == "download":
+        if store_dir:
+            from corporate_reports.edinet_store import BlobStore
+
+            with BlobStore(store_dir) as store:
+                output_path = str(
+                    store.link(args.doc_id, args.type, args.output, mode=args.link)
+                )
+        else:
+            output_path = download_document(
+                doc_id=args.doc_id,
+                doc_type=args.type,
+                output_path=args.output,
+            )
+        print(
+            json.dumps(
+                {"status": "success", "file": output_path},
+                ensure_ascii=False,
+            )
+        )
+
+    elif args.edinet_command == "download-batch":
+        from pathlib import Path
+
+        from corporate_reports.edinet_batch import download_batch
+
+        doc_ids = list(args.doc_ids or [])
+        if args.doc_ids_file:
+            lines = Path(args.doc_ids_file).read_text(encoding="utf-8")
+            doc_ids.extend(line.strip() for line in lines.splitlines())
+        query = {
+            "date_from": args.date_from,
+            "date_to": args.date_to,
+            "sec_code": args.sec_code,
+            "edinet_code": args.edinet_code,
+            "ordinance_code": args.ordinance_code,
+            "form_code": args.form_code,
+            "doc_type_code": args.doc_type_code,
+        }
+        if any(query.values()):
+            from corporate_reports.edinet_index import EdinetIndex
+
+            with EdinetIndex(args.index) as index:
+                doc_ids.extend(r["docID"] for r in index.search(**query))
+        doc_ids = [doc_id for doc_id in doc_ids if doc_id]
+        if not doc_ids:
+            raise EdinetAPIError("ダウンロード対象の書類がありません")
+        if args.latest:
+            from corporate_reports.edinet_index import EdinetIndex
+
+            with EdinetIndex(args.index) as index:
+                doc_ids = index.resolve_latest(doc_ids)
+
+        results = download_batch(
+            doc_ids,
+            doc_type=args.type,
+            output_dir=args.output_dir,
+            max_concurrency=args.concurrency,
+            verify=args.verify,
+            progress=lambda r: print(
+                json.dumps(r, ensure_ascii=False), file=sys.stderr
+            ),
+        )
+        counts = {"downloaded": 0, "skipped": 0, "error": 0}
+        for r in results:
+            counts[r["status"]] += 1
+        print(
+            json.dumps(
+                {
+                    "status": "error" if counts["error"] else "success",
+                    **counts,
+                    "results": results,
+                },
+                ensure_ascii=False,
+                indent=2,
+            )
+        )
+        if counts["error"]:
+            sys.exit(1)
+
+    elif args.edinet_command == "sync":
+        from pathlib import Path
+
+        from corporate_reports.edinet_index import (
+            EdinetIndex,
+            filter_watch_list,
+        )
+
+        watch = list(args.watch)
+        if args.watch_file:
+            lines = Path(args.watch_file).read_text(encoding="utf-8")
+            watch.extend(line.strip() for line in lines.splitlines())
+        watch = [code for code in watch if code]
+
+        filters = {
+            "ordinance_code": args.ordinance_code,
+            "form_code": args.form_code,
+            "doc_type_code": args.doc_type_code,
+        }
+        with EdinetIndex(args.index) as index:
+            summary = index.sync(
+                date_from=args.date_from,
+                progress=lambda date, count: print(
+                    f"{date}: {count}件", file=sys.stderr
+                ),
+            )
+            new_documents = summary.pop("new_documents")
+            matched = filter_watch_list(new_documents, watch, **filters)
+            amendments = index.watched_amendments(new_documents, watch, **filters)
+            matched_ids = list(dict.fromkeys(r["docID"] for r in matched + amendments))
+            # 訂正済みの原本は取得せず、最新の有効な版だけを取得する
+            download_ids = (
+                matched_ids if args.all_versions else index.resolve_latest(matched_ids)
+            )
+        output = {
+            "status": "success",
+            **summary,
+            "new": len(new_documents),
+            "matched": matched_ids,
+        }
+        if download_ids and args.output_dir:
+            from corporate_reports.edinet_batch import download_batch
+
+            results = download_batch(
+                download_ids,
+                doc_type=args.type,
+                output_dir=args.output_dir,
+                max_concurrency=args.concurrency,
+            )
+            output["downloads"] = results
+            if any(r["status"] == "error" for r in results):
+                output["status"] = "error"
+        print(json.dumps(output, ensure_ascii=False, indent=2))
+        if output["status"] == "error":
+            sys.exit(1)
+
+    elif args.edinet_command == "index":
+        from corporate_reports.edinet_index import EdinetIndex
+
+        if args.index_command == "build":
+            with EdinetIndex(args.index) as index:
+                summary = index.build(
+                    date_from=args.date_from,
+                    date_to=args.date_to,
+                    refresh=args.refresh,
+                    progress=lambda date, count: print(
+                        f"{date}: {count}件", file=sys.stderr
+                    ),
+                )
+            print(
+                json.dumps(
+                    {"status": "success", "index": str(index.path), **summary},
+                    ensure_ascii=False,
+                )
+            )
+
+        elif args.index_command == "search":
+            with EdinetIndex(args.index) as index:
+                results = index.search(
+                    date_from=args.date_from,
+                    date_to=args.date_to,
+                    sec_code=args.sec_code,
+                    edinet_code=args.edinet_code,
+                    ordinance_code=args.ordinance_code,
+                    form_code=args.form_code,
+                    doc_type_code=args.doc_type_code,
+                )
+            print(json.dumps(results, ensure_ascii=False, indent=2))
+
+        elif args.index_command == "chain":
+            with EdinetIndex(args.index) as index:
+                original = index.original_doc_id(args.doc_id)
+                chain = index.amendment_chain(args.doc_id)
+                latest = index.latest_effective(args.doc_id)
+            if not chain:
+                raise EdinetAPIError(f"インデックスに書類がありません: {args.doc_id}")
+            print(
+                json.dumps(
+                    {
+                        "original": original,
+                        "latest": latest["docID"] if latest else None,
+                        "chain": chain,
+                    },
+                    ensure_ascii=False,
+                    indent=2,
+                )
+            )
+
+        else:
+            index_parser.print_help()
+            sys.exit(1)
+
+    elif args.edinet_command == "history":
+        import glob
+        from pathlib import Path
+
+        from corporate_reports.edinet_batch import extract_batch
+        from corporate_reports.edinet_history import stitch_history
+
+        extractions = []
+        for json_path in args.json or []:
+            text = Path(json_path).read_text(encoding="utf-8")
+            try:
+                extractions.append(json.loads(text))
+            except ValueError:
+                # extract-batch の NDJSON 出力
+                extractions.extend(
+                    json.loads(line) for line in text.splitlines() if line.strip()
+                )
+        sources = list(args.csv_dirs or [])
+        for pattern in args.glob or []:
+            sources.extend(sorted(glob.glob(pattern)))
+        if sources:
+            extractions.extend(extract_batch(sources, max_workers=args.workers))
+        failed = [e for e in extractions if e.get("status") == "error"]
+        for e in failed:
+            print(json.dumps(e, ensure_ascii=False), file=sys.stderr)
+
+        history = stitch_history(
+            [e for e in extractions if e.get("status") != "error"],
+            edinet_code=args.edinet_code,
+        )
+        output_json = json.dumps(history, ensure_ascii=False, indent=2)
+        if args.output:
+            out = Path(args.output)
+            out.parent.mkdir(parents=True, exist_ok=True)
+            out.write_text(output_json + "\n", encoding="utf-8")
+            print(
+                json.dumps(
+                    {"status": "success", "file": str(out)},
+                    ensure_ascii=False,
+                )
+            )
+        else:
+            print(output_json)
+
+    elif args.edinet_command == "warehouse":
+        from corporate_reports.edinet_warehouse import FactWarehouse
+
+        if args.warehouse_command == "ingest":
+            import glob
+            from pathlib import Path
+
+            sources = list(args.csv_dirs or [])
+            for pattern in args.glob or []:
+                sources.extend(sorted(glob.glob(pattern)))
+            if args.csv_dirs_file:
+                lines = Path(args.csv_dirs_file).read_text(encoding="utf-8")
+                sources.extend(line.strip() for line in lines.splitlines())
+            sources = [source for source in sources if source]
+            if not sources:
+                raise EdinetAPIError("取り込み対象の CSV ディレクトリがありません")
+
+            with FactWarehouse(args.db) as warehouse:
+                summary = warehouse.ingest_many(
+                    sources,
+                    max_workers=args.workers,
+                    refresh=args.refresh,
+                    progress=lambda r: print(
+                        json.dumps(r, ensure_ascii=False), file=sys.stderr
+                    ),
+                )
+            print(
+                json.dumps(
+                    {
+                        "status": "error" if summary["error"] else "success",
+                        "db": str(warehouse.path),
+                        **summary,
+                    },
+                    ensure_ascii=False,
+                )
+            )
+            if summary["error"]:
+                sys.exit(1)
+
+        elif args.warehouse_command == "panel":
+            with FactWarehouse(args.db) as warehouse:
+                rows = warehouse.panel(
+                    args.metric,
+                    year_from=args.year_from,
+                    year_to=args.year_to,
+                    edinet_codes=args.edinet_codes,
+                    non_consolidated=True if args.non_consolidated else None,
+                )
+            if args.wide:
+                wide: dict[str, dict] = {}
+                for row in rows:
+                    wide.setdefault(row["edinetCode"], {})[str(row["fiscalYear"])] = (
+                        row["value"]
+                    )
+                print(json.dumps(wide, ensure_ascii=False, indent=2))
+            else:
+                print(json.dumps(rows, ensure_ascii=False, indent=2))
+
+        elif args.warehouse_command == "filings":
+            with FactWarehouse(args.db) as warehouse:
+                output = {
+                    **warehouse.stats(),
+                    "filings": warehouse.filings(args.edinet_code),
+                }
+            print(json.dumps(output, ensure_ascii=False, indent=2))
+
+        else:
+            warehouse_parser.print_help()
+            sys.exit(1)
+
+    elif args.edinet_command == "codes":
+        from dataclasses import asdict
+
+        from corporate_reports.edinet_codes import (
+            EdinetCodeList,
+            annual_report_window,
+            find_annual_reports,
+        )
+
+        if args.codes_command not in ("lookup", "annual-report"):
+            codes_parser.print_help()
+            sys.exit(1)
+
+        code_list = EdinetCodeList.load(args.code_list)
+        codes = args.codes if args.codes_command == "lookup" else [args.code]
+        filers = []
+        for code in codes:
+            filer = code_list.resolve(code)
+            if filer is None:
+                raise EdinetAPIError(f"コードリストに該当がありません: {code}")
+            filers.append(filer)
+
+        if args.codes_command == "lookup":
+            output = []
+            for filer in filers:
+                entry = asdict(filer)
+                if args.year and filer.fiscal_year_end:
+                    entry["annualReportWindow"] = annual_report_window(filer, args.year)
+                output.append(entry)
+            print(json.dumps(output, ensure_ascii=False, indent=2))
+        else:
+            results = find_annual_reports(
+                filers[0],
+                args.year,
+                progress=lambda date, count: print(
+                    f"{date}: {count}件", file=sys.stderr
+                ),
+            )
+            print(json.dumps(results, ensure_ascii=False, indent=2))
+
+    elif args.edinet_command == "mock-server":
+        from corporate_reports.edinet_mock import MockEdinetServer
+
+        server = MockEdinetServer(
+            args.mock_cassette,
+            host=args.host,
+            port=args.port,
+            latency=args.latency,
+            error_rate=args.error_rate,
+        )
+        print(
+            json.dumps(
+                {"status": "serving", "base_url": server.base_url},
+                ensure_ascii=False,
+            ),
+            flush=True,
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+    else:
+        edinet_parser.print_help()
+        sys.exit(1)
 
 
 def main():
@@ -20,6 +520,33 @@ def main():
 
     # edinet コマンド
     edinet_parser = subparsers.add_parser("edinet", help="EDINET API 操作")
+    edinet_parser.add_argument(
+        "--shared-rate-limit",
+        metavar="LOCK_FILE",
+        help="ロックファイルを介して他プロセスとレートリミットを共有"
+        "（環境変数 EDINET_RATE_LIMIT_FILE でも指定可）",
+    )
+    edinet_parser.add_argument(
+        "--max-retries",
+        type=int,
+        help="429/5xx・接続エラー時の最大再試行回数 (既定: 3)",
+    )
+    edinet_parser.add_argument(
+        "--cassette",
+        metavar="DIR",
+        help="記録済みカセットから応答する（環境変数 EDINET_CASSETTE でも指定可）",
+    )
+    edinet_parser.add_argument(
+        "--record",
+        action="store_true",
+        help="--cassette と併用し、実 API のレスポンスをカセットに記録する",
+    )
+    edinet_parser.add_argument(
+        "--store",
+        metavar="DIR",
+        help="download / extract でコンテンツアドレス型ストアを使う"
+        "（環境変数 EDINET_STORE_DIR でも指定可）",
+    )
     edinet_subparsers = edinet_parser.add_subparsers(
         dest="edinet_command", help="EDINET サブコマンド"
     )
@@ -30,17 +557,62 @@ def main():
     search_parser.add_argument("--sec-code", help="証券コード (4桁または5桁)")
     search_parser.add_argument("--ordinance-code", help="府令コード (例: 010)")
     search_parser.add_argument("--form-code", help="様式コード (例: 030000)")
+    search_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="書類一覧のキャッシュを使わずに再取得",
+    )
 
     # edinet extract
     extract_parser = edinet_subparsers.add_parser(
         "extract", help="CSVから財務データを抽出"
     )
-    extract_parser.add_argument(
-        "--csv-dir", required=True, help="CSVディレクトリのパス"
+    extract_source = extract_parser.add_mutually_exclusive_group(required=True)
+    extract_source.add_argument(
+        "--csv-dir", help="CSVディレクトリ、または CSV形式（type=5）の ZIP のパス"
+    )
+    extract_source.add_argument(
+        "--doc-id",
+        help="書類管理番号（CSV形式をメモリ上に取得して展開せずに抽出）",
     )
     extract_parser.add_argument(
         "--output", help="出力先ファイルパス（省略時は標準出力）"
     )
+    extract_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="抽出結果のキャッシュを使わずに CSV を読み直す",
+    )
+    extract_parser.add_argument(
+        "--facts",
+        action="store_true",
+        help="経営指標等に加えて、すべての数値ファクトを facts に出力",
+    )
+    extract_parser.add_argument(
+        "--element-map",
+        help="利用者定義の要素対応表（JSON）。ファクトから組み立てた値を「指標」に出力"
+        "（--facts を含む）",
+    )
+
+    # edinet extract-batch
+    extract_batch_parser = edinet_subparsers.add_parser(
+        "extract-batch",
+        help="複数の CSV ディレクトリ・ZIP から並行抽出し、1件1行の NDJSON で出力",
+    )
+    extract_batch_parser.add_argument(
+        "--csv-dirs", nargs="+", help="CSVディレクトリまたは ZIP のパス（複数可）"
+    )
+    extract_batch_parser.add_argument(
+        "--glob",
+        action="append",
+        help="CSVディレクトリ・ZIP のパスのパターン（例: 'data/csv/*_5.zip'、複数回指定可）",
+    )
+    extract_batch_parser.add_argument(
+        "--csv-dirs-file", help="CSVディレクトリ・ZIP のパスを1行1件で列挙したファイル"
+    )
+    extract_batch_parser.add_argument(
+        "--workers", type=int, help="ワーカープロセス数 (既定: CPU 数)"
+    )
 
     # edinet download
     download_parser = edinet_subparsers.add_parser(
@@ -54,6 +626,280 @@ def main():
         help="取得形式 (1:XBRL, 2:PDF, 3:代替PDF, 5:CSV)",
     )
     download_parser.add_argument("--output", required=True, help="保存先パス")
+    download_parser.add_argument(
+        "--link",
+        choices=["hardlink", "symlink", "copy"],
+        default="hardlink",
+        help="--store 使用時の取り出し方法 (既定: hardlink)",
+    )
+
+    # edinet download-batch
+    batch_parser = edinet_subparsers.add_parser(
+        "download-batch", help="複数の書類を並行ダウンロード"
+    )
+    batch_parser.add_argument("--doc-ids", nargs="+", help="書類管理番号（複数可）")
+    batch_parser.add_argument(
+        "--doc-ids-file", help="書類管理番号を1行1件で列挙したファイル"
+    )
+    batch_parser.add_argument(
+        "--type",
+        required=True,
+        choices=["1", "2", "3", "5"],
+        help="取得形式 (1:XBRL, 2:PDF, 3:代替PDF, 5:CSV)",
+    )
+    batch_parser.add_argument("--output-dir", required=True, help="保存先ディレクトリ")
+    batch_parser.add_argument(
+        "--concurrency", type=int, default=4, help="同時ダウンロード数 (既定: 4)"
+    )
+    batch_parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="取得済み判定でサイズに加えてハッシュも照合",
+    )
+    batch_parser.add_argument(
+        "--latest",
+        action="store_true",
+        help="インデックスで訂正報告書をたどり、最新の有効な版だけを取得",
+    )
+    batch_query = batch_parser.add_argument_group(
+        "インデックス検索（書類管理番号の代わりに指定）"
+    )
+    batch_query.add_argument("--index", help="インデックスDBのパス")
+    batch_query.add_argument(
+        "--from", dest="date_from", help="提出日の下限 (YYYY-MM-DD)"
+    )
+    batch_query.add_argument("--to", dest="date_to", help="提出日の上限 (YYYY-MM-DD)")
+    batch_query.add_argument("--sec-code", help="証券コード (4桁または5桁)")
+    batch_query.add_argument("--edinet-code", help="EDINETコード")
+    batch_query.add_argument("--ordinance-code", help="府令コード (例: 010)")
+    batch_query.add_argument("--form-code", help="様式コード (例: 030000)")
+    batch_query.add_argument("--doc-type-code", help="書類種別コード (例: 120)")
+
+    # edinet sync
+    sync_parser = edinet_subparsers.add_parser(
+        "sync", help="前回の続きから書類一覧を取り込み、新着書類を取得"
+    )
+    sync_parser.add_argument("--index", help="インデックスDBのパス")
+    sync_parser.add_argument(
+        "--from",
+        dest="date_from",
+        help="初回（ウォーターマーク未設定時）の開始日 (YYYY-MM-DD)",
+    )
+    sync_parser.add_argument(
+        "--watch", nargs="+", default=[], help="新着書類を取得する証券コード"
+    )
+    sync_parser.add_argument(
+        "--watch-file", help="証券コードを1行1件で列挙したウォッチリスト"
+    )
+    sync_parser.add_argument("--ordinance-code", help="府令コード (例: 010)")
+    sync_parser.add_argument("--form-code", help="様式コード (例: 030000)")
+    sync_parser.add_argument("--doc-type-code", help="書類種別コード (例: 120)")
+    sync_parser.add_argument(
+        "--type",
+        default="5",
+        choices=["1", "2", "3", "5"],
+        help="新着書類の取得形式 (既定: 5)",
+    )
+    sync_parser.add_argument(
+        "--output-dir", help="新着書類の保存先（省略時は取り込みのみ）"
+    )
+    sync_parser.add_argument(
+        "--concurrency", type=int, default=4, help="同時ダウンロード数 (既定: 4)"
+    )
+    sync_parser.add_argument(
+        "--all-versions",
+        action="store_true",
+        help="訂正済みの原本も取得する（既定は最新の有効な版のみ）",
+    )
+
+    # edinet index
+    index_parser = edinet_subparsers.add_parser(
+        "index", help="書類一覧のローカルインデックス操作"
+    )
+    index_parser.add_argument("--index", help="インデックスDBのパス")
+    index_subparsers = index_parser.add_subparsers(
+        dest="index_command", help="インデックス サブコマンド"
+    )
+
+    # edinet index build
+    index_build_parser = index_subparsers.add_parser(
+        "build", help="期間内の書類一覧をインデックスに取り込む"
+    )
+    index_build_parser.add_argument(
+        "--from", dest="date_from", required=True, help="開始日 (YYYY-MM-DD)"
+    )
+    index_build_parser.add_argument(
+        "--to", dest="date_to", required=True, help="終了日 (YYYY-MM-DD)"
+    )
+    index_build_parser.add_argument(
+        "--refresh", action="store_true", help="取り込み済みの日も取り直す"
+    )
+
+    # edinet index search
+    index_search_parser = index_subparsers.add_parser(
+        "search", help="インデックスから期間検索"
+    )
+    index_search_parser.add_argument(
+        "--from", dest="date_from", help="提出日の下限 (YYYY-MM-DD)"
+    )
+    index_search_parser.add_argument(
+        "--to", dest="date_to", help="提出日の上限 (YYYY-MM-DD)"
+    )
+    index_search_parser.add_argument("--sec-code", help="証券コード (4桁または5桁)")
+    index_search_parser.add_argument("--edinet-code", help="EDINETコード")
+    index_search_parser.add_argument("--ordinance-code", help="府令コード (例: 010)")
+    index_search_parser.add_argument("--form-code", help="様式コード (例: 030000)")
+    index_search_parser.add_argument("--doc-type-code", help="書類種別コード (例: 120)")
+
+    # edinet index chain
+    index_chain_parser = index_subparsers.add_parser(
+        "chain", help="原本と訂正報告書の系列、最新の有効な版を表示"
+    )
+    index_chain_parser.add_argument("doc_id", help="書類管理番号")
+
+    # edinet history
+    history_parser = edinet_subparsers.add_parser(
+        "history", help="複数年の有報の経営指標等を決算年ごとの長期時系列にまとめる"
+    )
+    history_parser.add_argument(
+        "--json",
+        nargs="+",
+        help="保存済みの抽出結果（extract の JSON、extract-batch の NDJSON）",
+    )
+    history_parser.add_argument(
+        "--csv-dirs", nargs="+", help="抽出する CSVディレクトリまたは ZIP のパス"
+    )
+    history_parser.add_argument(
+        "--glob",
+        action="append",
+        help="抽出する CSVディレクトリ・ZIP のパスのパターン（複数回指定可）",
+    )
+    history_parser.add_argument(
+        "--edinet-code", help="対象の EDINETコード（複数社の抽出結果から選ぶ場合）"
+    )
+    history_parser.add_argument(
+        "--workers", type=int, help="抽出のワーカープロセス数 (既定: CPU 数)"
+    )
+    history_parser.add_argument(
+        "--output", help="出力先ファイルパス（省略時は標準出力）"
+    )
+
+    # edinet warehouse
+    warehouse_parser = edinet_subparsers.add_parser(
+        "warehouse", help="抽出済み財務ファクトのローカルウェアハウス操作"
+    )
+    warehouse_parser.add_argument("--db", help="ウェアハウスDBのパス")
+    warehouse_subparsers = warehouse_parser.add_subparsers(
+        dest="warehouse_command", help="ウェアハウス サブコマンド"
+    )
+
+    # edinet warehouse ingest
+    warehouse_ingest_parser = warehouse_subparsers.add_parser(
+        "ingest", help="CSVディレクトリ・ZIP の数値ファクトを並行抽出して取り込む"
+    )
+    warehouse_ingest_parser.add_argument(
+        "--csv-dirs", nargs="+", help="CSVディレクトリまたは ZIP のパス（複数可）"
+    )
+    warehouse_ingest_parser.add_argument(
+        "--glob",
+        action="append",
+        help="CSVディレクトリ・ZIP のパスのパターン（複数回指定可）",
+    )
+    warehouse_ingest_parser.add_argument(
+        "--csv-dirs-file", help="CSVディレクトリ・ZIP のパスを1行1件で列挙したファイル"
+    )
+    warehouse_ingest_parser.add_argument(
+        "--workers", type=int, help="ワーカープロセス数 (既定: CPU 数)"
+    )
+    warehouse_ingest_parser.add_argument(
+        "--refresh", action="store_true", help="取り込み済みのパスも読み直す"
+    )
+
+    # edinet warehouse panel
+    warehouse_panel_parser = warehouse_subparsers.add_parser(
+        "panel", help="会社 × 決算年のパネルを表示"
+    )
+    warehouse_panel_parser.add_argument(
+        "metric", help="経営指標等のキー (例: ROE, 売上高) または要素ID"
+    )
+    warehouse_panel_parser.add_argument(
+        "--from-year", dest="year_from", type=int, help="決算年の下限"
+    )
+    warehouse_panel_parser.add_argument(
+        "--to-year", dest="year_to", type=int, help="決算年の上限"
+    )
+    warehouse_panel_parser.add_argument(
+        "--edinet-codes", nargs="+", help="対象の EDINETコード（省略時は全社）"
+    )
+    warehouse_panel_parser.add_argument(
+        "--non-consolidated", action="store_true", help="個別の値を使う"
+    )
+    warehouse_panel_parser.add_argument(
+        "--wide",
+        action="store_true",
+        help="{EDINETコード: {決算年: 値}} の形で出力",
+    )
+
+    # edinet warehouse filings
+    warehouse_filings_parser = warehouse_subparsers.add_parser(
+        "filings", help="取り込み済みの書類を表示"
+    )
+    warehouse_filings_parser.add_argument("--edinet-code", help="EDINETコード")
+
+    # edinet codes
+    codes_parser = edinet_subparsers.add_parser(
+        "codes", help="EDINET コードリストによる提出者の検索"
+    )
+    codes_parser.add_argument(
+        "--code-list",
+        help="EdinetcodeDlInfo.csv またはその ZIP のパス"
+        "（環境変数 EDINET_CODE_LIST でも指定可）",
+    )
+    codes_subparsers = codes_parser.add_subparsers(
+        dest="codes_command", help="コードリスト サブコマンド"
+    )
+
+    # edinet codes lookup
+    codes_lookup_parser = codes_subparsers.add_parser(
+        "lookup", help="証券コード・EDINETコードから提出者情報を表示"
+    )
+    codes_lookup_parser.add_argument(
+        "codes", nargs="+", help="証券コードまたはEDINETコード"
+    )
+    codes_lookup_parser.add_argument(
+        "--year", type=int, help="決算日が属する年（有報の提出見込み期間を併記）"
+    )
+
+    # edinet codes annual-report
+    codes_annual_parser = codes_subparsers.add_parser(
+        "annual-report", help="提出見込み期間だけを検索して有価証券報告書を探す"
+    )
+    codes_annual_parser.add_argument("code", help="証券コードまたはEDINETコード")
+    codes_annual_parser.add_argument(
+        "--year", type=int, required=True, help="決算日が属する年 (例: 2024)"
+    )
+
+    # edinet mock-server
+    mock_parser = edinet_subparsers.add_parser(
+        "mock-server", help="カセットを配信するローカルモックサーバーを起動"
+    )
+    mock_parser.add_argument(
+        "--cassette",
+        dest="mock_cassette",
+        metavar="DIR",
+        required=True,
+        help="カセットのディレクトリ",
+    )
+    mock_parser.add_argument("--host", default="127.0.0.1", help="待ち受けアドレス")
+    mock_parser.add_argument(
+        "--port", type=int, default=8080, help="待ち受けポート (既定: 8080)"
+    )
+    mock_parser.add_argument(
+        "--latency", type=float, default=0.0, help="レスポンスごとの遅延（秒）"
+    )
+    mock_parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="429 を返す確率 (0〜1)"
+    )
 
     # valuation コマンド
     valuation_parser = subparsers.add_parser("valuation", help="バリュエーション計算")
@@ -119,60 +965,25 @@ def main():
             )
 
         elif args.command == "edinet":
-            if args.edinet_command == "search":
-                results = search_documents(
-                    date=args.date,
-                    sec_code=args.sec_code,
-                    ordinance_code=args.ordinance_code,
-                    form_code=args.form_code,
-                )
-                print(json.dumps(results, ensure_ascii=False, indent=2))
-
-            elif args.edinet_command == "extract":
-                data = extract_financial_data(csv_dir=args.csv_dir)
-                output_json = json.dumps(data, ensure_ascii=False, indent=2)
-                if args.output:
-                    from pathlib import Path
-
-                    out = Path(args.output)
-                    out.parent.mkdir(parents=True, exist_ok=True)
-                    out.write_text(output_json + "\n", encoding="utf-8")
-                    print(
-                        json.dumps(
-                            {"status": "success", "file": str(out)},
-                            ensure_ascii=False,
-                        )
-                    )
-                else:
-                    print(output_json)
+            from corporate_reports.edinet import EdinetAPIError
 
-            elif args.edinet_command == "download":
-                output_path = download_document(
-                    doc_id=args.doc_id,
-                    doc_type=args.type,
-                    output_path=args.output,
+            try:
+                _run_edinet(
+                    args, edinet_parser, index_parser, codes_parser, warehouse_parser
                 )
+            except EdinetAPIError as e:
                 print(
                     json.dumps(
-                        {"status": "success", "file": output_path},
-                        ensure_ascii=False,
-                    )
+                        {"status": "error", "message": str(e)}, ensure_ascii=False
+                    ),
+                    file=sys.stderr,
                 )
-
-            else:
-                edinet_parser.print_help()
                 sys.exit(1)
 
         else:
             parser.print_help()
             sys.exit(1)
 
-    except EdinetAPIError as e:
-        print(
-            json.dumps({"status": "error", "message": str(e)}, ensure_ascii=False),
-            file=sys.stderr,
-        )
-        sys.exit(1)
     except FileNotFoundError as e:
         print(
             json.dumps({"status": "error", "message": str(e)}, ensure_ascii=False),
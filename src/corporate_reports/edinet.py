@@ -4,15 +4,46 @@ EDINET API v2 クライアント
 書類検索・ダウンロード・CSV抽出を行うライブラリ。
 """
 
+import contextlib
 import csv
+import email.utils
+import fnmatch
+import functools
+import hashlib
+import io
+import json
 import os
+import random
+import re
+import sqlite3
+import threading
 import time
-from pathlib import Path
-from typing import Optional
+import zipfile
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date as date_cls, datetime, timedelta, timezone
+from pathlib import Path, PurePosixPath
+from typing import (
+    TYPE_CHECKING,
+    BinaryIO,
+    Collection,
+    Container,
+    Generator,
+    IO,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    TextIO,
+)
 
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 
+if TYPE_CHECKING:
+    from corporate_reports.edinet_store import BlobStore
+
 # プロジェクトルートの .env を読み込み
 project_root = Path(__file__).parent.parent.parent
 load_dotenv(project_root / ".env")
@@ -20,6 +51,9 @@ load_dotenv(project_root / ".env")
 API_KEY = os.getenv("EDINET_API_KEY")
 BASE_URL = "https://api.edinet-fsa.go.jp/api/v2"
 RATE_LIMIT_DELAY = 0.35  # 秒間3リクエスト = 約0.33秒間隔
+LISTING_CACHE_TTL = 600  # 当日以降の書類一覧キャッシュの有効期間（秒）
+LISTING_MEMO_SIZE = 32  # クライアントがメモリに保持する検索用インデックスの日数
+JST = timezone(timedelta(hours=9))
 
 
 class EdinetAPIError(Exception):
@@ -53,64 +87,797 @@ def check_api_key() -> str:
     sys.exit(1)
 
 
-def search_documents(
-    date: str,
+class RateLimiter:
+    """
+    スレッドセーフなトークンバケット方式のレートリミッター
+
+    トークンが残っていれば即座に通し、予算を超える場合だけ不足分を待つ。
+    複数スレッドで共有すると、待ち時間は呼び出し順に予約される。
+
+    Args:
+        rate: 1秒あたりの許容リクエスト数
+        burst: バケット容量（連続で即時に通せるリクエスト数）
+    """
+
+    def __init__(self, rate: float = 1 / RATE_LIMIT_DELAY, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """トークンを1つ予約し、必要な待ち時間（秒）を返す"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self) -> float:
+        """
+        リクエスト1回分の許可を得る（必要なら待機する）
+
+        Returns:
+            待機した秒数
+        """
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class FileRateLimiter(RateLimiter):
+    """
+    ロックファイルを介して複数プロセスで共有するレートリミッター
+
+    次にリクエストを送ってよい時刻をファイルに記録し、flock で排他しながら
+    各プロセスが順番に枠を予約する。同一ホスト上の CLI を並列起動しても
+    全体で rate を超えない。
+
+    Args:
+        path: 共有するロックファイルのパス
+        rate: 1秒あたりの許容リクエスト数（ホスト全体）
+    """
+
+    def __init__(self, path: str | Path, rate: float = 1 / RATE_LIMIT_DELAY):
+        super().__init__(rate=rate, burst=1)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def reserve(self) -> float:
+        try:
+            import fcntl
+        except ImportError:
+            raise EdinetAPIError("共有レートリミッターは POSIX 環境でのみ利用できます")
+
+        with self._lock, open(self.path, "a+", encoding="ascii") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                try:
+                    next_slot = float(f.read().strip() or 0)
+                except ValueError:
+                    next_slot = 0.0
+                now = time.time()
+                slot = max(now, next_slot)
+                f.seek(0)
+                f.truncate()
+                f.write(repr(slot + 1 / self.rate))
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        return slot - now
+
+
+# 同一プロセス内のクライアントが共有する既定のレートリミッター
+_shared_rate_limiter: Optional[RateLimiter] = None
+
+
+def get_shared_rate_limiter() -> RateLimiter:
+    """
+    既定のレートリミッターを返す
+
+    環境変数 EDINET_RATE_LIMIT_FILE が設定されていれば、そのファイルを
+    介してホスト上の全プロセスで共有する FileRateLimiter を使う。
+    """
+    global _shared_rate_limiter
+    if _shared_rate_limiter is None:
+        lock_file = os.getenv("EDINET_RATE_LIMIT_FILE")
+        if lock_file:
+            _shared_rate_limiter = FileRateLimiter(lock_file)
+        else:
+            _shared_rate_limiter = RateLimiter()
+    return _shared_rate_limiter
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    一時的なエラー（接続エラー・タイムアウト・429/5xx）の再試行設定
+
+    待ち時間は backoff_factor * 2**試行回数 を上限 max_backoff で打ち切り、
+    jitter=True なら 0〜その値の一様乱数にする（full jitter）。
+    Retry-After ヘッダーがあればそちらを優先する。
+    """
+
+    max_retries: int = 3
+    backoff_factor: float = 0.5
+    max_backoff: float = 30.0
+    jitter: bool = True
+    retry_statuses: tuple[int, ...] = (429, 500, 502, 503, 504)
+    max_retry_after: float = 120.0
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """attempt 回目（0始まり）の失敗後に待つ秒数"""
+        if retry_after:
+            seconds = _parse_retry_after(retry_after)
+            if seconds is not None:
+                return min(seconds, self.max_retry_after)
+        delay = min(self.max_backoff, self.backoff_factor * 2**attempt)
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+
+def _parse_retry_after(value: str) -> Optional[float]:
+    """Retry-After ヘッダー（秒数または HTTP-date）を秒数に変換"""
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class CircuitBreaker:
+    """
+    サーキットブレーカー
+
+    一時的なエラーが failure_threshold 回連続したら回路を開き、
+    reset_timeout 秒間はリクエストを送らない。経過後は1件だけ試行し
+    （half-open）、成功すれば閉じ、失敗すれば再び開く。
+
+    回路が開いている間、既定では呼び出し側は half-open になるまで待ち、
+    試行の結果を待ってから送る（並行ダウンロードでも障害が収まるのを待てる）。
+    fail_fast=True の場合は待たずに EdinetAPIError を送出する。
+
+    Args:
+        failure_threshold: 回路を開く連続失敗回数
+        reset_timeout: 回路を開いておく秒数
+        fail_fast: 回路が開いている間は待たずに失敗させるか
+        max_wait: 待つ最大秒数（超えたら EdinetAPIError。None なら待ち続ける）
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 10,
+        reset_timeout: float = 60.0,
+        fail_fast: bool = False,
+        max_wait: Optional[float] = None,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.fail_fast = fail_fast
+        self.max_wait = max_wait
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        # half-open の試行を始めた時刻（試行中でなければ None）
+        self._probe_started: Optional[float] = None
+        self._cond = threading.Condition()
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def before_request(self) -> None:
+        """
+        リクエストを送ってよくなるまで待つ
+
+        Raises:
+            EdinetAPIError: fail_fast=True で回路が開いている場合、
+                または max_wait 秒待っても送れない場合
+        """
+        with self._cond:
+            deadline = (
+                time.monotonic() + self.max_wait if self.max_wait is not None else None
+            )
+            while True:
+                now = time.monotonic()
+                if self._probe_started is not None:
+                    # 試行が結果を返さないまま reset_timeout を過ぎたら試行を引き継ぐ
+                    remaining = self._probe_started + self.reset_timeout - now
+                    if remaining <= 0:
+                        self._probe_started = now
+                        return
+                elif self._opened_at is None:
+                    return
+                else:
+                    remaining = self._opened_at + self.reset_timeout - now
+                    if remaining <= 0:
+                        # half-open: この1件で回復を確認する
+                        self._opened_at = None
+                        self._probe_started = now
+                        return
+                if self.fail_fast or (deadline is not None and now >= deadline):
+                    raise EdinetAPIError(
+                        f"EDINET API への接続を一時停止中です（残り {remaining:.0f} 秒）"
+                    )
+                if deadline is not None:
+                    remaining = min(remaining, deadline - now)
+                self._cond.wait(remaining)
+
+    def record_success(self) -> None:
+        with self._cond:
+            self._failures = 0
+            self._opened_at = None
+            self._probe_started = None
+            self._cond.notify_all()
+
+    def record_failure(self) -> None:
+        with self._cond:
+            self._failures += 1
+            if self._probe_started is not None or (
+                self._failures >= self.failure_threshold
+            ):
+                self._opened_at = time.monotonic()
+                self._probe_started = None
+                self._cond.notify_all()
+
+
+def _get_cache_dir() -> Path:
+    """キャッシュディレクトリを取得（EDINET_CACHE_DIR で変更可能）"""
+    cache_dir = os.getenv("EDINET_CACHE_DIR")
+    if cache_dir:
+        return Path(cache_dir)
+    return Path.home() / ".cache" / "corporate-reports" / "edinet"
+
+
+def _listing_cache_path(date: str) -> Path:
+    return _get_cache_dir() / "documents" / f"{date}.json"
+
+
+def _is_listing_fresh(date: str, fetched_at: float) -> bool:
+    """
+    キャッシュ済み書類一覧が有効か判定
+
+    その日（JST）が終わった後に取得した一覧は確定済みのため常に有効。
+    その日のうちに取得した一覧は途中までの可能性があるため、翌日以降に
+    読む場合も LISTING_CACHE_TTL 秒までしか有効としない。
+    """
+    if fetched_at >= _end_of_day(date):
+        return True
+    return time.time() - fetched_at < LISTING_CACHE_TTL
+
+
+def _end_of_day(date: str) -> float:
+    """指定日（JST）が終わる時刻（UNIX時間）"""
+    day = date_cls.fromisoformat(date) + timedelta(days=1)
+    return datetime(day.year, day.month, day.day, tzinfo=JST).timestamp()
+
+
+def _read_listing_cache_entry(date: str) -> Optional[tuple[float, list[dict]]]:
+    """有効なキャッシュがあれば (取得時刻, 書類一覧) を返す"""
+    path = _listing_cache_path(date)
+    try:
+        cached = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    fetched_at = cached.get("fetched_at", 0)
+    if not _is_listing_fresh(date, fetched_at):
+        return None
+    return fetched_at, cached.get("results", [])
+
+
+def _read_listing_cache(date: str) -> Optional[list[dict]]:
+    entry = _read_listing_cache_entry(date)
+    return entry[1] if entry is not None else None
+
+
+def _write_listing_cache(date: str, results: list[dict]) -> None:
+    path = _listing_cache_path(date)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # 途中で中断されても壊れたキャッシュが残らないよう一時ファイル経由で置換
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(
+            json.dumps(
+                {"date": date, "fetched_at": time.time(), "results": results},
+                ensure_ascii=False,
+            ),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, path)
+    except OSError:
+        # キャッシュ書き込み失敗は検索結果に影響させない
+        pass
+
+
+class DocumentListing:
+    """
+    1日分の書類一覧と、絞り込み用の転置インデックス
+
+    証券コード（先頭4桁）・EDINETコード・様式コード・府令コード・
+    書類種別コードごとに行番号のリストを一度だけ作り、複数条件の検索は
+    行番号集合の積で答える。同じ一覧を多数の証券コードで検索する
+    スクリーニング用途では、毎回全件を走査するより大幅に速い。
+
+    Args:
+        results: 書類一覧APIの results
+        fetched_at: 一覧を取得した時刻（UNIX時間、キャッシュの有効判定用）
+    """
+
+    # 検索キーワード引数と書類情報のキーの対応
+    _FIELDS = {
+        "sec_code": "secCode",
+        "edinet_code": "edinetCode",
+        "ordinance_code": "ordinanceCode",
+        "form_code": "formCode",
+        "doc_type_code": "docTypeCode",
+    }
+
+    def __init__(self, results: list[dict], fetched_at: float = 0.0):
+        self.results = results
+        self.fetched_at = fetched_at
+        self._index: dict[str, dict[str, list[int]]] = {
+            key: {} for key in self._FIELDS.values()
+        }
+        for i, r in enumerate(results):
+            for key, postings in self._index.items():
+                value = r.get(key)
+                if not value:
+                    continue
+                if key == "secCode":
+                    # EDINETは5桁（末尾0付き）なので先頭4桁で索引する
+                    value = value[:4]
+                postings.setdefault(value, []).append(i)
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def query(
+        self,
+        sec_code: Optional[str] = None,
+        edinet_code: Optional[str] = None,
+        ordinance_code: Optional[str] = None,
+        form_code: Optional[str] = None,
+        doc_type_code: Optional[str] = None,
+        sec_codes: Optional[Iterable[str]] = None,
+    ) -> list[dict]:
+        """
+        条件に一致する書類を一覧の順序のまま返す（条件はすべて AND）
+
+        Args:
+            sec_code: 証券コード（4桁または5桁、先頭4桁で一致）
+            edinet_code: EDINETコード
+            ordinance_code: 府令コード
+            form_code: 様式コード
+            doc_type_code: 書類種別コード
+            sec_codes: 証券コードのリスト（いずれかに一致、ウォッチリスト用）
+
+        Returns:
+            書類情報のリスト
+        """
+        criteria = {
+            "sec_code": sec_code[:4] if sec_code else None,
+            "edinet_code": edinet_code,
+            "ordinance_code": ordinance_code,
+            "form_code": form_code,
+            "doc_type_code": doc_type_code,
+        }
+        postings: list[Collection[int]] = [
+            self._index[self._FIELDS[name]].get(value, [])
+            for name, value in criteria.items()
+            if value
+        ]
+        if sec_codes is not None:
+            by_code = self._index["secCode"]
+            postings.append(
+                {
+                    i
+                    for code in {c[:4] for c in sec_codes}
+                    for i in by_code.get(code, [])
+                }
+            )
+
+        if not postings:
+            return list(self.results)
+        if len(postings) == 1 and isinstance(postings[0], list):
+            return [self.results[i] for i in postings[0]]
+
+        # 短い転置リストから絞り込む
+        postings.sort(key=len)
+        hits = set(postings[0])
+        for rows in postings[1:]:
+            if not hits:
+                break
+            hits.intersection_update(rows)
+        return [self.results[i] for i in sorted(hits)]
+
+
+def _filter_documents(
+    results: list[dict],
     sec_code: Optional[str] = None,
     ordinance_code: Optional[str] = None,
     form_code: Optional[str] = None,
 ) -> list[dict]:
+    """書類一覧を証券コード・府令コード・様式コードで絞り込む"""
+    if not (sec_code or ordinance_code or form_code):
+        return results
+    return DocumentListing(results).query(
+        sec_code=sec_code, ordinance_code=ordinance_code, form_code=form_code
+    )
+
+
+class EdinetClient:
     """
-    書類一覧APIで検索
+    EDINET API クライアント
+
+    keep-alive の接続プールを持つ requests.Session を保持し、
+    書類一覧の取得とダウンロードで TCP/TLS 接続を使い回す。
+
+    Args:
+        api_key: APIキー（省略時は呼び出し時に環境変数から読む）
+        base_url: APIのベースURL（省略時は EDINET_BASE_URL、未設定なら本番）
+        pool_size: ホストあたりの最大コネクション数
+        timeout: 書類一覧APIのタイムアウト（秒）
+        download_timeout: 書類取得APIのタイムアウト（秒）
+        rate_limiter: リクエスト前に待機するレートリミッター
+            （省略時はプロセス内で共有する既定のリミッター）
+        retry: 一時的なエラーの再試行設定
+        circuit_breaker: 連続失敗時にリクエストを止めるサーキットブレーカー
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        pool_size: int = 10,
+        timeout: float = 30,
+        download_timeout: float = 60,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url or os.getenv("EDINET_BASE_URL") or BASE_URL
+        self.timeout = timeout
+        self.download_timeout = download_timeout
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter()
+        self.retry = retry or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self._listings: OrderedDict[str, DocumentListing] = OrderedDict()
+        self._listings_lock = threading.Lock()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "EdinetClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _api_key(self) -> str:
+        return self.api_key or check_api_key()
+
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        """
+        GET リクエストを送り、一時的なエラーは再試行する
+
+        初回のレートリミット待機は呼び出し側で行う。再試行ごとに
+        バックオフした上で改めてレートリミットを通す。
+
+        Raises:
+            requests.exceptions.RequestException: 再試行しても失敗した場合
+            EdinetAPIError: サーキットブレーカーが開いていて送れない場合
+        """
+        attempt = 0
+        while True:
+            self.circuit_breaker.before_request()
+            retry_after = None
+            try:
+                response = self.session.get(url, **kwargs)
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+            ) as e:
+                error: requests.exceptions.RequestException = e
+            else:
+                if response.status_code not in self.retry.retry_statuses:
+                    self.circuit_breaker.record_success()
+                    response.raise_for_status()
+                    return response
+                retry_after = response.headers.get("Retry-After")
+                error = requests.exceptions.HTTPError(
+                    f"{response.status_code} Error for url: {url}", response=response
+                )
+                response.close()
+
+            self.circuit_breaker.record_failure()
+            if attempt >= self.retry.max_retries:
+                raise error
+            time.sleep(self.retry.delay(attempt, retry_after))
+            attempt += 1
+            self.rate_limiter.acquire()
+
+    def _get_document_list(self, date: str) -> list[dict]:
+        """書類一覧APIを1回呼ぶ（キャッシュ・レートリミットなし）"""
+        url = f"{self.base_url}/documents.json"
+        params = {
+            "date": date,
+            "type": "2",  # メタデータ + 書類一覧
+            "Subscription-Key": self._api_key(),
+        }
+
+        try:
+            response = self._get(url, params=params, timeout=self.timeout)
+            data = response.json()
+        except requests.exceptions.RequestException as e:
+            raise EdinetAPIError(f"API request failed: {e}")
+
+        if data.get("metadata", {}).get("status") != "200":
+            raise EdinetAPIError(f"API returned status: {data.get('metadata')}")
+
+        results = data.get("results", [])
+        _write_listing_cache(date, results)
+        return results
+
+    def _save_document(
+        self, doc_id: str, doc_type: str, output_path: str, resume: bool = False
+    ) -> str:
+        """
+        書類取得APIを1回呼んでファイルへ逐次書き込む（レートリミットなし）
+
+        resume=True の場合は `<output_path>.part` に書き込み、完了後に
+        output_path へ置き換える。前回の .part が残っていれば Range
+        リクエストで続きから取得する（サーバーが 206 を返さなければ先頭から）。
+        """
+        url = f"{self.base_url}/documents/{doc_id}"
+        params = {
+            "type": doc_type,
+            "Subscription-Key": self._api_key(),
+        }
+
+        output_file = Path(output_path)
+        part_file = output_file.with_name(output_file.name + ".part")
+        headers = {}
+        offset = 0
+        if resume and part_file.exists():
+            offset = part_file.stat().st_size
+            if offset:
+                headers["Range"] = f"bytes={offset}-"
+
+        try:
+            response = self._get(
+                url,
+                params=params,
+                headers=headers or None,
+                timeout=self.download_timeout,
+                stream=True,
+            )
+
+            # ファイルに保存
+            output_file.parent.mkdir(parents=True, exist_ok=True)
+
+            if not resume:
+                with open(output_file, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=8192):
+                        f.write(chunk)
+                return str(output_file)
+
+            mode = "ab" if offset and response.status_code == 206 else "wb"
+            with open(part_file, mode) as f:
+                for chunk in response.iter_content(chunk_size=8192):
+                    f.write(chunk)
+            os.replace(part_file, output_file)
+            return str(output_file)
+
+        except requests.exceptions.RequestException as e:
+            raise EdinetAPIError(f"Download failed: {e}")
+
+    def fetch_document(self, doc_id: str, doc_type: str) -> bytes:
+        """
+        書類をファイルに保存せずバイト列として取得
+
+        Args:
+            doc_id: 書類管理番号
+            doc_type: 取得形式（download_document と同じ）
+
+        Returns:
+            レスポンス本文
+        """
+        url = f"{self.base_url}/documents/{doc_id}"
+        params = {
+            "type": doc_type,
+            "Subscription-Key": self._api_key(),
+        }
+
+        try:
+            self.rate_limiter.acquire()
+            response = self._get(url, params=params, timeout=self.download_timeout)
+            return response.content
+        except requests.exceptions.RequestException as e:
+            raise EdinetAPIError(f"Download failed: {e}")
+
+    def fetch_document_list(self, date: str, use_cache: bool = True) -> list[dict]:
+        """
+        指定日の書類一覧（フィルタなし）を取得
+
+        取得結果は日付ごとにディスクへキャッシュする。キャッシュヒット時は
+        API呼び出しもレートリミット待機も行わない。
+
+        Args:
+            date: 検索対象日 (YYYY-MM-DD)
+            use_cache: False の場合はキャッシュを読まずに再取得する
+
+        Returns:
+            書類情報のリスト
+        """
+        if use_cache:
+            cached = _read_listing_cache(date)
+            if cached is not None:
+                return cached
+
+        self.rate_limiter.acquire()
+        return self._get_document_list(date)
+
+    def search_documents(
+        self,
+        date: str,
+        sec_code: Optional[str] = None,
+        ordinance_code: Optional[str] = None,
+        form_code: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> list[dict]:
+        """書類一覧APIで検索（引数はモジュール関数 search_documents と同じ）"""
+        return self.document_listing(date, use_cache=use_cache).query(
+            sec_code=sec_code, ordinance_code=ordinance_code, form_code=form_code
+        )
+
+    def document_listing(self, date: str, use_cache: bool = True) -> DocumentListing:
+        """
+        指定日の書類一覧を検索用インデックス付きで取得
+
+        インデックスは直近 LISTING_MEMO_SIZE 日分をクライアント内に保持し、
+        同じ日の検索ではキャッシュの読み込みもインデックスの構築も省く。
+
+        Args:
+            date: 検索対象日 (YYYY-MM-DD)
+            use_cache: False の場合はキャッシュを読まずに再取得する
+
+        Returns:
+            DocumentListing
+        """
+        entry = None
+        if use_cache:
+            with self._listings_lock:
+                listing = self._listings.get(date)
+                if listing is not None and _is_listing_fresh(date, listing.fetched_at):
+                    self._listings.move_to_end(date)
+                    return listing
+            entry = _read_listing_cache_entry(date)
+
+        if entry is None:
+            self.rate_limiter.acquire()
+            entry = (time.time(), self._get_document_list(date))
+
+        listing = DocumentListing(entry[1], fetched_at=entry[0])
+        with self._listings_lock:
+            self._listings[date] = listing
+            self._listings.move_to_end(date)
+            while len(self._listings) > LISTING_MEMO_SIZE:
+                self._listings.popitem(last=False)
+        return listing
+
+    def download_document(self, doc_id: str, doc_type: str, output_path: str) -> str:
+        """書類をダウンロード（引数はモジュール関数 download_document と同じ）"""
+        self.rate_limiter.acquire()
+        return self._save_document(doc_id, doc_type, output_path)
+
+
+_default_client: Optional[EdinetClient] = None
+
+
+def get_default_client() -> EdinetClient:
+    """
+    モジュール関数が共有する既定の EdinetClient を返す
+
+    環境変数 EDINET_CASSETTE が設定されていれば、そのディレクトリの
+    カセットを組み込む（EDINET_CASSETTE_MODE: replay / record、既定は replay）。
+    """
+    global _default_client
+    if _default_client is None:
+        _default_client = EdinetClient()
+        cassette = os.getenv("EDINET_CASSETTE")
+        if cassette:
+            from corporate_reports.edinet_mock import use_cassette
+
+            mode = os.getenv("EDINET_CASSETTE_MODE", "replay")
+            use_cassette(_default_client, cassette, mode)
+    return _default_client
+
+
+def set_default_client(client: Optional[EdinetClient]) -> None:
+    """既定の EdinetClient を差し替える（None で次回呼び出し時に再生成）"""
+    global _default_client
+    _default_client = client
+
+
+def fetch_document_list(date: str, use_cache: bool = True) -> list[dict]:
+    """
+    指定日の書類一覧（フィルタなし）を取得
 
     Args:
         date: 検索対象日 (YYYY-MM-DD)
-        sec_code: 証券コード（4桁または5桁）
-        ordinance_code: 府令コード (例: "010" = 金商法)
-        form_code: 様式コード (例: "030000" = 有価証券報告書)
+        use_cache: False の場合はキャッシュを読まずに再取得する
 
     Returns:
         書類情報のリスト
     """
-    api_key = check_api_key()
+    return get_default_client().fetch_document_list(date, use_cache=use_cache)
 
-    url = f"{BASE_URL}/documents.json"
-    params = {
-        "date": date,
-        "type": "2",  # メタデータ + 書類一覧
-        "Subscription-Key": api_key,
-    }
 
-    try:
-        response = requests.get(url, params=params, timeout=30)
-        response.raise_for_status()
-        data = response.json()
+def document_listing(date: str, use_cache: bool = True) -> DocumentListing:
+    """
+    指定日の書類一覧を検索用インデックス付きで取得
 
-        if data.get("metadata", {}).get("status") != "200":
-            raise EdinetAPIError(f"API returned status: {data.get('metadata')}")
+    同じ日の一覧を多数の条件で検索する場合に使う::
 
-        results = data.get("results", [])
+        listing = document_listing("2025-03-27")
+        for code in watch_list:
+            reports = listing.query(sec_code=code, form_code="030000")
 
-        # フィルタリング
-        if sec_code:
-            # 4桁コードの場合は前方一致（EDINETは5桁で末尾0付き）
-            sec_prefix = sec_code[:4]
-            results = [
-                r
-                for r in results
-                if r.get("secCode") and r.get("secCode")[:4] == sec_prefix
-            ]
+    Args:
+        date: 検索対象日 (YYYY-MM-DD)
+        use_cache: False の場合はキャッシュを読まずに再取得する
 
-        if ordinance_code:
-            results = [r for r in results if r.get("ordinanceCode") == ordinance_code]
+    Returns:
+        DocumentListing
+    """
+    return get_default_client().document_listing(date, use_cache=use_cache)
 
-        if form_code:
-            results = [r for r in results if r.get("formCode") == form_code]
 
-        time.sleep(RATE_LIMIT_DELAY)
-        return results
+def search_documents(
+    date: str,
+    sec_code: Optional[str] = None,
+    ordinance_code: Optional[str] = None,
+    form_code: Optional[str] = None,
+    use_cache: bool = True,
+) -> list[dict]:
+    """
+    書類一覧APIで検索
 
-    except requests.exceptions.RequestException as e:
-        raise EdinetAPIError(f"API request failed: {e}")
+    Args:
+        date: 検索対象日 (YYYY-MM-DD)
+        sec_code: 証券コード（4桁または5桁）
+        ordinance_code: 府令コード (例: "010" = 金商法)
+        form_code: 様式コード (例: "030000" = 有価証券報告書)
+        use_cache: 書類一覧のディスクキャッシュを使うか
+
+    Returns:
+        書類情報のリスト
+    """
+    return get_default_client().search_documents(
+        date,
+        sec_code=sec_code,
+        ordinance_code=ordinance_code,
+        form_code=form_code,
+        use_cache=use_cache,
+    )
 
 
 def download_document(doc_id: str, doc_type: str, output_path: str) -> str:
@@ -129,31 +896,7 @@ def download_document(doc_id: str, doc_type: str, output_path: str) -> str:
     Returns:
         保存先のパス
     """
-    api_key = check_api_key()
-
-    url = f"{BASE_URL}/documents/{doc_id}"
-    params = {
-        "type": doc_type,
-        "Subscription-Key": api_key,
-    }
-
-    try:
-        response = requests.get(url, params=params, timeout=60, stream=True)
-        response.raise_for_status()
-
-        # ファイルに保存
-        output_file = Path(output_path)
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-
-        with open(output_file, "wb") as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
-
-        time.sleep(RATE_LIMIT_DELAY)
-        return str(output_file)
-
-    except requests.exceptions.RequestException as e:
-        raise EdinetAPIError(f"Download failed: {e}")
+    return get_default_client().download_document(doc_id, doc_type, output_path)
 
 
 # --- CSV 抽出 ---
@@ -184,6 +927,11 @@ _NON_CONSOLIDATED_ELEMENTS: dict[str, str] = {
     "jpcrp_cor:PayoutRatioSummaryOfBusinessResults": "配当性向",
 }
 
+# 経営指標等の抽出で読み出す要素ID
+_SUMMARY_ELEMENT_IDS = frozenset(_SUMMARY_ELEMENTS) | frozenset(
+    _NON_CONSOLIDATED_ELEMENTS
+)
+
 # コンテキストIDから相対年度へのマッピング
 _CONTEXT_YEAR_MAP: dict[str, str] = {
     "Prior4Year": "4期前",
@@ -206,85 +954,953 @@ def _parse_value(value: str) -> int | float | str | None:
         return value
 
 
-def _parse_edinet_csv(csv_path: str | Path) -> list[dict[str, str]]:
-    """EDINET CSV（UTF-16LE TSV）を読み込んでレコードのリストを返す"""
-    rows = []
-    with open(csv_path, encoding="utf-16le", newline="") as f:
-        reader = csv.reader(f, delimiter="\t")
-        header = next(reader)
-        # BOM・ダブルクォート除去（BOMとクォートが交互に入る場合も考慮）
-        header = [h.strip().strip("\ufeff").strip('"').strip("\ufeff") for h in header]
-        for row in reader:
-            if len(row) < len(header):
+# 有価証券報告書の CSV ファイル名パターン
+_ASR_CSV_PATTERN = "jpcrp030000-asr-*.csv"
+
+# 例: jpcrp030000-asr-001_E01350-000_2024-12-31_01_2025-03-21.csv
+_ASR_CSV_NAME = re.compile(
+    r"jpcrp030000-asr-\d{3}_(E\d{5})-\d{3}_(\d{4}-\d{2}-\d{2})_(\d{2})"
+    r"_(\d{4}-\d{2}-\d{2})\.csv$"
+)
+
+# 相対年度 → 当期から何期さかのぼるか
+_YEAR_OFFSETS: dict[str, int] = {
+    year_label: len(_CONTEXT_YEAR_MAP) - 1 - i
+    for i, year_label in enumerate(_CONTEXT_YEAR_MAP.values())
+}
+
+
+class AsrFilingInfo(NamedTuple):
+    """有価証券報告書の CSV ファイル名から読み取れる書類の属性"""
+
+    edinet_code: str
+    period_end: str  # 当期の決算日 (YYYY-MM-DD)
+    submission_no: int  # 提出回数（訂正報告書で増える）
+    submit_date: str  # 提出日 (YYYY-MM-DD)
+
+    def fiscal_year(self, year_label: str) -> int:
+        """相対年度（"当期"・"1期前" など）を決算日の属する年に変換"""
+        return int(self.period_end[:4]) - _YEAR_OFFSETS[year_label]
+
+
+def parse_asr_filename(name: str) -> Optional[AsrFilingInfo]:
+    """
+    有価証券報告書の CSV ファイル名（またはそれで終わる出所）を解釈
+
+    Args:
+        name: ファイル名、パス、または "<zip>!<メンバー名>" 形式の出所
+
+    Returns:
+        AsrFilingInfo（形式が違う場合は None）
+    """
+    match = _ASR_CSV_NAME.search(name)
+    if match is None:
+        return None
+    edinet_code, period_end, submission_no, submit_date = match.groups()
+    return AsrFilingInfo(edinet_code, period_end, int(submission_no), submit_date)
+
+
+class EdinetRow(NamedTuple):
+    """EDINET CSV の1行（列名との対応は _EDINET_COLUMNS）"""
+
+    element_id: str
+    label: str
+    context_id: str
+    relative_year: str
+    consolidation: str
+    period: str
+    unit_id: str
+    unit: str
+    # iter_edinet_binary で参照にした値は TextBlockRef
+    value: "str | TextBlockRef"
+
+
+class TextBlockRef(NamedTuple):
+    """
+    CSV 上の値の位置（テキストブロックなどの長い値を必要になってから読む参照）
+
+    offset・length は UTF-16LE の CSV（ZIP の場合はメンバー）の先頭からの
+    バイト位置で、値を囲むダブルクォートを含まない。
+    """
+
+    path: str  # CSV または ZIP のパス（バイト列から読んだ場合は空）
+    member: str  # ZIP のメンバー名（CSV ファイルの場合は空）
+    offset: int
+    length: int
+
+    def read(self) -> str:
+        """参照先の値を読む（iter_edinet_rows が返す値と同じ文字列）"""
+        if not self.path:
+            raise EdinetAPIError("読み込み元のファイルがないため値を読めません")
+        try:
+            if self.member:
+                with zipfile.ZipFile(self.path) as zf, zf.open(self.member) as f:
+                    f.seek(self.offset)
+                    data = f.read(self.length)
+            else:
+                with open(self.path, "rb") as f:
+                    f.seek(self.offset)
+                    data = f.read(self.length)
+        except (OSError, KeyError, zipfile.BadZipFile) as e:
+            raise EdinetAPIError(f"値を読めません: {e}")
+        return data.decode("utf-16-le").replace('""', '"').strip().strip('"')
+
+
+# テキストブロック（注記などの HTML）の要素IDパターン
+_TEXT_BLOCK_PATTERN = "*TextBlock"
+
+
+# EDINET CSV の列名 → EdinetRow のフィールド（フィールド順）
+_EDINET_COLUMNS: dict[str, str] = {
+    "要素ID": "element_id",
+    "項目名": "label",
+    "コンテキストID": "context_id",
+    "相対年度": "relative_year",
+    "連結・個別": "consolidation",
+    "期間・時点": "period",
+    "ユニットID": "unit_id",
+    "単位": "unit",
+    "値": "value",
+}
+
+
+def _header_columns(header: list[str]) -> tuple[int, list[Optional[int]], int]:
+    """列名の行から (要素ID列の位置, EdinetRow の各フィールドの列位置, 列数) を求める"""
+    # BOM・ダブルクォート除去（BOMとクォートが交互に入る場合も考慮）
+    header = [h.strip().strip("\ufeff").strip('"').strip("\ufeff") for h in header]
+    positions = {name: i for i, name in enumerate(header)}
+    if "要素ID" not in positions:
+        raise EdinetAPIError("EDINET CSV に要素ID列がありません")
+    columns = [positions.get(name) for name in _EDINET_COLUMNS]
+    return positions["要素ID"], columns, len(header)
+
+
+def iter_edinet_rows(
+    f: TextIO, elements: Optional[Container[str]] = None
+) -> Iterator[EdinetRow]:
+    """
+    EDINET CSV（TSV）のテキストストリームを1行ずつ読む
+
+    行をまとめてメモリに載せないため、elements で必要な要素だけに
+    絞り込めば、メモリ使用量はファイルサイズではなく抽出する行数で決まる。
+
+    Args:
+        f: テキストストリーム（UTF-16LE をデコード済み）
+        elements: 読み出す要素IDの集合（省略時はすべての行）
+
+    Yields:
+        EdinetRow
+    """
+    reader = csv.reader(f, delimiter="\t")
+    header = next(reader, None)
+    if header is None:
+        return
+    yield from _iter_records(reader, *_header_columns(header), elements)
+
+
+def _iter_records(
+    reader: Iterable[list[str]],
+    element_pos: int,
+    columns: list[Optional[int]],
+    width: int,
+    elements: Optional[Container[str]],
+) -> Iterator[EdinetRow]:
+    """csv.reader の行を EdinetRow にする（列名の行は読み込み済み）"""
+    for row in reader:
+        if len(row) < width:
+            continue
+        if elements is not None:
+            if row[element_pos].strip().strip('"') not in elements:
                 continue
-            record = {}
-            for i, col in enumerate(header):
-                record[col] = row[i].strip().strip('"')
-            rows.append(record)
-    return rows
+        yield EdinetRow._make(
+            row[i].strip().strip('"') if i is not None else "" for i in columns
+        )
+
+
+def iter_edinet_text(
+    text: str, elements: Optional[Container[str]] = None
+) -> Iterator[EdinetRow]:
+    """
+    デコード済みの EDINET CSV 全体を分割して読む
+
+    EDINET の CSV は全セルがダブルクォートで囲まれているため、行は改行、
+    セルは '"<TAB>"' で分割するだけでよく、csv モジュールをセルごとに通さない。
+    elements を指定した場合は要素IDだけを切り出し、対象外の行は分割しない。
+    セル内に改行・タブ・クォート（""）を含む行に当たったら、その行から先は
+    iter_edinet_rows と同じ csv モジュールの読み方に切り替える。
+
+    Args:
+        text: CSV 全体の文字列（UTF-16LE をデコード済み）
+        elements: 読み出す要素IDの集合（省略時はすべての行）
+
+    Yields:
+        EdinetRow（iter_edinet_rows と同じ内容）
+    """
+    if not text:
+        return
+    lines = text.split("\n")
+    # 分割後は元の文字列を手放す（呼び出し側が持っていなければ解放される）
+    del text
+    header = next(csv.reader([lines[0].rstrip("\r")], delimiter="\t"))
+    element_pos, columns, width = _header_columns(header)
+    in_order = columns == list(range(len(_EDINET_COLUMNS)))
+    first_column = elements is not None and element_pos == 0
+
+    for index, line in enumerate(lines[1:], 1):
+        if line.endswith("\r"):
+            line = line[:-1]
+        if not line:
+            continue
+        # 対象外の要素の行は分割しない（セル内改行で切れた断片もここで読み飛ばす）
+        if first_column and line[1 : line.find('"\t"')].strip() not in elements:  # type: ignore[operator]
+            continue
+        cells = line[1:-1].split('"\t"')
+        # 各セルが "..." で囲まれ、セル内にタブ・改行・クォートがない行だけを分割で読む
+        if not (
+            line[0] == '"' and line[-1] == '"' and line.count('"') == 2 * len(cells)
+        ):
+            rest = io.StringIO("\n".join(lines[index:]), newline="")
+            yield from _iter_records(
+                csv.reader(rest, delimiter="\t"), element_pos, columns, width, elements
+            )
+            return
+        if len(cells) < width:
+            continue
+        if elements is not None and not first_column:
+            if cells[element_pos].strip() not in elements:
+                continue
+        if in_order and len(cells) == width:
+            yield EdinetRow._make(map(str.strip, cells))
+        else:
+            yield EdinetRow._make(
+                cells[i].strip() if i is not None else "" for i in columns
+            )
+
+
+def _iter_binary_rows(
+    raw: IO[bytes], chunk_size: int = 1 << 18
+) -> Iterator[tuple[int, int, str]]:
+    """
+    UTF-16LE のバイナリストリームを1行（レコード）ずつデコードする
+
+    改行で終わる位置までをまとめてデコードし、行のバイト位置は文字数から求める
+    （サロゲートペアを含む場合だけ行ごとにエンコードして測る）。
+    クォートの数が奇数の行（セル内改行）は次の行とつなげる。
+
+    Yields:
+        (行の先頭のバイト位置, 行のバイト数（改行を除く）, 行の文字列（改行を除く）)
+    """
+    offset = 0
+    pending: list[str] = []
+    pending_offset = 0
+    buffer = b""
+    while True:
+        chunk = raw.read(chunk_size)
+        buffer += chunk
+        if chunk:
+            # 2バイト単位で揃った最後の改行（奇数位置は上位バイトが 0x0A の文字）
+            cut = buffer.rfind(b"\n\x00")
+            while cut > 0 and cut % 2:
+                cut = buffer.rfind(b"\n\x00", 0, cut)
+            if cut < 0:
+                continue
+            cut += 2
+        else:
+            cut = len(buffer)
+        text = buffer[:cut].decode("utf-16-le")
+        buffer = buffer[cut:]
+        lines = text.split("\n")
+        if chunk or not lines[-1]:
+            lines.pop()
+        two_bytes = 2 * len(text) == cut
+        for line in lines:
+            size = 2 * len(line) if two_bytes else len(line.encode("utf-16-le"))
+            if pending:
+                pending.append(line)
+                if line.count('"') % 2:
+                    row = "\n".join(pending)
+                    yield pending_offset, offset + size - pending_offset, row
+                    pending = []
+            elif line.count('"') % 2:
+                pending = [line]
+                pending_offset = offset
+            else:
+                yield offset, size, line
+            offset += size + 2
+        if not chunk:
+            break
+    if pending:
+        yield pending_offset, offset - 2 - pending_offset, "\n".join(pending)
+
+
+def _split_row(row: str) -> list[str]:
+    """1行を csv モジュールでセルに分ける（セル内にタブ・改行・クォートを含む行）"""
+    cells = next(csv.reader(io.StringIO(row, newline=""), delimiter="\t"), [])
+    return [cell.strip().strip('"') for cell in cells]
+
+
+def _value_start(row: str, width: int) -> int:
+    """
+    最終列（値）の開き引用符の次の位置を返す
+
+    値より前のセルがすべて "..." で、セル内にクォートがない場合だけ求める。
+    値のセルの中身（タブ・改行・"" を含みうる）は調べない。
+    """
+    start = 0
+    for _ in range(width - 1):
+        start = row.find('"\t"', start) + 3
+        if start < 3:
+            return -1
+    if row[0] != '"' or row[-1] != '"' or row.count('"', 0, start) != 2 * width - 1:
+        return -1
+    return start
+
+
+def iter_edinet_binary(
+    raw: IO[bytes],
+    elements: Optional[Container[str]] = None,
+    text_pattern: Optional[str] = _TEXT_BLOCK_PATTERN,
+    max_value_chars: Optional[int] = None,
+    path: str = "",
+    member: str = "",
+) -> Iterator[EdinetRow]:
+    """
+    EDINET CSV のバイナリストリームを1行ずつ読み、長い値を TextBlockRef にする
+
+    要素IDが text_pattern に合う行、または値が max_value_chars 文字を超える行は、
+    値の文字列を作らずにファイル上のバイト位置（TextBlockRef）を返す。
+    注記などのテキストブロックが CSV の大半を占めるため、数値だけが必要な処理では
+    メモリ使用量と文字列の複製を大きく減らせる。参照は TextBlockRef.read() で読める。
+
+    Args:
+        raw: バイナリストリーム（UTF-16LE の CSV、または ZIP のメンバー）
+        elements: 読み出す要素IDの集合（省略時はすべての行）
+        text_pattern: 値を参照にする要素IDのパターン（fnmatch 形式、None で使わない）
+        max_value_chars: これより長い値を参照にする（None で長さでは判定しない）
+        path: TextBlockRef に記録する CSV または ZIP のパス
+        member: TextBlockRef に記録する ZIP のメンバー名
+
+    Yields:
+        EdinetRow（参照にした行は value が TextBlockRef）
+    """
+    rows = _iter_binary_rows(raw)
+    first = next(rows, None)
+    if first is None:
+        return
+    header = next(csv.reader([first[2].rstrip("\r")], delimiter="\t"), [])
+    element_pos, columns, width = _header_columns(header)
+    in_order = columns == list(range(len(_EDINET_COLUMNS)))
+    first_column = element_pos == 0
+    # 要素IDが先頭・値が最終列の場合だけ、要素IDと値の位置を区切りから求められる
+    # （EDINET の CSV の並び）
+    refs = first_column and columns[-1] == width - 1
+    match = (
+        re.compile(fnmatch.translate(text_pattern)).match
+        if refs and text_pattern is not None
+        else None
+    )
+    threshold = max_value_chars if refs else None
+
+    for offset, size, text in rows:
+        row = text.rstrip("\r")
+        if not row:
+            continue
+        element_id = row[1 : row.find('"\t"')].strip() if first_column else None
+        if (
+            element_id is not None
+            and elements is not None
+            and element_id not in elements
+        ):
+            continue
+
+        matched = (
+            match is not None
+            and element_id is not None
+            and match(element_id) is not None
+        )
+        if matched or (threshold is not None and len(row) > threshold):
+            start = _value_start(row, width)
+            if start > 0 and (
+                matched or (threshold is not None and len(row) - 1 - start > threshold)
+            ):
+                prefix = len(row[:start].encode("utf-16-le"))
+                # 行末の CR は1文字2バイト、値の後ろの閉じクォートも2バイト
+                length = size - 2 * (len(text) - len(row)) - prefix - 2
+                cells: list = [c.strip() for c in row[1 : start - 3].split('"\t"')]
+                cells.append(TextBlockRef(path, member, offset + prefix, length))
+                yield EdinetRow._make(
+                    cells[i] if i is not None else "" for i in columns
+                )
+                continue
+
+        cells = row[1:-1].split('"\t"')
+        if row[0] == '"' and row[-1] == '"' and row.count('"') == 2 * len(cells):
+            cells = [cell.strip() for cell in cells]
+        else:
+            cells = _split_row(row)
+        if len(cells) < width:
+            continue
+        if elements is not None and not first_column:
+            if cells[element_pos] not in elements:
+                continue
+        if in_order and len(cells) == width:
+            yield EdinetRow._make(cells)
+        else:
+            yield EdinetRow._make(cells[i] if i is not None else "" for i in columns)
+
+
+def iter_edinet_csv(
+    csv_path: str | Path,
+    elements: Optional[Container[str]] = None,
+    bulk: bool = False,
+    text_pattern: Optional[str] = None,
+    max_value_chars: Optional[int] = None,
+) -> Generator[EdinetRow, None, None]:
+    """
+    EDINET CSV ファイル（UTF-16LE TSV）を1行ずつ読む
+
+    text_pattern・max_value_chars を指定すると、該当する行の値を読まずに
+    TextBlockRef（ファイル上のバイト位置）にする（iter_edinet_binary）。
+
+    Args:
+        csv_path: CSV ファイルのパス
+        elements: 読み出す要素IDの集合（省略時はすべての行）
+        bulk: True の場合はファイル全体を1回で読んでデコードし、
+            iter_edinet_text で分割する（速いがファイル全体をメモリに載せる）
+        text_pattern: 値を参照にする要素IDのパターン（例: "*TextBlock"）
+        max_value_chars: これより長い値を参照にする
+
+    Yields:
+        EdinetRow（途中でやめる場合は close() でファイルを閉じられる）
+    """
+    if text_pattern is not None or max_value_chars is not None:
+        if bulk:
+            raise EdinetAPIError(
+                "bulk と text_pattern・max_value_chars は同時に指定できません"
+            )
+        with open(csv_path, "rb") as raw:
+            yield from iter_edinet_binary(
+                raw, elements, text_pattern, max_value_chars, path=str(csv_path)
+            )
+        return
+    if bulk:
+        # 読んだバイト列・文字列を手元に残さず、分割後の行だけを持つ
+        yield from iter_edinet_text(
+            Path(csv_path).read_bytes().decode("utf-16-le"), elements
+        )
+        return
+    with open(csv_path, encoding="utf-16le", newline="") as f:
+        yield from iter_edinet_rows(f, elements)
+
+
+def _find_asr_member(zf: zipfile.ZipFile) -> str:
+    """ZIP内の jpcrp030000-asr-*.csv メンバー名を返す"""
+    for name in sorted(zf.namelist()):
+        if fnmatch.fnmatch(PurePosixPath(name).name, _ASR_CSV_PATTERN):
+            return name
+    raise EdinetAPIError(f"{_ASR_CSV_PATTERN} が ZIP 内に見つかりません")
+
+
+# 集計に使うコンテキスト（セグメントなどの軸がない当期・過年度の連結/個別）
+_PLAIN_CONTEXT = re.compile(
+    r"(Prior\d+Year|CurrentYear)(?:Duration|Instant)(_NonConsolidatedMember)?"
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _normalize_context(context_id: str) -> Optional[tuple[str, bool]]:
+    """
+    コンテキストIDを (相対年度, 個別か) に正規化
+
+    軸のない年度コンテキストだけを対象にし、セグメントなどの軸がつくもの
+    （例: "CurrentYearDuration_xxxReportableSegmentMember"）や対象外の年度は None。
+
+    例: "Prior1YearInstant_NonConsolidatedMember" → ("1期前", True)
+    """
+    match = _PLAIN_CONTEXT.fullmatch(context_id)
+    if match is None:
+        return None
+    year_label = _CONTEXT_YEAR_MAP.get(match.group(1))
+    if year_label is None:
+        return None
+    return year_label, match.group(2) is not None
+
+
+def _compile_dispatch(
+    elements: dict[str, str], non_consolidated_elements: dict[str, str]
+) -> dict[tuple[str, str, bool], str]:
+    """
+    要素IDの対応表を (要素ID, 相対年度, 個別か) → 出力キーの振り分け表にする
+
+    連結の指標は個別以外のコンテキスト、個別の指標は NonConsolidatedMember から取る。
+    """
+    dispatch: dict[tuple[str, str, bool], str] = {}
+    for non_consolidated, mapping in (
+        (False, elements),
+        (True, non_consolidated_elements),
+    ):
+        for elem_id, key in mapping.items():
+            for year_label in _CONTEXT_YEAR_MAP.values():
+                dispatch[(elem_id, year_label, non_consolidated)] = key
+    return dispatch
+
+
+# (要素ID, 相対年度, 個別か) → 経営指標等のキー
+_SUMMARY_DISPATCH = _compile_dispatch(_SUMMARY_ELEMENTS, _NON_CONSOLIDATED_ELEMENTS)
+
+
+def _summarize_rows(
+    rows: Iterable["EdinetRow | EdinetFact"],
+    dispatch: dict[tuple[str, str, bool], str] = _SUMMARY_DISPATCH,
+) -> dict[str, dict]:
+    """
+    レコードから経営指標等（5期分）を組み立てる
+
+    Args:
+        rows: EdinetRow（値は文字列）または EdinetFact（値は数値）
+        dispatch: _compile_dispatch で作った振り分け表（省略時は経営指標等）
+    """
+    summary: dict[str, dict] = {
+        year_label: {} for year_label in _CONTEXT_YEAR_MAP.values()
+    }
+    element_ids = (
+        _SUMMARY_ELEMENT_IDS
+        if dispatch is _SUMMARY_DISPATCH
+        else frozenset(elem_id for elem_id, _, _ in dispatch)
+    )
+    normalize = _normalize_context
+    for row in rows:
+        # 大半の行は対象外の要素なので、コンテキストの正規化より先に弾く
+        if row.element_id not in element_ids:
+            continue
+        context = normalize(row.context_id)
+        if context is None:
+            continue
+        key = dispatch.get((row.element_id, *context))
+        if key is not None:
+            value = row.value
+            summary[context[0]][key] = (
+                _parse_value(value) if isinstance(value, str) else value
+            )
+    return summary
+
+
+def _locate_asr_csv(csv_dir: Path) -> Path:
+    """CSVディレクトリ内の jpcrp030000-asr-*.csv を探す（XBRL_TO_CSV サブディレクトリも検索）"""
+    csv_files = [
+        *csv_dir.glob(_ASR_CSV_PATTERN),
+        *(csv_dir / "XBRL_TO_CSV").glob(_ASR_CSV_PATTERN),
+    ]
+    if not csv_files:
+        raise EdinetAPIError(f"{_ASR_CSV_PATTERN} が見つかりません: {csv_dir}")
+    return csv_files[0]
 
 
-def extract_financial_data(csv_dir: str | Path) -> dict:
+@contextlib.contextmanager
+def _open_asr_csv(
+    source: str | Path | bytes | BinaryIO,
+) -> Iterator[tuple[str, BinaryIO]]:
+    """
+    有価証券報告書の CSV をバイナリストリームとして開く（iter_edinet_binary で読む）
+
+    Args:
+        source: CSVディレクトリ（XBRL_TO_CSV/ を含む親ディレクトリ）、CSV ファイル、
+            CSV形式（type=5）の ZIP のパス・バイト列・バイナリストリーム
+
+    Yields:
+        (出所, バイナリストリーム)。出所は CSV のパス、ZIP の場合は
+        "<zip>!<メンバー名>"（バイト列なら メンバー名のみ）
+    """
+    if isinstance(source, (str, Path)):
+        path = Path(source)
+        if not path.is_file() or path.suffix.lower() == ".csv":
+            csv_path = path if path.is_file() else _locate_asr_csv(path)
+            with open(csv_path, "rb") as f:
+                yield str(csv_path), f
+            return
+
+    if isinstance(source, bytes):
+        archive: str | Path | BinaryIO = io.BytesIO(source)
+        label = ""
+    elif isinstance(source, (str, Path)):
+        archive = source
+        label = str(source)
+    else:
+        archive = source
+        label = getattr(source, "name", "")
+
+    try:
+        zf = zipfile.ZipFile(archive)
+    except zipfile.BadZipFile as e:
+        raise EdinetAPIError(f"ZIP ファイルを読み込めません: {e}")
+    with zf:
+        member = _find_asr_member(zf)
+        with zf.open(member) as raw:
+            yield (f"{label}!{member}" if label else member), raw
+
+
+# 抽出結果キャッシュの形式（抽出処理を変えたら上げる）
+_EXTRACT_CACHE_FORMAT = 1
+
+# 抽出処理の版。要素・コンテキストの対応表を変えるとキャッシュが自動的に無効になる
+_EXTRACTOR_VERSION = hashlib.sha256(
+    json.dumps(
+        [
+            _EXTRACT_CACHE_FORMAT,
+            _SUMMARY_ELEMENTS,
+            _NON_CONSOLIDATED_ELEMENTS,
+            _CONTEXT_YEAR_MAP,
+        ],
+        ensure_ascii=False,
+        sort_keys=True,
+    ).encode()
+).hexdigest()[:16]
+
+_EXTRACT_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS file_hashes (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtimeNs INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    sha256 TEXT NOT NULL,
+    version TEXT NOT NULL,
+    member TEXT NOT NULL,
+    result TEXT NOT NULL,
+    PRIMARY KEY (sha256, version)
+);
+"""
+
+
+class _ExtractionCache:
+    """
+    抽出結果のキャッシュ（キャッシュディレクトリの extract_cache.sqlite3）
+
+    CSV・ZIP の内容の SHA-256 と抽出処理の版をキーに経営指標等を保存する。
+    ファイルのパス・サイズ・更新時刻が前回と同じならハッシュも計算し直さない。
+    読み書きの失敗はキャッシュなしとして扱う。
+    """
+
+    def __init__(self):
+        self.conn: Optional[sqlite3.Connection] = None
+        try:
+            path = _get_cache_dir() / "extract_cache.sqlite3"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self.conn = sqlite3.connect(path, timeout=30)
+            self.conn.executescript(_EXTRACT_CACHE_SCHEMA)
+        except (OSError, sqlite3.Error):
+            self.close()
+
+    def close(self) -> None:
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def __enter__(self) -> "_ExtractionCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def file_digest(self, path: Path) -> str:
+        """ファイルの SHA-256（サイズ・更新時刻が変わっていなければ前回の値）"""
+        stat = path.stat()
+        key = str(path.resolve())
+        if self.conn is not None:
+            try:
+                row = self.conn.execute(
+                    "SELECT sha256 FROM file_hashes "
+                    "WHERE path = ? AND size = ? AND mtimeNs = ?",
+                    (key, stat.st_size, stat.st_mtime_ns),
+                ).fetchone()
+                if row:
+                    return row[0]
+            except sqlite3.Error:
+                pass
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        sha256 = digest.hexdigest()
+        if self.conn is not None:
+            try:
+                with self.conn:
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO file_hashes VALUES (?, ?, ?, ?)",
+                        (key, stat.st_size, stat.st_mtime_ns, sha256),
+                    )
+            except sqlite3.Error:
+                pass
+        return sha256
+
+    def get(self, sha256: str) -> Optional[tuple[str, dict]]:
+        """(ZIP 内のメンバー名, 経営指標等) を返す（未保存なら None）"""
+        if self.conn is None:
+            return None
+        try:
+            row = self.conn.execute(
+                "SELECT member, result FROM results WHERE sha256 = ? AND version = ?",
+                (sha256, _EXTRACTOR_VERSION),
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        if not row:
+            return None
+        return row[0], json.loads(row[1])
+
+    def put(self, sha256: str, member: str, summary: dict) -> None:
+        """
+        抽出結果を保存する
+
+        Args:
+            sha256: CSV・ZIP の内容の SHA-256
+            member: ZIP 内のメンバー名（CSV ファイルなら空）
+            summary: 経営指標等
+        """
+        if self.conn is None:
+            return
+        try:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                    (
+                        sha256,
+                        _EXTRACTOR_VERSION,
+                        member,
+                        json.dumps(summary, ensure_ascii=False),
+                    ),
+                )
+        except sqlite3.Error:
+            pass
+
+
+def _extract_summary(source: str | Path | bytes | BinaryIO, use_cache: bool) -> dict:
+    """経営指標等を抽出する（パス・バイト列はキャッシュを使う）"""
+    if not use_cache or not isinstance(source, (str, Path, bytes)):
+        with _open_asr_csv(source) as (label, f):
+            summary = _summarize_rows(iter_edinet_binary(f, _SUMMARY_ELEMENT_IDS))
+        return {"source": label, "経営指標等": summary}
+
+    with _ExtractionCache() as cache:
+        if isinstance(source, bytes):
+            base = ""
+            sha256 = hashlib.sha256(source).hexdigest()
+        else:
+            path = Path(source)
+            if not path.is_file():
+                path = _locate_asr_csv(path)
+            base = str(path)
+            source = path
+            sha256 = cache.file_digest(path)
+
+        cached = cache.get(sha256)
+        if cached is not None:
+            member, summary = cached
+            label = f"{base}!{member}" if base and member else base or member
+            return {"source": label, "経営指標等": summary}
+
+        with _open_asr_csv(source) as (label, f):
+            summary = _summarize_rows(iter_edinet_binary(f, _SUMMARY_ELEMENT_IDS))
+        member = "" if label == base else label.rsplit("!", 1)[-1]
+        cache.put(sha256, member, summary)
+    return {"source": label, "経営指標等": summary}
+
+
+def extract_financial_data(csv_dir: str | Path, use_cache: bool = True) -> dict:
     """
     EDINET CSVディレクトリから主要財務データを抽出
 
+    同じ内容の CSV・ZIP の抽出結果はキャッシュから返す（ファイルが
+    変わっていなければ CSV を読まない）。
+
     Args:
-        csv_dir: CSVディレクトリのパス（XBRL_TO_CSV/ を含む親ディレクトリ）
+        csv_dir: CSVディレクトリのパス（XBRL_TO_CSV/ を含む親ディレクトリ）。
+            CSV形式（type=5）でダウンロードした ZIP ファイルのパスも指定できる
+        use_cache: 抽出結果のキャッシュを使うか
 
     Returns:
         構造化された財務データのdict
     """
-    csv_dir = Path(csv_dir)
+    return _extract_summary(csv_dir, use_cache)
 
-    # jpcrp030000-asr-*.csv を探す（XBRL_TO_CSV サブディレクトリも検索）
-    patterns = [
-        csv_dir / "jpcrp030000-asr-*.csv",
-        csv_dir / "XBRL_TO_CSV" / "jpcrp030000-asr-*.csv",
-    ]
 
-    csv_files = []
-    for pattern in patterns:
-        csv_files.extend(pattern.parent.glob(pattern.name))
+def extract_financial_data_from_zip(
+    source: str | Path | bytes | BinaryIO, use_cache: bool = True
+) -> dict:
+    """
+    CSV形式（type=5）の ZIP から展開せずに主要財務データを抽出
 
-    if not csv_files:
-        raise EdinetAPIError(f"jpcrp030000-asr-*.csv が見つかりません: {csv_dir}")
+    ZIP 内の jpcrp030000-asr-*.csv を直接ストリームで読み、
+    中間ファイルをファイルシステムに書き出さない。
+
+    Args:
+        source: ZIP ファイルのパス、ZIP のバイト列、またはバイナリストリーム
+        use_cache: 抽出結果のキャッシュを使うか（ストリームは常に読み直す）
+
+    Returns:
+        構造化された財務データのdict（source は "<zip>!<メンバー名>"）
+    """
+    return _extract_summary(source, use_cache)
 
-    csv_path = csv_files[0]
-    rows = _parse_edinet_csv(csv_path)
 
-    # 経営指標等（5期分）
-    summary: dict[str, dict] = {}
-    for year_label in _CONTEXT_YEAR_MAP.values():
-        summary[year_label] = {}
+# --- ファクトテーブル ---
+
+
+class EdinetFact(NamedTuple):
+    """数値ファクト（EDINET CSV の数値の1行を正規化したもの）"""
+
+    element_id: str
+    context_id: str
+    relative_year: str
+    consolidation: str
+    period: str
+    unit_id: str
+    value: int | float
+
+
+def iter_facts(rows: Iterable[EdinetRow]) -> Iterator[EdinetFact]:
+    """
+    レコードから数値のファクトだけを取り出す（テキスト・空値・"－" は除く）
 
+    Args:
+        rows: iter_edinet_rows / iter_edinet_csv / iter_edinet_binary のレコード
+
+    Yields:
+        EdinetFact
+    """
     for row in rows:
-        elem_id = row.get("要素ID", "")
-        context_id = row.get("コンテキストID", "")
-        value = row.get("値", "")
-
-        # 連結の経営指標等
-        if elem_id in _SUMMARY_ELEMENTS:
-            for ctx_prefix, year_label in _CONTEXT_YEAR_MAP.items():
-                if (
-                    context_id.startswith(ctx_prefix)
-                    and "NonConsolidated" not in context_id
-                ):
-                    key = _SUMMARY_ELEMENTS[elem_id]
-                    summary[year_label][key] = _parse_value(value)
-
-        # 個別（NonConsolidatedMember）の指標
-        if elem_id in _NON_CONSOLIDATED_ELEMENTS:
-            for ctx_prefix, year_label in _CONTEXT_YEAR_MAP.items():
-                if (
-                    context_id.startswith(ctx_prefix)
-                    and "NonConsolidated" in context_id
-                ):
-                    key = _NON_CONSOLIDATED_ELEMENTS[elem_id]
-                    summary[year_label][key] = _parse_value(value)
-
-    result = {
-        "source": str(csv_path),
-        "経営指標等": summary,
+        if not isinstance(row.value, str):
+            continue
+        value = _parse_value(row.value)
+        if isinstance(value, (int, float)):
+            yield EdinetFact(
+                row.element_id,
+                row.context_id,
+                row.relative_year,
+                row.consolidation,
+                row.period,
+                row.unit_id,
+                value,
+            )
+
+
+def load_element_map(path: str | Path) -> dict[str, str | dict]:
+    """
+    利用者定義の要素対応表（JSON）を読み込む
+
+    形式は {要素ID: 出力キー}。個別（NonConsolidatedMember）の値を取る要素は
+    {要素ID: {"key": 出力キー, "non_consolidated": true}} と書く。
+
+        {
+          "jpcrp_cor:ResearchAndDevelopmentExpensesSummaryOfBusinessResults": "研究開発費",
+          "jpcrp_cor:DividendPaidPerShareSummaryOfBusinessResults":
+            {"key": "1株配当", "non_consolidated": true}
+        }
+
+    Args:
+        path: JSON ファイルのパス
+
+    Returns:
+        要素対応表
+    """
+    try:
+        element_map = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        raise EdinetAPIError(f"要素対応表を読み込めません: {path}: {e}")
+    if not isinstance(element_map, dict):
+        raise EdinetAPIError(
+            f"要素対応表は JSON オブジェクトで指定してください: {path}"
+        )
+    return element_map
+
+
+def _compile_element_map(
+    element_map: dict[str, str | dict],
+) -> dict[tuple[str, str, bool], str]:
+    """利用者定義の要素対応表を振り分け表にする"""
+    elements: dict[str, str] = {}
+    non_consolidated_elements: dict[str, str] = {}
+    for elem_id, target in element_map.items():
+        if isinstance(target, str):
+            elements[elem_id] = target
+        elif isinstance(target, dict) and isinstance(target.get("key"), str):
+            if target.get("non_consolidated"):
+                non_consolidated_elements[elem_id] = target["key"]
+            else:
+                elements[elem_id] = target["key"]
+        else:
+            raise EdinetAPIError(f"要素対応表の値が不正です: {elem_id}")
+    return _compile_dispatch(elements, non_consolidated_elements)
+
+
+def extract_facts(
+    source: str | Path | bytes | BinaryIO,
+    element_map: Optional[dict[str, str | dict]] = None,
+) -> dict:
+    """
+    有価証券報告書の CSV を1回読み、すべての数値ファクトを抽出
+
+    経営指標等（と "指標"）は同じ読み込みの中で元のレコードから組み立てるため、
+    "－" などの数値でない値も extract_financial_data と同じく None として残る。
+
+    Args:
+        source: CSVディレクトリ、または CSV形式（type=5）の ZIP の
+            パス・バイト列・バイナリストリーム
+        element_map: 利用者定義の要素対応表（load_element_map の形式）。
+            指定した場合はファクトから組み立てた値を "指標" に入れる
+
+    Returns:
+        {"source": 出所, "経営指標等": {...}, "facts": [EdinetFact, ...]}
+        （element_map を指定した場合は "指標": {相対年度: {出力キー: 値}} も含む）
+    """
+    dispatch = _compile_element_map(element_map) if element_map else None
+    summary_elements = _SUMMARY_ELEMENT_IDS
+    if dispatch is not None:
+        summary_elements = summary_elements | {elem_id for elem_id, _, _ in dispatch}
+    # iter_facts が除く "－" の行も経営指標等には None として残すため、
+    # 対象の要素の行は数値かどうかにかかわらず取っておく
+    summary_rows: list[EdinetRow] = []
+
+    def keep_summary_rows(rows: Iterable[EdinetRow]) -> Iterator[EdinetRow]:
+        for row in rows:
+            if row.element_id in summary_elements:
+                summary_rows.append(row)
+            yield row
+
+    with _open_asr_csv(source) as (label, f):
+        # テキストブロックの値は文字列にせず参照のまま読み飛ばす
+        facts = list(iter_facts(keep_summary_rows(iter_edinet_binary(f))))
+    result: dict = {
+        "source": label,
+        "経営指標等": _summarize_rows(summary_rows),
+        "facts": facts,
     }
+    if dispatch is not None:
+        result["指標"] = _summarize_rows(summary_rows, dispatch)
+    return result
+
+
+def extract_document(
+    doc_id: str, store: Optional["BlobStore"] = None, use_cache: bool = True
+) -> dict:
+    """
+    書類を CSV形式（type=5）でメモリ上に取得し、そのまま財務データを抽出
 
+    Args:
+        doc_id: 書類管理番号 (例: S100XXXX)
+        store: 指定した場合はストアのブロブから読む（未保存なら取得して保存）
+        use_cache: 抽出結果のキャッシュを使うか
+
+    Returns:
+        構造化された財務データのdict
+    """
+    if store is not None:
+        source: bytes | Path = store.fetch(doc_id, "5")
+    else:
+        source = get_default_client().fetch_document(doc_id, "5")
+    result = extract_financial_data_from_zip(source, use_cache=use_cache)
+    member = result["source"].rsplit("!", 1)[-1]
+    result["source"] = f"{doc_id}!{member}"
     return result
@@ -0,0 +1,138 @@
+"""
+EDINET API v2 の asyncio クライアント
+
+大量の書類をまとめて取得する用途向け。同時実行数を制限しつつ、
+レートリミットの上限までリクエストを並行して送る。
+HTTP 通信は EdinetClient の接続プール付きセッションをワーカースレッドで使う。
+"""
+
+import asyncio
+from typing import Iterable, Optional
+
+from corporate_reports.edinet import (
+    EdinetClient,
+    RateLimiter,
+    _filter_documents,
+    _read_listing_cache,
+    get_shared_rate_limiter,
+)
+
+
+class AsyncRateLimiter:
+    """
+    asyncio 用のレートリミッター
+
+    RateLimiter の枠予約をそのまま使い、待機だけをイベントループ上で行う。
+    同じ RateLimiter を渡せば同期クライアントとも予算を共有できる。
+
+    Args:
+        limiter: 枠の予約に使う RateLimiter（省略時はプロセス共有の既定値）
+    """
+
+    def __init__(self, limiter: Optional[RateLimiter] = None):
+        self.limiter = limiter or get_shared_rate_limiter()
+
+    async def acquire(self) -> float:
+        """
+        リクエスト1回分の許可を得る（必要なら待機する）
+
+        Returns:
+            待機した秒数
+        """
+        wait = await asyncio.to_thread(self.limiter.reserve)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+class AsyncEdinetClient:
+    """
+    EDINET API の非同期クライアント
+
+    Args:
+        client: HTTP 通信に使う EdinetClient（省略時は max_concurrency に
+            合わせた接続プールで生成）
+        max_concurrency: 同時に実行するリクエスト数の上限
+        rate_limiter: 共有する AsyncRateLimiter（省略時は client の
+            レートリミッターを使う）
+    """
+
+    def __init__(
+        self,
+        client: Optional[EdinetClient] = None,
+        max_concurrency: int = 8,
+        rate_limiter: Optional[AsyncRateLimiter] = None,
+    ):
+        self.client = client or EdinetClient(pool_size=max_concurrency)
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = rate_limiter or AsyncRateLimiter(self.client.rate_limiter)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def aclose(self) -> None:
+        await asyncio.to_thread(self.client.close)
+
+    async def __aenter__(self) -> "AsyncEdinetClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    async def fetch_document_list(
+        self, date: str, use_cache: bool = True
+    ) -> list[dict]:
+        """指定日の書類一覧（フィルタなし）を取得（EdinetClient と同じ）"""
+        if use_cache:
+            cached = await asyncio.to_thread(_read_listing_cache, date)
+            if cached is not None:
+                return cached
+
+        async with self._semaphore:
+            await self.rate_limiter.acquire()
+            return await asyncio.to_thread(self.client._get_document_list, date)
+
+    async def search_documents(
+        self,
+        date: str,
+        sec_code: Optional[str] = None,
+        ordinance_code: Optional[str] = None,
+        form_code: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> list[dict]:
+        """書類一覧APIで検索（引数は search_documents と同じ）"""
+        results = await self.fetch_document_list(date, use_cache=use_cache)
+        return _filter_documents(results, sec_code, ordinance_code, form_code)
+
+    async def download_document(
+        self, doc_id: str, doc_type: str, output_path: str, resume: bool = False
+    ) -> str:
+        """
+        書類をダウンロード（引数は download_document と同じ）
+
+        レスポンスはチャンクごとにファイルへ書き込むため、
+        書類全体をメモリに載せない。resume=True では `.part` ファイル
+        経由で書き込み、中断された転送を続きから再開する。
+        """
+        async with self._semaphore:
+            await self.rate_limiter.acquire()
+            return await asyncio.to_thread(
+                self.client._save_document, doc_id, doc_type, output_path, resume
+            )
+
+    async def download_many(
+        self, items: Iterable[tuple[str, str, str]]
+    ) -> list[str | BaseException]:
+        """
+        複数の書類を並行してダウンロード
+
+        Args:
+            items: (書類管理番号, 取得形式, 保存先パス) のイテラブル
+
+        Returns:
+            items と同じ順序の結果リスト。成功時は保存先パス、
+            失敗時はその例外（1件の失敗で全体を中断しない）
+        """
+        tasks = [
+            self.download_document(doc_id, doc_type, output_path)
+            for doc_id, doc_type, output_path in items
+        ]
+        return await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,250 @@
+"""
+EDINET 書類の一括ダウンロード
+
+書類管理番号のリストを作業キューに積み、AsyncEdinetClient で並行取得する。
+取得済みの書類はマニフェスト（書類管理番号・取得形式・サイズ・SHA-256）と
+照合してスキップし、中断された転送は `.part` ファイルから再開する。
+
+ダウンロード済みの CSV ディレクトリ・ZIP からの財務データ抽出も、
+プロセスプールで複数の書類を並行して処理できる（extract_batch）。
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+
+from corporate_reports.edinet import (
+    JST,
+    EdinetAPIError,
+    extract_financial_data,
+    get_default_client,
+)
+from corporate_reports.edinet_async import AsyncEdinetClient
+
+MANIFEST_NAME = "manifest.json"
+
+# 取得形式ごとの保存ファイル拡張子
+_DOC_TYPE_EXTENSIONS: dict[str, str] = {
+    "1": ".zip",
+    "2": ".pdf",
+    "3": ".pdf",
+    "5": ".zip",
+}
+
+
+def document_filename(doc_id: str, doc_type: str) -> str:
+    """一括ダウンロード時の保存ファイル名 (例: S100XXXX_5.zip)"""
+    return f"{doc_id}_{doc_type}{_DOC_TYPE_EXTENSIONS.get(doc_type, '')}"
+
+
+def file_sha256(path: str | Path) -> str:
+    """ファイルの SHA-256 を16進文字列で返す"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DownloadManifest:
+    """
+    ダウンロード済み書類のマニフェスト（出力ディレクトリの manifest.json）
+
+    Args:
+        path: マニフェストファイルのパス
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        try:
+            self.entries: dict[str, dict] = json.loads(
+                self.path.read_text(encoding="utf-8")
+            )
+        except (OSError, ValueError):
+            self.entries = {}
+
+    @staticmethod
+    def _key(doc_id: str, doc_type: str) -> str:
+        return f"{doc_id}:{doc_type}"
+
+    def get(self, doc_id: str, doc_type: str) -> Optional[dict]:
+        return self.entries.get(self._key(doc_id, doc_type))
+
+    def is_complete(self, doc_id: str, doc_type: str, verify: bool = False) -> bool:
+        """
+        マニフェストどおりのファイルが存在するか
+
+        Args:
+            verify: True の場合はサイズに加えて SHA-256 も照合する
+        """
+        entry = self.get(doc_id, doc_type)
+        if not entry:
+            return False
+        path = self.path.parent / entry["file"]
+        try:
+            if path.stat().st_size != entry["size"]:
+                return False
+        except OSError:
+            return False
+        return not verify or file_sha256(path) == entry["sha256"]
+
+    def record(self, doc_id: str, doc_type: str, path: str | Path) -> dict:
+        """ダウンロード済みファイルを登録して保存する"""
+        path = Path(path)
+        entry = {
+            "docID": doc_id,
+            "type": doc_type,
+            "file": os.path.relpath(path, self.path.parent),
+            "size": path.stat().st_size,
+            "sha256": file_sha256(path),
+            "downloadedAt": datetime.now(JST).isoformat(timespec="seconds"),
+        }
+        with self._lock:
+            self.entries[self._key(doc_id, doc_type)] = entry
+            self._save()
+        return entry
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(
+            json.dumps(self.entries, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+        os.replace(tmp_path, self.path)
+
+
+async def _download_batch_async(
+    doc_ids: list[str],
+    doc_type: str,
+    output_dir: Path,
+    client: AsyncEdinetClient,
+    verify: bool,
+    progress: Optional[Callable[[dict], None]],
+) -> list[dict]:
+    manifest = DownloadManifest(output_dir / MANIFEST_NAME)
+    queue: asyncio.Queue[tuple[int, str]] = asyncio.Queue()
+    for i, doc_id in enumerate(doc_ids):
+        queue.put_nowait((i, doc_id))
+    results: list[dict] = [{} for _ in doc_ids]
+
+    async def worker() -> None:
+        while True:
+            try:
+                i, doc_id = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            output_path = output_dir / document_filename(doc_id, doc_type)
+            result = {"docID": doc_id, "type": doc_type, "file": str(output_path)}
+            try:
+                if await asyncio.to_thread(
+                    manifest.is_complete, doc_id, doc_type, verify
+                ):
+                    result["status"] = "skipped"
+                else:
+                    await client.download_document(
+                        doc_id, doc_type, str(output_path), resume=True
+                    )
+                    entry = await asyncio.to_thread(
+                        manifest.record, doc_id, doc_type, output_path
+                    )
+                    result.update(
+                        status="downloaded", size=entry["size"], sha256=entry["sha256"]
+                    )
+            except (EdinetAPIError, OSError) as e:
+                result.update(status="error", message=str(e))
+            results[i] = result
+            if progress:
+                progress(result)
+
+    await asyncio.gather(*(worker() for _ in range(client.max_concurrency)))
+    return results
+
+
+def download_batch(
+    doc_ids: Iterable[str],
+    doc_type: str,
+    output_dir: str | Path,
+    max_concurrency: int = 4,
+    verify: bool = False,
+    client: Optional[AsyncEdinetClient] = None,
+    progress: Optional[Callable[[dict], None]] = None,
+) -> list[dict]:
+    """
+    複数の書類を並行ダウンロード
+
+    マニフェストに登録済みでファイルが揃っている書類はスキップする。
+    1件の失敗で全体を中断せず、結果に status="error" として残す。
+
+    Args:
+        doc_ids: 書類管理番号のリスト（重複は1回だけ取得）
+        doc_type: 取得形式 (1:XBRL, 2:PDF, 3:代替PDF, 5:CSV)
+        output_dir: 保存先ディレクトリ（manifest.json もここに置く）
+        max_concurrency: 同時ダウンロード数
+        verify: スキップ判定でサイズに加えて SHA-256 も照合するか
+        client: 使用する AsyncEdinetClient（省略時は既定の EdinetClient を使う）
+        progress: 1件終わるごとに結果dictで呼ばれるコールバック
+
+    Returns:
+        書類ごとの結果dictのリスト（status: downloaded / skipped / error）
+    """
+    unique_ids = list(dict.fromkeys(doc_ids))
+
+    async def run() -> list[dict]:
+        async_client = client or AsyncEdinetClient(
+            get_default_client(), max_concurrency=max_concurrency
+        )
+        return await _download_batch_async(
+            unique_ids, doc_type, Path(output_dir), async_client, verify, progress
+        )
+
+    return asyncio.run(run())
+
+
+def _extract_one(source: str) -> dict:
+    """プロセスプールのワーカーで1件抽出する（失敗は結果dictで返す）"""
+    try:
+        data = extract_financial_data(source)
+    except (EdinetAPIError, OSError, ValueError) as e:
+        return {"path": source, "status": "error", "message": str(e)}
+    return {"path": source, "status": "success", **data}
+
+
+def extract_batch(
+    sources: Iterable[str | Path], max_workers: Optional[int] = None
+) -> Iterator[dict]:
+    """
+    複数の CSV ディレクトリ・ZIP から財務データを並行抽出
+
+    書類ごとにプロセスプールへ投入し、終わった順に結果を返す。
+    1件の失敗で全体を中断せず、結果に status="error" として残す。
+
+    Args:
+        sources: extract_financial_data に渡す CSV ディレクトリまたは ZIP の
+            パスのリスト（重複は1回だけ処理）
+        max_workers: ワーカープロセス数（省略時は CPU 数）
+
+    Yields:
+        書類ごとの結果dict（path, status: success / error と、
+        success なら抽出結果、error なら message）
+    """
+    unique_sources = list(dict.fromkeys(str(s) for s in sources))
+    if not unique_sources:
+        return
+    workers = min(max_workers or os.cpu_count() or 1, len(unique_sources))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(_extract_one, source): source for source in unique_sources
+        }
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                # ワーカーの異常終了など、結果を受け取れなかった場合
+                yield {"path": futures[future], "status": "error", "message": str(e)}
@@ -0,0 +1,306 @@
+"""
+EDINET コードリストによる証券コード → EDINETコードの解決
+
+金融庁が公開する EDINET コードリスト（EdinetcodeDlInfo.csv、または
+それを含む ZIP）のローカルコピーを読み込み、証券コード（4桁・5桁）から
+EDINETコード・法人番号・決算日・業種を引けるようにする。
+
+決算日が分かれば、有価証券報告書の提出日を決算日から3か月以内の
+窓に絞って検索できる（例: 12月決算なら3月、3月決算なら6月）。
+"""
+
+import calendar
+import csv
+import io
+import json
+import os
+import unicodedata
+import zipfile
+from dataclasses import dataclass
+from datetime import date as date_cls
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Optional, TextIO
+
+from corporate_reports.edinet import (
+    JST,
+    EdinetAPIError,
+    _get_cache_dir,
+    document_listing,
+)
+
+CODE_LIST_FILENAME = "EdinetcodeDlInfo.csv"
+CODE_LIST_URL = (
+    "https://disclosure2dl.edinet-fsa.go.jp/searchdocument/codelist/Edinetcode.zip"
+)
+
+# 解析済みコードリストのキャッシュ形式（項目を変えたら上げる）
+_CACHE_VERSION = 1
+
+# CSV の列名（NFKC 正規化後）→ Filer の属性名
+_COLUMNS = {
+    "EDINETコード": "edinet_code",
+    "証券コード": "sec_code",
+    "提出者法人番号": "jcn",
+    "提出者名": "name",
+    "提出者名(英字)": "name_en",
+    "提出者業種": "industry",
+    "決算日": "fiscal_year_end",
+    "上場区分": "listing",
+    "提出者種別": "filer_type",
+}
+
+
+@dataclass(frozen=True)
+class Filer:
+    """EDINET コードリストの1行（提出者）"""
+
+    edinet_code: str
+    sec_code: str = ""
+    jcn: str = ""
+    name: str = ""
+    name_en: str = ""
+    industry: str = ""
+    fiscal_year_end: str = ""  # "MM-DD"（決算日のない提出者は空）
+    listing: str = ""
+    filer_type: str = ""
+
+    def fiscal_year_end_date(self, year: int) -> Optional[date_cls]:
+        """
+        指定年の決算日（2月末決算など月末を超える日は月末に丸める）
+
+        Args:
+            year: 決算日が属する年
+        """
+        if not self.fiscal_year_end:
+            return None
+        month, day = (int(v) for v in self.fiscal_year_end.split("-"))
+        return date_cls(year, month, min(day, calendar.monthrange(year, month)[1]))
+
+
+def _parse_fiscal_year_end(value: str) -> str:
+    """「3月31日」形式の決算日を "03-31" に変換（解釈できなければ空）"""
+    value = unicodedata.normalize("NFKC", value).strip()
+    if "月" not in value:
+        return ""
+    month, _, day = value.partition("月")
+    try:
+        return f"{int(month):02d}-{int(day.rstrip('日')):02d}"
+    except ValueError:
+        return ""
+
+
+def parse_code_list(f: TextIO) -> list[Filer]:
+    """
+    EDINET コードリストの CSV を解析
+
+    1行目はダウンロード日時などのメタデータ、2行目が列名。
+
+    Args:
+        f: 文字列として読めるファイルオブジェクト（cp932 をデコード済み）
+
+    Returns:
+        Filer のリスト
+    """
+    reader = csv.reader(f)
+    next(reader, None)
+    header = next(reader, None)
+    if not header:
+        raise EdinetAPIError("EDINET コードリストに列名の行がありません")
+    columns = [_COLUMNS.get(unicodedata.normalize("NFKC", h).strip()) for h in header]
+    if "edinet_code" not in columns:
+        raise EdinetAPIError(
+            "EDINET コードリストの形式が不正です（EDINETコード列なし）"
+        )
+
+    filers = []
+    for row in reader:
+        values = {
+            name: value.strip() for name, value in zip(columns, row) if name is not None
+        }
+        if not values.get("edinet_code"):
+            continue
+        values["fiscal_year_end"] = _parse_fiscal_year_end(
+            values.get("fiscal_year_end", "")
+        )
+        filers.append(Filer(**values))
+    return filers
+
+
+def _read_code_list_file(path: Path) -> list[Filer]:
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as zf:
+            members = [n for n in zf.namelist() if n.lower().endswith(".csv")]
+            if not members:
+                raise EdinetAPIError(f"ZIP にコードリストの CSV がありません: {path}")
+            with zf.open(members[0]) as raw:
+                return parse_code_list(io.TextIOWrapper(raw, encoding="cp932"))
+    with open(path, encoding="cp932", newline="") as f:
+        return parse_code_list(f)
+
+
+def default_code_list_path() -> Path:
+    """コードリストの既定パス（EDINET_CODE_LIST、なければキャッシュディレクトリ直下）"""
+    env_path = os.getenv("EDINET_CODE_LIST")
+    if env_path:
+        return Path(env_path)
+    return _get_cache_dir() / CODE_LIST_FILENAME
+
+
+class EdinetCodeList:
+    """
+    証券コード・EDINETコードから提出者を引く表
+
+    Args:
+        filers: Filer のリスト
+    """
+
+    def __init__(self, filers: list[Filer]):
+        self.filers = filers
+        self._by_edinet_code = {f.edinet_code: f for f in filers}
+        self._by_sec_code = {f.sec_code[:4]: f for f in filers if f.sec_code}
+
+    def __len__(self) -> int:
+        return len(self.filers)
+
+    @classmethod
+    def load(cls, path: str | Path | None = None) -> "EdinetCodeList":
+        """
+        コードリストのローカルコピーを読み込む
+
+        解析結果はキャッシュディレクトリに JSON で保存し、元ファイルの
+        サイズと更新時刻が変わらない限り CSV を解析し直さない。
+
+        Args:
+            path: EdinetcodeDlInfo.csv またはそれを含む ZIP
+                （省略時は default_code_list_path()）
+        """
+        path = Path(path) if path else default_code_list_path()
+        try:
+            stat = path.stat()
+        except OSError:
+            raise EdinetAPIError(
+                f"EDINET コードリストが見つかりません: {path}"
+                f"（{CODE_LIST_URL} から取得して配置してください）"
+            )
+        source = {
+            "path": str(path.resolve()),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+        }
+
+        cache_path = _get_cache_dir() / "edinet_codes.json"
+        try:
+            cached = json.loads(cache_path.read_text(encoding="utf-8"))
+            if cached.get("version") == _CACHE_VERSION and cached["source"] == source:
+                fields = cached["fields"]
+                return cls([Filer(**dict(zip(fields, row))) for row in cached["rows"]])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        filers = _read_code_list_file(path)
+        fields = list(Filer.__dataclass_fields__)
+        payload = {
+            "version": _CACHE_VERSION,
+            "source": source,
+            "fields": fields,
+            "rows": [[getattr(f, name) for name in fields] for f in filers],
+        }
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(payload, ensure_ascii=False), "utf-8")
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            # キャッシュ書き込み失敗は読み込み結果に影響させない
+            pass
+        return cls(filers)
+
+    def by_edinet_code(self, edinet_code: str) -> Optional[Filer]:
+        return self._by_edinet_code.get(edinet_code)
+
+    def resolve(self, code: str) -> Optional[Filer]:
+        """
+        証券コード（4桁・5桁）または EDINETコードから提出者を引く
+
+        Args:
+            code: 証券コード (例: "5819", "58190") または EDINETコード (例: "E01350")
+
+        Returns:
+            Filer（見つからなければ None）
+        """
+        code = code.strip()
+        if code[:1].upper() == "E":
+            return self._by_edinet_code.get(code.upper())
+        return self._by_sec_code.get(code[:4])
+
+
+def annual_report_window(
+    filer: Filer, period_end_year: int, lead_months: int = 2
+) -> tuple[str, str]:
+    """
+    有価証券報告書の提出が見込まれる期間
+
+    提出期限は決算日から3か月以内のため、決算日の lead_months か月後の
+    翌日から3か月後の月末までを返す（12月決算なら3月1日〜3月31日）。
+
+    Args:
+        filer: 提出者
+        period_end_year: 決算日が属する年 (例: 2024年12月期なら 2024)
+        lead_months: 窓の開始を決算日の何か月後にするか
+
+    Returns:
+        (開始日, 終了日) の YYYY-MM-DD 文字列
+    """
+    fiscal_year_end = filer.fiscal_year_end_date(period_end_year)
+    if fiscal_year_end is None:
+        raise EdinetAPIError(f"決算日が不明です: {filer.edinet_code}")
+
+    def add_months(months: int, last_day: bool) -> date_cls:
+        month_index = fiscal_year_end.month - 1 + months
+        year = fiscal_year_end.year + month_index // 12
+        month = month_index % 12 + 1
+        days_in_month = calendar.monthrange(year, month)[1]
+        day = days_in_month if last_day else min(fiscal_year_end.day, days_in_month)
+        return date_cls(year, month, day)
+
+    start = add_months(lead_months, last_day=False) + timedelta(days=1)
+    end = add_months(3, last_day=True)
+    return start.isoformat(), end.isoformat()
+
+
+def find_annual_reports(
+    filer: Filer,
+    period_end_year: int,
+    progress: Optional[Callable[[str, int], None]] = None,
+) -> list[dict]:
+    """
+    決算日から見込まれる提出期間だけを検索して有価証券報告書を探す
+
+    Args:
+        filer: 提出者
+        period_end_year: 決算日が属する年
+        progress: 日付ごとに (日付, 一致件数) で呼ばれるコールバック
+
+    Returns:
+        有価証券報告書・訂正有価証券報告書の書類情報のリスト
+    """
+    date_from, date_to = annual_report_window(filer, period_end_year)
+    today = datetime.now(JST).date().isoformat()
+    start = date_cls.fromisoformat(date_from)
+    end = date_cls.fromisoformat(min(date_to, today))
+
+    matches: list[dict] = []
+    for i in range((end - start).days + 1):
+        date = (start + timedelta(days=i)).isoformat()
+        found = [
+            r
+            for r in document_listing(date).query(
+                edinet_code=filer.edinet_code, ordinance_code="010"
+            )
+            if r.get("formCode") in ("030000", "030001")
+        ]
+        matches.extend(found)
+        if progress:
+            progress(date, len(found))
+    return matches
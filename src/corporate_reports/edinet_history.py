@@ -0,0 +1,94 @@
+"""
+複数年の有価証券報告書からの長期時系列の組み立て
+
+有報の経営指標等は当期と過去4期の5期分しかなく、毎年の有報で同じ年度が
+重複する。各有報の抽出結果（extract_financial_data の出力）を決算年で
+並べ直し、同じ年度・指標は提出日が最も新しい有報（修正再表示後）の値を使う。
+
+抽出結果は保存済みの JSON をそのまま使えるため、新しい有報を1件加えても
+CSV を読むのはその1件だけで済む。
+"""
+
+from typing import Iterable, Optional
+
+from corporate_reports.edinet import EdinetAPIError, parse_asr_filename
+
+
+def stitch_history(
+    extractions: Iterable[dict], edinet_code: Optional[str] = None
+) -> dict:
+    """
+    1社分の抽出結果を決算年ごとの長期時系列にまとめる
+
+    Args:
+        extractions: extract_financial_data / extract_document の結果
+            （source が有報の CSV ファイル名で終わるもの）
+        edinet_code: 対象の EDINETコード（省略時は抽出結果が1社分であること）
+
+    Returns:
+        {
+            "edinetCode": EDINETコード,
+            "経営指標等": {決算年: {キー: 値}},
+            "provenance": {決算年: {キー: 値を採用した CSV ファイル名}},
+            "restated": [{"fiscalYear", "key", "value", "previous", "source"}],
+            "filings": 古い順の CSV ファイル名のリスト,
+        }
+    """
+    filings = []
+    for extraction in extractions:
+        info = parse_asr_filename(extraction.get("source", ""))
+        if info is None:
+            raise EdinetAPIError(
+                f"抽出結果の出所から書類の属性を読み取れません: {extraction.get('source')}"
+            )
+        if edinet_code and info.edinet_code != edinet_code:
+            continue
+        filings.append((info, extraction))
+    if not filings:
+        raise EdinetAPIError("対象の抽出結果がありません")
+    codes = {info.edinet_code for info, _ in filings}
+    if len(codes) > 1:
+        raise EdinetAPIError(
+            f"複数の会社の抽出結果が含まれています（EDINETコードを指定してください）: "
+            f"{', '.join(sorted(codes))}"
+        )
+
+    # 古い順に重ね、新しい有報の値で上書きする
+    filings.sort(key=lambda f: (f[0].submit_date, f[0].submission_no))
+    values: dict[int, dict] = {}
+    provenance: dict[int, dict] = {}
+    restated = []
+    names = []
+    for info, extraction in filings:
+        name = extraction["source"].rsplit("!", 1)[-1].rsplit("/", 1)[-1]
+        names.append(name)
+        for year_label, metrics in extraction.get("経営指標等", {}).items():
+            year = info.fiscal_year(year_label)
+            year_values = values.setdefault(year, {})
+            year_provenance = provenance.setdefault(year, {})
+            for key, value in metrics.items():
+                # 値のない（"－"）年度は前の有報の値を残す
+                if value is None:
+                    continue
+                previous = year_values.get(key)
+                if previous is not None and previous != value:
+                    restated.append(
+                        {
+                            "fiscalYear": year,
+                            "key": key,
+                            "value": value,
+                            "previous": previous,
+                            "source": name,
+                        }
+                    )
+                year_values[key] = value
+                year_provenance[key] = name
+
+    years = sorted(year for year, metrics in values.items() if metrics)
+    return {
+        "edinetCode": codes.pop(),
+        "経営指標等": {str(year): values[year] for year in years},
+        "provenance": {str(year): provenance[year] for year in years},
+        "restated": restated,
+        "filings": names,
+    }
@@ -0,0 +1,547 @@
+"""
+EDINET 書類一覧のローカル SQLite インデックス
+
+日次の書類一覧を取り込み、証券コード・様式コード・提出日時などで
+ネットワークに触れずに期間検索できるようにする。
+"""
+
+import json
+import sqlite3
+from datetime import date as date_cls
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Optional
+
+from corporate_reports.edinet import (
+    JST,
+    EdinetAPIError,
+    _end_of_day,
+    _get_cache_dir,
+    fetch_document_list,
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    docID TEXT PRIMARY KEY,
+    listingDate TEXT NOT NULL,
+    submitDateTime TEXT,
+    secCode TEXT,
+    secCode4 TEXT,
+    edinetCode TEXT,
+    formCode TEXT,
+    ordinanceCode TEXT,
+    docTypeCode TEXT,
+    parentDocID TEXT,
+    filerName TEXT,
+    docDescription TEXT,
+    raw TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_documents_sec_code
+    ON documents (secCode4, submitDateTime);
+CREATE INDEX IF NOT EXISTS idx_documents_edinet_code
+    ON documents (edinetCode, submitDateTime);
+CREATE INDEX IF NOT EXISTS idx_documents_form_code
+    ON documents (formCode, submitDateTime);
+CREATE INDEX IF NOT EXISTS idx_documents_ordinance_code
+    ON documents (ordinanceCode, submitDateTime);
+CREATE INDEX IF NOT EXISTS idx_documents_submit_date_time
+    ON documents (submitDateTime);
+CREATE INDEX IF NOT EXISTS idx_documents_parent_doc_id
+    ON documents (parentDocID);
+CREATE TABLE IF NOT EXISTS ingested_dates (
+    date TEXT PRIMARY KEY,
+    ingestedAt TEXT NOT NULL,
+    docCount INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+# 取下書（1）と取り下げられた書類（2）は有効な版として扱わない
+_WITHDRAWN_STATUSES = ("1", "2")
+
+
+def default_index_path() -> Path:
+    """インデックスDBの既定パス（キャッシュディレクトリ直下）"""
+    return _get_cache_dir() / "index.sqlite3"
+
+
+def _date_range(date_from: str, date_to: str) -> list[str]:
+    start = date_cls.fromisoformat(date_from)
+    end = date_cls.fromisoformat(date_to)
+    if end < start:
+        raise EdinetAPIError(f"期間指定が不正です: {date_from} > {date_to}")
+    return [
+        (start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)
+    ]
+
+
+def _next_day(date: str) -> str:
+    return (date_cls.fromisoformat(date) + timedelta(days=1)).isoformat()
+
+
+class EdinetIndex:
+    """
+    書類一覧の SQLite インデックス
+
+    Args:
+        path: DBファイルのパス（省略時は default_index_path()）
+    """
+
+    def __init__(self, path: str | Path | None = None):
+        self.path = Path(path) if path else default_index_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "EdinetIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def is_ingested(self, date: str) -> bool:
+        row = self.conn.execute(
+            "SELECT 1 FROM ingested_dates WHERE date = ?", (date,)
+        ).fetchone()
+        return row is not None
+
+    def is_complete(self, date: str) -> bool:
+        """その日（JST）が終わった後に取り込んだか（途中までの一覧でないか）"""
+        row = self.conn.execute(
+            "SELECT ingestedAt FROM ingested_dates WHERE date = ?", (date,)
+        ).fetchone()
+        if row is None:
+            return False
+        return datetime.fromisoformat(row[0]).timestamp() >= _end_of_day(date)
+
+    def ingest(self, date: str, results: list[dict]) -> int:
+        """
+        1日分の書類一覧を取り込む
+
+        Args:
+            date: 書類一覧の対象日 (YYYY-MM-DD)
+            results: fetch_document_list() の戻り値
+
+        Returns:
+            取り込んだ書類数
+        """
+        rows = []
+        for r in results:
+            if not r.get("docID"):
+                continue
+            sec_code = r.get("secCode")
+            rows.append(
+                (
+                    r["docID"],
+                    date,
+                    r.get("submitDateTime"),
+                    sec_code,
+                    sec_code[:4] if sec_code else None,
+                    r.get("edinetCode"),
+                    r.get("formCode"),
+                    r.get("ordinanceCode"),
+                    r.get("docTypeCode"),
+                    r.get("parentDocID"),
+                    r.get("filerName"),
+                    r.get("docDescription"),
+                    json.dumps(r, ensure_ascii=False),
+                )
+            )
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO documents "
+                "(docID, listingDate, submitDateTime, secCode, secCode4, "
+                "edinetCode, formCode, ordinanceCode, docTypeCode, parentDocID, "
+                "filerName, docDescription, raw) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO ingested_dates (date, ingestedAt, docCount) "
+                "VALUES (?, ?, ?)",
+                (date, datetime.now(JST).isoformat(timespec="seconds"), len(rows)),
+            )
+        return len(rows)
+
+    def build(
+        self,
+        date_from: str,
+        date_to: str,
+        refresh: bool = False,
+        progress: Optional[Callable[[str, int], None]] = None,
+    ) -> dict:
+        """
+        期間内の書類一覧を取り込む
+
+        その日が終わった後に取り込み済みの日はスキップする（当日以降や、
+        当日のうちに取り込んだ途中までの日は取り直す）。
+
+        Args:
+            date_from: 開始日 (YYYY-MM-DD)
+            date_to: 終了日 (YYYY-MM-DD)
+            refresh: True の場合は取り込み済みの日も取り直す
+            progress: 1日取り込むごとに (日付, 書類数) で呼ばれるコールバック
+
+        Returns:
+            {"dates": 取り込んだ日数, "skipped": スキップ日数, "documents": 書類数}
+        """
+        summary = {"dates": 0, "skipped": 0, "documents": 0}
+        for date in _date_range(date_from, date_to):
+            if not refresh and self.is_complete(date):
+                summary["skipped"] += 1
+                continue
+            count = self.ingest(date, fetch_document_list(date, use_cache=not refresh))
+            summary["dates"] += 1
+            summary["documents"] += count
+            if progress:
+                progress(date, count)
+        return summary
+
+    def get_watermark(self) -> Optional[str]:
+        """取り込みが完了している最終日（sync の再開位置）"""
+        row = self.conn.execute(
+            "SELECT value FROM sync_state WHERE key = 'watermark'"
+        ).fetchone()
+        return row[0] if row else None
+
+    def set_watermark(self, date: str) -> None:
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sync_state (key, value) "
+                "VALUES ('watermark', ?)",
+                (date,),
+            )
+
+    def _known_doc_ids(self, doc_ids: list[str]) -> set[str]:
+        known: set[str] = set()
+        # SQLite のプレースホルダ上限に収まるよう分割して問い合わせる
+        for i in range(0, len(doc_ids), 500):
+            chunk = doc_ids[i : i + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            known.update(
+                doc_id
+                for (doc_id,) in self.conn.execute(
+                    f"SELECT docID FROM documents WHERE docID IN ({placeholders})",
+                    chunk,
+                )
+            )
+        return known
+
+    def sync(
+        self,
+        date_from: Optional[str] = None,
+        progress: Optional[Callable[[str, int], None]] = None,
+    ) -> dict:
+        """
+        前回の続きから当日までの書類一覧を取り込む
+
+        ウォーターマーク（取り込み完了日）の翌日から当日（JST）までを取得する。
+        当日分は提出が続くため、ウォーターマークは前日までしか進めない。
+        その日が終わった後に取り込み済みの日（build 済みなど）はスキップし、
+        当日のうちに取り込んだ日は途中までの一覧が残らないようキャッシュを使わずに取り直す。
+
+        Args:
+            date_from: ウォーターマークが未設定のときの開始日 (YYYY-MM-DD)
+            progress: 1日取り込むごとに (日付, 書類数) で呼ばれるコールバック
+
+        Returns:
+            {"from", "to", "dates", "skipped", "watermark",
+            "new_documents": 新規書類のリスト}
+        """
+        today = datetime.now(JST).date()
+        watermark = self.get_watermark()
+        if watermark:
+            start = _next_day(watermark)
+        elif date_from:
+            start = date_from
+        else:
+            raise EdinetAPIError("初回の sync では --from で開始日を指定してください")
+
+        summary: dict = {
+            "from": start,
+            "to": today.isoformat(),
+            "dates": 0,
+            "skipped": 0,
+            "watermark": watermark,
+            "new_documents": [],
+        }
+        if start > today.isoformat():
+            return summary
+
+        yesterday = (today - timedelta(days=1)).isoformat()
+        if watermark is None:
+            # 初回に当日分しか取り込めなくても、次回は開始日から再開できるようにする
+            watermark = (date_cls.fromisoformat(start) - timedelta(days=1)).isoformat()
+            self.set_watermark(watermark)
+            summary["watermark"] = watermark
+        for date in _date_range(start, today.isoformat()):
+            if self.is_complete(date):
+                summary["skipped"] += 1
+            else:
+                # 取り込み済みでも完了していない日は、キャッシュの一覧も途中まで
+                results = fetch_document_list(
+                    date, use_cache=not self.is_ingested(date)
+                )
+                doc_ids = [r["docID"] for r in results if r.get("docID")]
+                known = self._known_doc_ids(doc_ids)
+                count = self.ingest(date, results)
+                summary["new_documents"].extend(
+                    r for r in results if r.get("docID") and r["docID"] not in known
+                )
+                summary["dates"] += 1
+                if progress:
+                    progress(date, count)
+            if date <= yesterday:
+                self.set_watermark(date)
+                summary["watermark"] = date
+        return summary
+
+    def get(self, doc_id: str) -> Optional[dict]:
+        """書類管理番号で書類情報を引く（未取り込みなら None）"""
+        row = self.conn.execute(
+            "SELECT raw FROM documents WHERE docID = ?", (doc_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def original_doc_id(self, doc_id: str) -> str:
+        """parentDocID をたどって訂正の元になった最初の書類の書類管理番号を返す"""
+        seen = {doc_id}
+        while True:
+            row = self.conn.execute(
+                "SELECT parentDocID FROM documents WHERE docID = ?", (doc_id,)
+            ).fetchone()
+            if not row or not row[0] or row[0] in seen:
+                return doc_id
+            doc_id = row[0]
+            seen.add(doc_id)
+
+    def amendment_chain(self, doc_id: str) -> list[dict]:
+        """
+        原本とそのすべての訂正報告書を提出日時順に返す
+
+        Args:
+            doc_id: 原本・訂正報告書いずれかの書類管理番号
+
+        Returns:
+            書類情報のリスト（先頭が原本。未取り込みの書類は含まない）
+        """
+        sql = """
+            WITH RECURSIVE chain(docID) AS (
+                SELECT ?
+                UNION
+                SELECT d.docID FROM documents d JOIN chain c ON d.parentDocID = c.docID
+            )
+            SELECT raw FROM documents WHERE docID IN (SELECT docID FROM chain)
+            ORDER BY submitDateTime, docID
+        """
+        root = self.original_doc_id(doc_id)
+        return [json.loads(raw) for (raw,) in self.conn.execute(sql, (root,))]
+
+    def latest_effective(self, doc_id: str) -> Optional[dict]:
+        """
+        訂正を反映した最新の有効な版を返す
+
+        原本と訂正報告書のうち、取り下げられていない最後に提出された書類。
+
+        Args:
+            doc_id: 原本・訂正報告書いずれかの書類管理番号
+
+        Returns:
+            書類情報（インデックスにない・すべて取り下げ済みなら None）
+        """
+        effective = [
+            r
+            for r in self.amendment_chain(doc_id)
+            if r.get("withdrawalStatus") not in _WITHDRAWN_STATUSES
+        ]
+        return effective[-1] if effective else None
+
+    def resolve_latest(self, doc_ids: list[str]) -> list[str]:
+        """
+        書類管理番号をそれぞれ最新の有効な版に置き換える
+
+        同じ原本に属する書類は1件にまとめるため、原本と訂正報告書を
+        並べて渡しても訂正後の版だけを取得できる。インデックスにない
+        書類管理番号はそのまま残す。
+
+        Args:
+            doc_ids: 書類管理番号のリスト
+
+        Returns:
+            置き換え後の書類管理番号のリスト（重複なし、入力順）
+        """
+        resolved = []
+        for doc_id in doc_ids:
+            latest = self.latest_effective(doc_id)
+            resolved.append(latest["docID"] if latest else doc_id)
+        return list(dict.fromkeys(resolved))
+
+    def watched_amendments(
+        self,
+        documents: list[dict],
+        sec_codes: list[str],
+        ordinance_code: Optional[str] = None,
+        form_code: Optional[str] = None,
+        doc_type_code: Optional[str] = None,
+    ) -> list[dict]:
+        """
+        原本がウォッチリストの条件に一致する訂正報告書を抽出
+
+        訂正報告書は様式コード・書類種別コードが原本と異なるため、
+        原本の書類情報で filter_watch_list() の条件を判定する。
+
+        Args:
+            documents: 書類情報のリスト（sync の新着書類など）
+            sec_codes: 証券コード（4桁または5桁、先頭4桁で一致）
+            ordinance_code: 原本の府令コード
+            form_code: 原本の様式コード
+            doc_type_code: 原本の書類種別コード
+
+        Returns:
+            条件に一致する訂正報告書の書類情報のリスト
+        """
+        amendments = []
+        for r in documents:
+            if not r.get("parentDocID"):
+                continue
+            original = self.get(self.original_doc_id(r["docID"]))
+            if original is None:
+                # 原本が取り込み範囲外なら証券コードと府令コードだけで判定する
+                hit = filter_watch_list([r], sec_codes, ordinance_code)
+            else:
+                hit = filter_watch_list(
+                    [original], sec_codes, ordinance_code, form_code, doc_type_code
+                )
+            if hit:
+                amendments.append(r)
+        return amendments
+
+    def search(
+        self,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        sec_code: Optional[str] = None,
+        edinet_code: Optional[str] = None,
+        ordinance_code: Optional[str] = None,
+        form_code: Optional[str] = None,
+        doc_type_code: Optional[str] = None,
+    ) -> list[dict]:
+        """
+        インデックスから書類を検索（提出日時順）
+
+        Args:
+            date_from: 提出日の下限 (YYYY-MM-DD)
+            date_to: 提出日の上限 (YYYY-MM-DD、当日を含む)
+            sec_code: 証券コード（4桁または5桁、先頭4桁で一致）
+            edinet_code: EDINETコード (例: "E01350")
+            ordinance_code: 府令コード
+            form_code: 様式コード
+            doc_type_code: 書類種別コード
+
+        Returns:
+            書類情報のリスト（書類一覧APIと同じ形式）
+        """
+        where = []
+        params: list[str] = []
+        if date_from:
+            where.append("submitDateTime >= ?")
+            params.append(date_from)
+        if date_to:
+            where.append("submitDateTime < ?")
+            params.append(_next_day(date_to))
+        for column, value in (
+            ("secCode4", sec_code[:4] if sec_code else None),
+            ("edinetCode", edinet_code),
+            ("ordinanceCode", ordinance_code),
+            ("formCode", form_code),
+            ("docTypeCode", doc_type_code),
+        ):
+            if value:
+                where.append(f"{column} = ?")
+                params.append(value)
+
+        sql = "SELECT raw FROM documents"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY submitDateTime, docID"
+        return [json.loads(raw) for (raw,) in self.conn.execute(sql, params)]
+
+
+def filter_watch_list(
+    documents: list[dict],
+    sec_codes: list[str],
+    ordinance_code: Optional[str] = None,
+    form_code: Optional[str] = None,
+    doc_type_code: Optional[str] = None,
+) -> list[dict]:
+    """
+    書類リストからウォッチリストの証券コードに該当するものを抽出
+
+    Args:
+        documents: 書類情報のリスト
+        sec_codes: 証券コード（4桁または5桁、先頭4桁で一致）
+        ordinance_code: 府令コード
+        form_code: 様式コード
+        doc_type_code: 書類種別コード
+
+    Returns:
+        条件に一致する書類情報のリスト
+    """
+    watch = {code[:4] for code in sec_codes}
+    return [
+        r
+        for r in documents
+        if r.get("secCode")
+        and r["secCode"][:4] in watch
+        and (not ordinance_code or r.get("ordinanceCode") == ordinance_code)
+        and (not form_code or r.get("formCode") == form_code)
+        and (not doc_type_code or r.get("docTypeCode") == doc_type_code)
+    ]
+
+
+def search_documents_range(
+    date_from: str,
+    date_to: Optional[str] = None,
+    sec_code: Optional[str] = None,
+    edinet_code: Optional[str] = None,
+    ordinance_code: Optional[str] = None,
+    form_code: Optional[str] = None,
+    doc_type_code: Optional[str] = None,
+    index_path: str | Path | None = None,
+) -> list[dict]:
+    """
+    ローカルインデックスから期間検索（ネットワークアクセスなし）
+
+    事前に `corporate-reports edinet index build` で対象期間を
+    取り込んでおく必要がある。
+
+    Args:
+        date_from: 提出日の下限 (YYYY-MM-DD)
+        date_to: 提出日の上限 (YYYY-MM-DD、省略時は上限なし)
+        sec_code: 証券コード（4桁または5桁）
+        edinet_code: EDINETコード
+        ordinance_code: 府令コード (例: "010" = 金商法)
+        form_code: 様式コード (例: "030000" = 有価証券報告書)
+        doc_type_code: 書類種別コード (例: "120" = 有価証券報告書)
+        index_path: インデックスDBのパス
+
+    Returns:
+        書類情報のリスト
+    """
+    with EdinetIndex(index_path) as index:
+        return index.search(
+            date_from=date_from,
+            date_to=date_to,
+            sec_code=sec_code,
+            edinet_code=edinet_code,
+            ordinance_code=ordinance_code,
+            form_code=form_code,
+            doc_type_code=doc_type_code,
+        )
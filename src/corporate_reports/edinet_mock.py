@@ -0,0 +1,284 @@
+"""
+EDINET API のカセット（記録・再生）とローカルモックサーバー
+
+実 API のレスポンスを一度だけカセットに記録し、以降はオフラインで再生する。
+MockEdinetServer はカセットを HTTP で配信し、遅延や 429 を注入できるため、
+検索・ダウンロード・一括取得のスループットを再現性のある条件で計測できる。
+
+カセットのディレクトリ構成:
+    documents/<日付>.json        書類一覧APIのレスポンス本文
+    files/<書類管理番号>_<type>  書類取得APIのレスポンス本文
+    files/<書類管理番号>_<type>.json  Content-Type などのメタデータ
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from corporate_reports.edinet import EdinetAPIError, EdinetClient
+
+_LIST_PATH = re.compile(r"/documents\.json$")
+_DOCUMENT_PATH = re.compile(r"/documents/(?P<doc_id>[^/]+)$")
+
+
+class Cassette:
+    """
+    記録済みレスポンスの保存先
+
+    Args:
+        path: カセットのディレクトリ
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+    def key(self, url: str) -> Optional[Path]:
+        """リクエストURLに対応するカセット内のファイルパス（対象外は None）"""
+        parts = urlsplit(url)
+        query = parse_qs(parts.query)
+        if _LIST_PATH.search(parts.path):
+            date = query.get("date", [""])[0]
+            return self.path / "documents" / f"{date}.json" if date else None
+        match = _DOCUMENT_PATH.search(parts.path)
+        if match:
+            doc_type = query.get("type", [""])[0]
+            return self.path / "files" / f"{match['doc_id']}_{doc_type}"
+        return None
+
+    def load(self, url: str) -> Optional[tuple[bytes, str]]:
+        """記録済みの (本文, Content-Type) を返す（未記録なら None）"""
+        path = self.key(url)
+        if path is None or not path.exists():
+            return None
+        if path.suffix == ".json":
+            return path.read_bytes(), "application/json; charset=utf-8"
+        meta_path = path.with_name(path.name + ".json")
+        content_type = "application/octet-stream"
+        if meta_path.exists():
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            content_type = meta.get("content_type", content_type)
+        return path.read_bytes(), content_type
+
+    def save(self, url: str, body: bytes, content_type: str) -> None:
+        """レスポンスを記録する（APIキーを含むクエリは保存しない）"""
+        path = self.key(url)
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(body)
+        if path.suffix != ".json":
+            meta_path = path.with_name(path.name + ".json")
+            meta_path.write_text(
+                json.dumps({"content_type": content_type}), encoding="utf-8"
+            )
+
+
+class CassetteAdapter(BaseAdapter):
+    """
+    requests のトランスポートアダプター
+
+    mode="record" では実際に通信してレスポンスをカセットへ記録し、
+    mode="replay" ではカセットだけから応答する（未記録なら 404）。
+    リトライやレートリミットなど EdinetClient 側の処理はそのまま動く。
+    """
+
+    def __init__(self, cassette: Cassette, mode: str = "replay"):
+        super().__init__()
+        if mode not in ("record", "replay"):
+            raise EdinetAPIError(f"カセットのモードが不正です: {mode}")
+        self.cassette = cassette
+        self.mode = mode
+        self._real = HTTPAdapter()
+
+    def send(
+        self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None
+    ):
+        url = request.url or ""
+        if self.mode == "record":
+            response = self._real.send(
+                request,
+                stream=False,
+                timeout=timeout,
+                verify=verify,
+                cert=cert,
+                proxies=proxies,
+            )
+            if response.status_code == 200:
+                self.cassette.save(
+                    url,
+                    response.content,
+                    response.headers.get("Content-Type", "application/octet-stream"),
+                )
+            return response
+
+        recorded = self.cassette.load(url)
+        if recorded is None:
+            return _build_response(
+                request, 404, b'{"metadata": {"status": "404"}}', "application/json"
+            )
+        body, content_type = recorded
+        return _build_response(request, 200, body, content_type)
+
+    def close(self) -> None:
+        self._real.close()
+
+
+def _build_response(
+    request: requests.PreparedRequest, status: int, body: bytes, content_type: str
+) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.reason = "OK" if status == 200 else "Not Found"
+    response.headers = CaseInsensitiveDict(
+        {"Content-Type": content_type, "Content-Length": str(len(body))}
+    )
+    response._content = body
+    response._content_consumed = True
+    response.url = request.url or ""
+    response.request = request
+    response.encoding = "utf-8"
+    return response
+
+
+def use_cassette(client: EdinetClient, path: str | Path, mode: str = "replay") -> None:
+    """
+    クライアントのセッションにカセットを組み込む
+
+    Args:
+        client: 対象の EdinetClient
+        path: カセットのディレクトリ
+        mode: "record"（実通信して記録）または "replay"（カセットのみで応答）
+    """
+    adapter = CassetteAdapter(Cassette(path), mode)
+    client.session.mount("https://", adapter)
+    client.session.mount("http://", adapter)
+
+
+class MockEdinetServer:
+    """
+    カセットを配信するローカル HTTP サーバー（EDINET API v2 互換のパス）
+
+    Args:
+        cassette: カセットのディレクトリ
+        host: 待ち受けアドレス
+        port: 待ち受けポート（0 で空きポートを自動選択）
+        latency: 各レスポンスに加える遅延（秒）
+        error_rate: 429 を返す確率（0〜1）
+        retry_after: 429 に付ける Retry-After（秒、None で付けない）
+        seed: 429 注入に使う乱数のシード（再現性のため）
+    """
+
+    def __init__(
+        self,
+        cassette: str | Path,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        retry_after: Optional[int] = 1,
+        seed: Optional[int] = 0,
+    ):
+        self.cassette = Cassette(cassette)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "throttled": 0, "not_found": 0}
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/v2"
+
+    def start(self) -> "MockEdinetServer":
+        """バックグラウンドスレッドで起動する"""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """現在のスレッドで起動する（Ctrl-C で停止）"""
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "MockEdinetServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _should_throttle(self) -> bool:
+        with self._lock:
+            self.stats["requests"] += 1
+            throttled = self._random.random() < self.error_rate
+            if throttled:
+                self.stats["throttled"] += 1
+            return throttled
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                if server.latency:
+                    time.sleep(server.latency)
+                if server._should_throttle():
+                    headers = {}
+                    if server.retry_after is not None:
+                        headers["Retry-After"] = str(server.retry_after)
+                    self._reply(429, b"Too Many Requests", "text/plain", headers)
+                    return
+                recorded = server.cassette.load(self.path)
+                if recorded is None:
+                    with server._lock:
+                        server.stats["not_found"] += 1
+                    self._reply(
+                        404, b'{"metadata": {"status": "404"}}', "application/json"
+                    )
+                    return
+                body, content_type = recorded
+                self._reply(200, body, content_type)
+
+            def _reply(
+                self,
+                status: int,
+                body: bytes,
+                content_type: str,
+                headers: Optional[dict[str, str]] = None,
+            ) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args) -> None:
+                pass
+
+        return Handler
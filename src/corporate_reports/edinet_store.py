@@ -0,0 +1,225 @@
+"""
+EDINET 書類のコンテンツアドレス型ストア
+
+ダウンロードした書類を SHA-256 を名前にしたブロブとして1か所に保存し、
+(書類管理番号, 取得形式) → ハッシュの対応を SQLite に記録する。
+同じ書類を複数の作業ディレクトリで使うときはブロブからハードリンク
+（またはシンボリックリンク）で取り出すため、ディスクを重複して使わず、
+2回目以降の取得は API を呼ばないローカル参照になる。
+
+    <root>/blobs/ab/abcdef...   ブロブ（読み取り専用）
+    <root>/refs.sqlite3         書類管理番号・取得形式 → ハッシュ
+"""
+
+import hashlib
+import os
+import shutil
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from corporate_reports.edinet import (
+    JST,
+    EdinetAPIError,
+    EdinetClient,
+    _get_cache_dir,
+    get_default_client,
+)
+
+LINK_MODES = ("hardlink", "symlink", "copy")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS refs (
+    docID TEXT NOT NULL,
+    type TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    storedAt TEXT NOT NULL,
+    PRIMARY KEY (docID, type)
+);
+CREATE INDEX IF NOT EXISTS idx_refs_sha256 ON refs (sha256);
+"""
+
+
+def default_store_path() -> Path:
+    """ストアの既定パス（EDINET_STORE_DIR、なければキャッシュディレクトリ直下）"""
+    env_path = os.getenv("EDINET_STORE_DIR")
+    if env_path:
+        return Path(env_path)
+    return _get_cache_dir() / "store"
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BlobStore:
+    """
+    書類のコンテンツアドレス型ストア
+
+    Args:
+        root: ストアのディレクトリ（省略時は default_store_path()）
+        client: 未保存の書類の取得に使う EdinetClient（省略時は既定のクライアント）
+    """
+
+    def __init__(
+        self, root: str | Path | None = None, client: Optional[EdinetClient] = None
+    ):
+        self.root = Path(root) if root else default_store_path()
+        self.client = client
+        (self.root / "blobs").mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.root / "refs.sqlite3", check_same_thread=False)
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "BlobStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def blob_path(self, sha256: str) -> Path:
+        return self.root / "blobs" / sha256[:2] / sha256
+
+    def lookup(self, doc_id: str, doc_type: str) -> Optional[Path]:
+        """
+        保存済みの書類のブロブのパスを返す
+
+        Returns:
+            ブロブのパス（未保存・ブロブが欠けている場合は None）
+        """
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT sha256, size FROM refs WHERE docID = ? AND type = ?",
+                (doc_id, doc_type),
+            ).fetchone()
+        if not row:
+            return None
+        path = self.blob_path(row[0])
+        try:
+            if path.stat().st_size == row[1]:
+                return path
+        except OSError:
+            pass
+        return None
+
+    def add(self, doc_id: str, doc_type: str, path: str | Path) -> Path:
+        """
+        ファイルをブロブとして取り込み、書類管理番号・取得形式と対応付ける
+
+        同じ内容のブロブがすでにあれば新たに保存しない。取り込んだファイルは
+        ストア内の一時ファイルなら移動、それ以外ならコピーする。
+
+        Returns:
+            ブロブのパス
+        """
+        path = Path(path)
+        sha256 = _hash_file(path)
+        blob = self.blob_path(sha256)
+        if not blob.exists():
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = blob.with_name(f"{sha256}.{os.getpid()}.tmp")
+            if path.parent == self.root / "tmp":
+                os.replace(path, tmp_path)
+            else:
+                shutil.copyfile(path, tmp_path)
+            # ハードリンク先から書き換えられないよう読み取り専用にする
+            os.chmod(tmp_path, 0o444)
+            os.replace(tmp_path, blob)
+        elif path.parent == self.root / "tmp":
+            path.unlink()
+
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO refs (docID, type, sha256, size, storedAt) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    doc_id,
+                    doc_type,
+                    sha256,
+                    blob.stat().st_size,
+                    datetime.now(JST).isoformat(timespec="seconds"),
+                ),
+            )
+        return blob
+
+    def fetch(self, doc_id: str, doc_type: str) -> Path:
+        """
+        書類のブロブを返す（未保存なら API から取得して保存する）
+
+        Args:
+            doc_id: 書類管理番号
+            doc_type: 取得形式 (1:XBRL, 2:PDF, 3:代替PDF, 5:CSV)
+
+        Returns:
+            ブロブのパス
+        """
+        blob = self.lookup(doc_id, doc_type)
+        if blob is not None:
+            return blob
+        tmp_dir = self.root / "tmp"
+        tmp_dir.mkdir(exist_ok=True)
+        tmp_path = tmp_dir / f"{doc_id}_{doc_type}.{os.getpid()}"
+        client = self.client or get_default_client()
+        try:
+            client.download_document(doc_id, doc_type, str(tmp_path))
+            return self.add(doc_id, doc_type, tmp_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    def link(
+        self,
+        doc_id: str,
+        doc_type: str,
+        output_path: str | Path,
+        mode: str = "hardlink",
+    ) -> Path:
+        """
+        書類をストアから output_path に取り出す（未保存なら先に取得する）
+
+        Args:
+            doc_id: 書類管理番号
+            doc_type: 取得形式
+            output_path: 取り出し先のパス（既存のファイルは置き換える）
+            mode: "hardlink"（別ファイルシステムならコピー）/ "symlink" / "copy"
+
+        Returns:
+            取り出し先のパス
+        """
+        if mode not in LINK_MODES:
+            raise EdinetAPIError(f"取り出し方法が不正です: {mode}")
+        blob = self.fetch(doc_id, doc_type)
+        output = Path(output_path)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = output.with_name(f"{output.name}.{os.getpid()}.tmp")
+        tmp_path.unlink(missing_ok=True)
+        if mode == "hardlink":
+            try:
+                os.link(blob, tmp_path)
+            except OSError:
+                shutil.copyfile(blob, tmp_path)
+        elif mode == "symlink":
+            os.symlink(blob.resolve(), tmp_path)
+        else:
+            shutil.copyfile(blob, tmp_path)
+        os.replace(tmp_path, output)
+        return output
+
+    def stats(self) -> dict:
+        """{"refs": 対応付けの数, "blobs": ブロブ数, "bytes": ブロブの合計サイズ}"""
+        with self._lock:
+            refs, blobs, size = self.conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT sha256), "
+                "(SELECT COALESCE(SUM(size), 0) FROM "
+                "(SELECT DISTINCT sha256, size FROM refs)) FROM refs"
+            ).fetchone()
+        return {"refs": refs, "blobs": blobs, "bytes": size}
@@ -0,0 +1,414 @@
+"""
+抽出済み財務ファクトのローカル SQLite ウェアハウス
+
+有価証券報告書の CSV から extract_facts で取り出した数値ファクトを
+(書類, 要素, コンテキスト, 決算年, 連結/個別, 値) の形で1つの DB に蓄積し、
+「全社の ROE 5年分」のような会社横断のパネルを CSV を読み直さずに引く。
+
+要素ID・コンテキストIDは整数に置き換えて保存し、パネル検索は
+(要素, 連結/個別, 決算年) で始まるカバリングインデックスだけで完結させる。
+"""
+
+import re
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from corporate_reports.edinet import (
+    _NON_CONSOLIDATED_ELEMENTS,
+    _SUMMARY_ELEMENTS,
+    JST,
+    AsrFilingInfo,
+    EdinetAPIError,
+    EdinetFact,
+    _get_cache_dir,
+    _normalize_context,
+    extract_facts,
+    parse_asr_filename,
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS filings (
+    id INTEGER PRIMARY KEY,
+    filingName TEXT NOT NULL UNIQUE,
+    source TEXT NOT NULL,
+    docID TEXT,
+    edinetCode TEXT NOT NULL,
+    periodEnd TEXT NOT NULL,
+    submissionNo INTEGER NOT NULL,
+    submitDate TEXT NOT NULL,
+    ingestedAt TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_filings_source ON filings (source);
+CREATE INDEX IF NOT EXISTS idx_filings_edinet_code
+    ON filings (edinetCode, periodEnd);
+CREATE TABLE IF NOT EXISTS elements (
+    id INTEGER PRIMARY KEY,
+    elementID TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS contexts (
+    id INTEGER PRIMARY KEY,
+    contextID TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS facts (
+    filingID INTEGER NOT NULL,
+    elementID INTEGER NOT NULL,
+    contextID INTEGER NOT NULL,
+    fiscalYear INTEGER,
+    nonConsolidated INTEGER,
+    unitID TEXT,
+    value NUMERIC NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_facts_panel
+    ON facts (elementID, nonConsolidated, fiscalYear, filingID, value);
+CREATE INDEX IF NOT EXISTS idx_facts_filing ON facts (filingID);
+"""
+
+# 一括ダウンロードの保存ファイル名 (例: S100XXXX_5.zip) から書類管理番号を読む
+_DOC_ID_IN_FILENAME = re.compile(r"^(S[0-9A-Z]{7})_")
+
+
+def default_warehouse_path() -> Path:
+    """ウェアハウスDBの既定パス（キャッシュディレクトリ直下）"""
+    return _get_cache_dir() / "facts.sqlite3"
+
+
+def resolve_metric(metric: str) -> tuple[str, bool]:
+    """
+    指標名（経営指標等のキー）または要素IDを (要素ID, 個別か) に解決
+
+    Args:
+        metric: "ROE" などの経営指標等のキー、または "jpcrp_cor:..." の要素ID
+
+    Returns:
+        (要素ID, 個別の値を使うか)
+    """
+    for elem_id, key in _SUMMARY_ELEMENTS.items():
+        if key == metric:
+            return elem_id, False
+    for elem_id, key in _NON_CONSOLIDATED_ELEMENTS.items():
+        if key == metric:
+            return elem_id, True
+    if ":" in metric:
+        return metric, False
+    raise EdinetAPIError(f"指標名または要素IDが不正です: {metric}")
+
+
+def _doc_id_from_source(source: str) -> Optional[str]:
+    match = _DOC_ID_IN_FILENAME.match(Path(source.split("!", 1)[0]).name)
+    return match.group(1) if match else None
+
+
+def _extract_for_ingest(source: str) -> tuple[str, str, list[tuple]]:
+    """プロセスプールのワーカーでファクトを抽出する（受け渡しを軽くするため tuple で返す）"""
+    result = extract_facts(source)
+    return source, result["source"], [tuple(fact) for fact in result["facts"]]
+
+
+class FactWarehouse:
+    """
+    財務ファクトの SQLite ウェアハウス
+
+    Args:
+        path: DBファイルのパス（省略時は default_warehouse_path()）
+    """
+
+    def __init__(self, path: str | Path | None = None):
+        self.path = Path(path) if path else default_warehouse_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        # 書類ごとのコミットで毎回 fsync しない（一括取り込みの速度を優先）
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self._load_ids()
+
+    def _load_ids(self) -> None:
+        self._element_ids: dict[str, int] = dict(
+            self.conn.execute("SELECT elementID, id FROM elements")
+        )
+        self._context_ids: dict[str, int] = dict(
+            self.conn.execute("SELECT contextID, id FROM contexts")
+        )
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "FactWarehouse":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _intern(
+        self, table: str, column: str, cache: dict[str, int], value: str
+    ) -> int:
+        interned = cache.get(value)
+        if interned is None:
+            interned = self.conn.execute(
+                f"INSERT INTO {table} ({column}) VALUES (?)", (value,)
+            ).lastrowid
+            assert interned is not None
+            cache[value] = interned
+        return interned
+
+    def is_ingested(self, source: str | Path) -> bool:
+        row = self.conn.execute(
+            "SELECT 1 FROM filings WHERE source = ?", (str(source),)
+        ).fetchone()
+        return row is not None
+
+    def add_filing(
+        self,
+        label: str,
+        facts: Iterable[EdinetFact | tuple],
+        source: Optional[str] = None,
+        doc_id: Optional[str] = None,
+    ) -> int:
+        """
+        1書類分のファクトを登録する（同じ CSV の書類は置き換える）
+
+        Args:
+            label: extract_facts の source（CSV ファイル名で終わる出所）
+            facts: EdinetFact（または同じ並びの tuple）
+            source: 取り込み元のパス（省略時は label）
+            doc_id: 書類管理番号（省略時は取り込み元のファイル名から読む）
+
+        Returns:
+            登録したファクト数
+        """
+        info = parse_asr_filename(label)
+        if info is None:
+            raise EdinetAPIError(
+                f"CSV ファイル名から書類の属性を読み取れません: {label}"
+            )
+        source = source or label
+        filing_name = label.rsplit("!", 1)[-1].rsplit("/", 1)[-1]
+
+        try:
+            return self._add_filing(info, filing_name, source, doc_id, facts)
+        except BaseException:
+            # ロールバックされた要素ID・コンテキストIDを対応表から外す
+            self._load_ids()
+            raise
+
+    def _add_filing(
+        self,
+        info: AsrFilingInfo,
+        filing_name: str,
+        source: str,
+        doc_id: Optional[str],
+        facts: Iterable[EdinetFact | tuple],
+    ) -> int:
+        with self.conn:
+            old = self.conn.execute(
+                "SELECT id FROM filings WHERE filingName = ?", (filing_name,)
+            ).fetchone()
+            if old:
+                self.conn.execute("DELETE FROM facts WHERE filingID = ?", old)
+                self.conn.execute("DELETE FROM filings WHERE id = ?", old)
+            filing_id = self.conn.execute(
+                "INSERT INTO filings (filingName, source, docID, edinetCode, periodEnd, "
+                "submissionNo, submitDate, ingestedAt) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    filing_name,
+                    source,
+                    doc_id or _doc_id_from_source(source),
+                    info.edinet_code,
+                    info.period_end,
+                    info.submission_no,
+                    info.submit_date,
+                    datetime.now(JST).isoformat(timespec="seconds"),
+                ),
+            ).lastrowid
+
+            rows = []
+            for element_id, context_id, _, _, _, unit_id, value in facts:
+                context = _normalize_context(context_id)
+                rows.append(
+                    (
+                        filing_id,
+                        self._intern(
+                            "elements", "elementID", self._element_ids, element_id
+                        ),
+                        self._intern(
+                            "contexts", "contextID", self._context_ids, context_id
+                        ),
+                        info.fiscal_year(context[0]) if context else None,
+                        context[1] if context else None,
+                        unit_id,
+                        value,
+                    )
+                )
+            self.conn.executemany(
+                "INSERT INTO facts (filingID, elementID, contextID, fiscalYear, "
+                "nonConsolidated, unitID, value) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def ingest(self, source: str | Path, refresh: bool = False) -> Optional[int]:
+        """
+        CSVディレクトリまたは ZIP から1書類分のファクトを取り込む
+
+        Args:
+            source: extract_facts に渡す CSVディレクトリまたは ZIP のパス
+            refresh: 取り込み済みでも読み直す
+
+        Returns:
+            登録したファクト数（取り込み済みでスキップした場合は None）
+        """
+        if not refresh and self.is_ingested(source):
+            return None
+        _, label, facts = _extract_for_ingest(str(source))
+        return self.add_filing(label, facts, source=str(source))
+
+    def ingest_many(
+        self,
+        sources: Iterable[str | Path],
+        max_workers: Optional[int] = None,
+        refresh: bool = False,
+        progress: Optional[Callable[[dict], None]] = None,
+    ) -> dict:
+        """
+        複数の書類をプロセスプールで並行抽出して取り込む
+
+        CSV の解析はワーカープロセスで行い、DB への書き込みはこのプロセスで
+        順に行う。1件の失敗で全体を中断しない。
+
+        Args:
+            sources: CSVディレクトリまたは ZIP のパスのリスト
+            max_workers: ワーカープロセス数（省略時は CPU 数）
+            refresh: 取り込み済みでも読み直す
+            progress: 1件終わるごとに {"path", "status", ...} で呼ばれるコールバック
+
+        Returns:
+            {"ingested": 件数, "skipped": 件数, "error": 件数, "facts": ファクト数}
+        """
+        summary = {"ingested": 0, "skipped": 0, "error": 0, "facts": 0}
+
+        def report(result: dict) -> None:
+            summary[result["status"]] += 1
+            if progress:
+                progress(result)
+
+        pending = []
+        for source in dict.fromkeys(str(s) for s in sources):
+            if not refresh and self.is_ingested(source):
+                report({"path": source, "status": "skipped"})
+            else:
+                pending.append(source)
+        if not pending:
+            return summary
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(_extract_for_ingest, source): source
+                for source in pending
+            }
+            for future in as_completed(futures):
+                source = futures[future]
+                try:
+                    _, label, facts = future.result()
+                    count = self.add_filing(label, facts, source=source)
+                except Exception as e:
+                    report({"path": source, "status": "error", "message": str(e)})
+                    continue
+                summary["facts"] += count
+                report({"path": source, "status": "ingested", "facts": count})
+        return summary
+
+    def panel(
+        self,
+        metric: str,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+        edinet_codes: Optional[Iterable[str]] = None,
+        non_consolidated: Optional[bool] = None,
+    ) -> list[dict]:
+        """
+        会社 × 決算年のパネルを返す
+
+        同じ会社・決算年の値が複数の書類にある場合（前期の有報の当期と
+        当期の有報の1期前など）は、提出日・提出回数が最も新しい書類の値を使う。
+
+        Args:
+            metric: 経営指標等のキー ("ROE" など) または要素ID
+            year_from: 決算日が属する年の下限
+            year_to: 決算日が属する年の上限
+            edinet_codes: 対象の EDINETコード（省略時は全社）
+            non_consolidated: 個別の値を使うか（省略時は指標の既定）
+
+        Returns:
+            {"edinetCode", "fiscalYear", "value", "docID", "filingName", "submitDate"}
+            のリスト（EDINETコード・決算年順）
+        """
+        element_id, default_non_consolidated = resolve_metric(metric)
+        element = self._element_ids.get(element_id)
+        if element is None:
+            return []
+        if non_consolidated is None:
+            non_consolidated = default_non_consolidated
+
+        sql = (
+            "SELECT f.edinetCode, x.fiscalYear, x.value, f.docID, f.filingName, "
+            "f.submitDate FROM facts x JOIN filings f ON f.id = x.filingID "
+            "WHERE x.elementID = ? AND x.nonConsolidated = ?"
+        )
+        params: list = [element, int(non_consolidated)]
+        if year_from is not None:
+            sql += " AND x.fiscalYear >= ?"
+            params.append(year_from)
+        if year_to is not None:
+            sql += " AND x.fiscalYear <= ?"
+            params.append(year_to)
+        codes = list(edinet_codes or [])
+        if codes:
+            sql += f" AND f.edinetCode IN ({', '.join('?' * len(codes))})"
+            params.extend(codes)
+        sql += " ORDER BY f.submitDate, f.submissionNo"
+
+        # 新しい書類の値で上書きする
+        latest: dict[tuple[str, int], dict] = {}
+        for (
+            edinet_code,
+            year,
+            value,
+            doc_id,
+            filing_name,
+            submit_date,
+        ) in self.conn.execute(sql, params):
+            latest[(edinet_code, year)] = {
+                "edinetCode": edinet_code,
+                "fiscalYear": year,
+                "value": value,
+                "docID": doc_id,
+                "filingName": filing_name,
+                "submitDate": submit_date,
+            }
+        return [latest[key] for key in sorted(latest)]
+
+    def filings(self, edinet_code: Optional[str] = None) -> list[dict]:
+        """取り込み済みの書類の一覧（EDINETコード・決算日順）"""
+        sql = (
+            "SELECT filingName, source, docID, edinetCode, periodEnd, submissionNo, "
+            "submitDate, ingestedAt FROM filings"
+        )
+        params: tuple = ()
+        if edinet_code:
+            sql += " WHERE edinetCode = ?"
+            params = (edinet_code,)
+        sql += " ORDER BY edinetCode, periodEnd, submitDate, submissionNo"
+        cursor = self.conn.execute(sql, params)
+        columns = [d[0] for d in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor]
+
+    def stats(self) -> dict:
+        """{"filings": 書類数, "companies": 会社数, "facts": ファクト数}"""
+        filings, companies = self.conn.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT edinetCode) FROM filings"
+        ).fetchone()
+        (facts,) = self.conn.execute("SELECT COUNT(*) FROM facts").fetchone()
+        return {"filings": filings, "companies": companies, "facts": facts}
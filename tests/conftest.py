@@ -1,3 +1,24 @@
 """
 pytest 設定ファイル
 """
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_edinet_cache(tmp_path, monkeypatch):
+    """EDINET のディスクキャッシュをテストごとの一時ディレクトリに隔離"""
+    monkeypatch.setenv("EDINET_CACHE_DIR", str(tmp_path / "edinet_cache"))
+
+
+@pytest.fixture(autouse=True)
+def _fresh_edinet_client(monkeypatch):
+    """既定クライアントとレートリミッターをテストごとに作り直す"""
+    from corporate_reports import edinet
+
+    monkeypatch.delenv("EDINET_RATE_LIMIT_FILE", raising=False)
+    monkeypatch.delenv("EDINET_CASSETTE", raising=False)
+    monkeypatch.delenv("EDINET_BASE_URL", raising=False)
+    monkeypatch.delenv("EDINET_STORE_DIR", raising=False)
+    monkeypatch.setattr(edinet, "_shared_rate_limiter", None)
+    monkeypatch.setattr(edinet, "_default_client", None)
@@ -0,0 +1,64 @@
+"""
+CLI の起動とパッケージの公開名のテスト
+"""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+from tests.test_valuation import JECOS_INPUT
+
+# EDINET 用の依存（EDINET 以外のコマンドでは読み込まない）
+EDINET_MODULES = ("requests", "urllib3", "dotenv", "corporate_reports.edinet")
+
+
+def _run_cli(*argv: str) -> subprocess.CompletedProcess:
+    """別プロセスで CLI を実行し、読み込まれた EDINET 用モジュールを stderr に出す"""
+    script = (
+        "import sys\n"
+        "from corporate_reports.cli import main\n"
+        f"sys.argv = ['corporate-reports', *{list(argv)!r}]\n"
+        "main()\n"
+        f"loaded = [m for m in {EDINET_MODULES!r} if m in sys.modules]\n"
+        "print('LOADED', loaded, file=sys.stderr)\n"
+    )
+    return subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+
+
+class TestCLIStartup:
+    """EDINET 以外のコマンドが EDINET 用の依存を読み込まないことのテスト"""
+
+    def test_valuation(self, tmp_path):
+        json_file = tmp_path / "input.json"
+        json_file.write_text(json.dumps(JECOS_INPUT), encoding="utf-8")
+        proc = _run_cli("valuation", str(json_file))
+
+        assert json.loads(proc.stdout)["stock_price"] == 1668
+        assert "LOADED []" in proc.stderr
+
+    def test_build_report(self, tmp_path):
+        (tmp_path / "report.md").write_text(
+            "# ジェコス（9991）企業分析レポート\n\n本文\n", encoding="utf-8"
+        )
+        proc = _run_cli("build-report", str(tmp_path), "--no-charts")
+
+        assert json.loads(proc.stdout)["status"] == "success"
+        assert (tmp_path / "report.html").exists()
+        assert "LOADED []" in proc.stderr
+
+
+class TestPackageExports:
+    """corporate_reports パッケージの公開名のテスト"""
+
+    def test_exports_resolve_lazily(self):
+        import corporate_reports
+        from corporate_reports.edinet import EdinetClient
+
+        assert corporate_reports.EdinetClient is EdinetClient
+        assert "search_documents_range" in dir(corporate_reports)
+        with pytest.raises(AttributeError):
+            getattr(corporate_reports, "no_such_name")
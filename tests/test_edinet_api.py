@@ -3,16 +3,26 @@ EDINET API クライアントのユニットテスト
 """
 
 import os
+import threading
+import time
+from datetime import datetime
 from unittest.mock import Mock, patch, mock_open
 import pytest
+from requests.adapters import HTTPAdapter
 
 # テスト用に環境変数を設定
 os.environ["EDINET_API_KEY"] = "test_api_key_12345"
 
 from corporate_reports.edinet import (
+    DocumentListing,
     search_documents,
     download_document,
     EdinetAPIError,
+    CircuitBreaker,
+    EdinetClient,
+    FileRateLimiter,
+    RateLimiter,
+    RetryPolicy,
     check_api_key,
 )
 
@@ -20,7 +30,7 @@ from corporate_reports.edinet import (
 class TestSearchDocuments:
     """search_documents 関数のテスト"""
 
-    @patch("corporate_reports.edinet.requests.get")
+    @patch("corporate_reports.edinet.requests.Session.get")
     @patch("corporate_reports.edinet.time.sleep")
     def test_search_success(self, mock_sleep, mock_get):
         """正常系: 書類検索が成功"""
@@ -48,9 +58,10 @@ class TestSearchDocuments:
         assert len(results) == 1
         assert results[0]["docID"] == "S100XXXX"
         mock_get.assert_called_once()
-        mock_sleep.assert_called_once()
+        # 単発の呼び出しはレートリミット待機しない
+        mock_sleep.assert_not_called()
 
-    @patch("corporate_reports.edinet.requests.get")
+    @patch("corporate_reports.edinet.requests.Session.get")
     @patch("corporate_reports.edinet.time.sleep")
     def test_search_with_sec_code_filter(self, mock_sleep, mock_get):
         """証券コードでフィルタリング"""
@@ -73,7 +84,7 @@ class TestSearchDocuments:
         assert len(results) == 2
         assert all(r["secCode"][:4] == "5819" for r in results)
 
-    @patch("corporate_reports.edinet.requests.get")
+    @patch("corporate_reports.edinet.requests.Session.get")
     @patch("corporate_reports.edinet.time.sleep")
     def test_search_with_ordinance_and_form_code(self, mock_sleep, mock_get):
         """府令コード・様式コードでフィルタリング"""
@@ -105,7 +116,7 @@ class TestSearchDocuments:
         assert len(results) == 1
         assert results[0]["docID"] == "S100A"
 
-    @patch("corporate_reports.edinet.requests.get")
+    @patch("corporate_reports.edinet.requests.Session.get")
     def test_search_api_error(self, mock_get):
         """API エラー時の挙動"""
         mock_response = Mock()
@@ -118,7 +129,7 @@ class TestSearchDocuments:
         with pytest.raises(EdinetAPIError):
             search_documents(date="2025-03-27")
 
-    @patch("corporate_reports.edinet.requests.get")
+    @patch("corporate_reports.edinet.requests.Session.get")
     def test_search_network_error(self, mock_get):
         """ネットワークエラー時の挙動"""
         from requests.exceptions import RequestException
@@ -129,10 +140,195 @@ class TestSearchDocuments:
             search_documents(date="2025-03-27")
 
 
+class TestDocumentListCache:
+    """書類一覧のディスクキャッシュのテスト"""
+
+    @staticmethod
+    def _mock_response(results):
+        mock_response = Mock()
+        mock_response.json.return_value = {
+            "metadata": {"status": "200"},
+            "results": results,
+        }
+        mock_response.raise_for_status = Mock()
+        return mock_response
+
+    @patch("corporate_reports.edinet.requests.Session.get")
+    @patch("corporate_reports.edinet.time.sleep")
+    def test_past_date_cache_hit(self, mock_sleep, mock_get):
+        """過去日はキャッシュヒットでAPI呼び出しも待機も行わない"""
+        mock_get.return_value = self._mock_response(
+            [{"docID": "S100A", "secCode": "58190"}]
+        )
+
+        first = search_documents(date="2025-03-27")
+        second = search_documents(date="2025-03-27", sec_code="5819")
+
+        assert first == second
+        assert mock_get.call_count == 1
+        mock_sleep.assert_not_called()
+
+    @patch("corporate_reports.edinet.requests.Session.get")
+    @patch("corporate_reports.edinet.time.sleep")
+    def test_no_cache_refetches(self, mock_sleep, mock_get):
+        """use_cache=False ではキャッシュを読まない"""
+        mock_get.return_value = self._mock_response([{"docID": "S100A"}])
+
+        search_documents(date="2025-03-27")
+        search_documents(date="2025-03-27", use_cache=False)
+
+        assert mock_get.call_count == 2
+
+    @patch("corporate_reports.edinet.requests.Session.get")
+    @patch("corporate_reports.edinet.time.sleep")
+    def test_today_expires_after_ttl(self, mock_sleep, mock_get):
+        """当日の一覧は TTL 経過後に再取得する"""
+        from corporate_reports import edinet
+
+        today = datetime.now(edinet.JST).date().isoformat()
+        mock_get.return_value = self._mock_response([{"docID": "S100A"}])
+
+        search_documents(date=today)
+        search_documents(date=today)
+        assert mock_get.call_count == 1
+
+        with patch(
+            "corporate_reports.edinet.time.time",
+            return_value=time.time() + edinet.LISTING_CACHE_TTL + 1,
+        ):
+            search_documents(date=today)
+        assert mock_get.call_count == 2
+
+    @patch("corporate_reports.edinet.requests.Session.get")
+    @patch("corporate_reports.edinet.time.sleep")
+    def test_cached_while_today_refetched_next_day(self, mock_sleep, mock_get):
+        """当日中に取得した一覧は翌日に読むと再取得し、日が終わった後の一覧は確定扱い"""
+        from corporate_reports import edinet
+
+        noon = datetime(2025, 3, 27, 12, tzinfo=edinet.JST).timestamp()
+        mock_get.side_effect = [
+            self._mock_response([{"docID": "S100A"}]),
+            self._mock_response([{"docID": "S100A"}, {"docID": "S100B"}]),
+        ]
+
+        with patch("corporate_reports.edinet.time.time", return_value=noon):
+            assert len(search_documents(date="2025-03-27")) == 1
+        next_day = noon + 24 * 3600
+        with patch("corporate_reports.edinet.time.time", return_value=next_day):
+            assert len(search_documents(date="2025-03-27")) == 2
+        with patch(
+            "corporate_reports.edinet.time.time", return_value=next_day + 30 * 86400
+        ):
+            assert len(search_documents(date="2025-03-27")) == 2
+        assert mock_get.call_count == 2
+
+    @patch("corporate_reports.edinet.requests.Session.get")
+    @patch("corporate_reports.edinet.time.sleep")
+    def test_api_error_not_cached(self, mock_sleep, mock_get):
+        """APIエラー応答はキャッシュしない"""
+        error_response = Mock()
+        error_response.json.return_value = {"metadata": {"status": "400"}}
+        error_response.raise_for_status = Mock()
+        mock_get.side_effect = [error_response, self._mock_response([])]
+
+        with pytest.raises(EdinetAPIError):
+            search_documents(date="2025-03-27")
+        assert search_documents(date="2025-03-27") == []
+        assert mock_get.call_count == 2
+
+
+class TestDocumentListing:
+    """DocumentListing（転置インデックス）のテスト"""
+
+    RESULTS = [
+        {
+            "docID": "S100A",
+            "secCode": "58190",
+            "edinetCode": "E01350",
+            "ordinanceCode": "010",
+            "formCode": "030000",
+            "docTypeCode": "120",
+        },
+        {
+            "docID": "S100B",
+            "secCode": "99910",
+            "edinetCode": "E00000",
+            "ordinanceCode": "010",
+            "formCode": "043000",
+            "docTypeCode": "140",
+        },
+        {
+            "docID": "S100C",
+            "secCode": "58190",
+            "edinetCode": "E01350",
+            "ordinanceCode": "010",
+            "formCode": "030001",
+            "docTypeCode": "130",
+        },
+        {"docID": "S100D", "secCode": None, "formCode": "030000"},
+    ]
+
+    def _ids(self, results):
+        return [r["docID"] for r in results]
+
+    def test_single_criterion(self):
+        listing = DocumentListing(self.RESULTS)
+        assert self._ids(listing.query(sec_code="5819")) == ["S100A", "S100C"]
+        assert self._ids(listing.query(form_code="030000")) == ["S100A", "S100D"]
+        assert listing.query(edinet_code="E99999") == []
+
+    def test_intersection_keeps_listing_order(self):
+        listing = DocumentListing(self.RESULTS)
+        assert self._ids(
+            listing.query(sec_code="58190", ordinance_code="010", form_code="030000")
+        ) == ["S100A"]
+        assert self._ids(listing.query(edinet_code="E01350", doc_type_code="130")) == [
+            "S100C"
+        ]
+        assert listing.query(sec_code="5819", form_code="043000") == []
+
+    def test_sec_codes(self):
+        listing = DocumentListing(self.RESULTS)
+        assert self._ids(listing.query(sec_codes=["9991", "58190"])) == [
+            "S100A",
+            "S100B",
+            "S100C",
+        ]
+        assert self._ids(
+            listing.query(sec_codes=["9991", "5819"], form_code="043000")
+        ) == ["S100B"]
+
+    def test_no_criteria_returns_copy(self):
+        listing = DocumentListing(self.RESULTS)
+        results = listing.query()
+        assert results == self.RESULTS
+        assert results is not listing.results
+
+    @patch("corporate_reports.edinet.requests.Session.get")
+    def test_client_memoizes_listing(self, mock_get):
+        """同じ日の検索ではキャッシュを読み直さずインデックスを再利用する"""
+        mock_get.return_value = TestDocumentListCache._mock_response(self.RESULTS)
+        client = EdinetClient()
+
+        with patch(
+            "corporate_reports.edinet._read_listing_cache_entry"
+        ) as mock_read_cache:
+            mock_read_cache.return_value = None
+            first = client.document_listing("2025-03-27")
+            assert client.search_documents("2025-03-27", sec_code="5819")
+            assert client.document_listing("2025-03-27") is first
+            refreshed = client.document_listing("2025-03-27", use_cache=False)
+
+        assert mock_read_cache.call_count == 1
+        assert mock_get.call_count == 2
+        assert refreshed is not first
+        assert client.document_listing("2025-03-27") is refreshed
+
+
 class TestDownloadDocument:
     """download_document 関数のテスト"""
 
-    @patch("corporate_reports.edinet.requests.get")
+    @patch("corporate_reports.edinet.requests.Session.get")
     @patch("corporate_reports.edinet.time.sleep")
     @patch("builtins.open", new_callable=mock_open)
     @patch("pathlib.Path.mkdir")
@@ -152,10 +348,10 @@ class TestDownloadDocument:
         # 検証
         assert output_path == "test/output.zip"
         mock_get.assert_called_once()
-        mock_sleep.assert_called_once()
+        mock_sleep.assert_not_called()
         mock_file.assert_called_once()
 
-    @patch("corporate_reports.edinet.requests.get")
+    @patch("corporate_reports.edinet.requests.Session.get")
     def test_download_network_error(self, mock_get):
         """ネットワークエラー時の挙動"""
         from requests.exceptions import RequestException
@@ -168,6 +364,333 @@ class TestDownloadDocument:
             )
 
 
+class TestEdinetClient:
+    """EdinetClient のテスト"""
+
+    def test_pool_size_configured(self):
+        """接続プールのサイズが設定される"""
+        with EdinetClient(pool_size=4) as client:
+            adapter = client.session.get_adapter("https://api.edinet-fsa.go.jp")
+            assert isinstance(adapter, HTTPAdapter)
+            assert adapter._pool_maxsize == 4
+
+    @patch("corporate_reports.edinet.time.sleep")
+    def test_session_reused(self, mock_sleep):
+        """書類一覧とダウンロードで同じセッションを使う"""
+        client = EdinetClient(api_key="client_key", timeout=5, download_timeout=7)
+        list_response = Mock()
+        list_response.json.return_value = {"metadata": {"status": "200"}, "results": []}
+        download_response = Mock()
+        download_response.iter_content = Mock(return_value=[b"data"])
+
+        with patch.object(
+            client.session, "get", side_effect=[list_response, download_response]
+        ) as mock_get:
+            client.search_documents(date="2025-03-27", use_cache=False)
+            with patch("builtins.open", mock_open()), patch("pathlib.Path.mkdir"):
+                client.download_document("S100XXXX", "2", "test/output.pdf")
+
+        assert mock_get.call_count == 2
+        first, second = mock_get.call_args_list
+        assert first.kwargs["params"]["Subscription-Key"] == "client_key"
+        assert first.kwargs["timeout"] == 5
+        assert second.kwargs["timeout"] == 7
+        assert second.kwargs["stream"] is True
+
+    def test_module_functions_use_default_client(self):
+        """モジュール関数は既定クライアント経由で呼ばれる"""
+        from corporate_reports import edinet
+
+        client = Mock()
+        client.search_documents.return_value = [{"docID": "S100A"}]
+        edinet.set_default_client(client)
+        try:
+            assert search_documents(date="2025-03-27") == [{"docID": "S100A"}]
+        finally:
+            edinet.set_default_client(None)
+        client.search_documents.assert_called_once()
+
+
+class TestRateLimiter:
+    """RateLimiter（トークンバケット）のテスト"""
+
+    @patch("corporate_reports.edinet.time.sleep")
+    @patch("corporate_reports.edinet.time.monotonic", return_value=100.0)
+    def test_first_call_does_not_wait(self, mock_monotonic, mock_sleep):
+        limiter = RateLimiter(rate=2, burst=1)
+        assert limiter.acquire() == 0
+        mock_sleep.assert_not_called()
+
+    @patch("corporate_reports.edinet.time.sleep")
+    @patch("corporate_reports.edinet.time.monotonic", return_value=100.0)
+    def test_back_to_back_calls_wait(self, mock_monotonic, mock_sleep):
+        """連続呼び出しは予算を超える分だけ待つ"""
+        limiter = RateLimiter(rate=2, burst=1)
+        limiter.acquire()
+        assert limiter.acquire() == pytest.approx(0.5)
+        # 待ち時間は予約されるので、3回目はさらに後ろに並ぶ
+        assert limiter.acquire() == pytest.approx(1.0)
+        assert mock_sleep.call_count == 2
+
+    @patch("corporate_reports.edinet.time.sleep")
+    @patch("corporate_reports.edinet.time.monotonic")
+    def test_tokens_refill_over_time(self, mock_monotonic, mock_sleep):
+        """間隔が空いていれば待たない"""
+        mock_monotonic.return_value = 100.0
+        limiter = RateLimiter(rate=2, burst=2)
+        limiter.acquire()
+        limiter.acquire()
+        mock_monotonic.return_value = 101.0
+        assert limiter.acquire() == 0
+        assert limiter.acquire() == 0
+        mock_sleep.assert_not_called()
+
+    def test_shared_between_threads(self):
+        """スレッド間で共有しても予約された待ち時間が重複しない"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        with patch("corporate_reports.edinet.time.monotonic", return_value=100.0):
+            limiter = RateLimiter(rate=1000, burst=1)
+            with patch("corporate_reports.edinet.time.sleep"):
+                with ThreadPoolExecutor(max_workers=4) as pool:
+                    waits = list(pool.map(lambda _: limiter.acquire(), range(8)))
+
+        assert sorted(waits) == pytest.approx([i / 1000 for i in range(8)])
+
+    @patch("corporate_reports.edinet.requests.Session.get")
+    def test_client_uses_given_limiter(self, mock_get):
+        """クライアントはリクエスト前に指定のリミッターを通す"""
+        limiter = Mock()
+        mock_get.return_value.json.return_value = {
+            "metadata": {"status": "200"},
+            "results": [],
+        }
+        client = EdinetClient(rate_limiter=limiter)
+        client.fetch_document_list("2025-03-27")
+        client.fetch_document_list("2025-03-27")
+
+        # 2回目はキャッシュヒットなので待機もしない
+        limiter.acquire.assert_called_once()
+
+
+class TestFileRateLimiter:
+    """FileRateLimiter（プロセス間共有）のテスト"""
+
+    @patch("corporate_reports.edinet.time.sleep")
+    @patch("corporate_reports.edinet.time.time", return_value=1000.0)
+    def test_shared_through_lock_file(self, mock_time, mock_sleep, tmp_path):
+        """同じロックファイルを使うリミッター同士で枠を予約し合う"""
+        lock_file = tmp_path / "edinet.lock"
+        # 別プロセスを想定して別インスタンスを使う
+        first = FileRateLimiter(lock_file, rate=2)
+        second = FileRateLimiter(lock_file, rate=2)
+
+        assert first.acquire() == 0
+        assert second.acquire() == pytest.approx(0.5)
+        assert first.acquire() == pytest.approx(1.0)
+        assert mock_sleep.call_count == 2
+
+    @patch("corporate_reports.edinet.time.sleep")
+    def test_idle_slot_does_not_wait(self, mock_sleep, tmp_path):
+        """前回の予約から間隔が空いていれば待たない"""
+        lock_file = tmp_path / "edinet.lock"
+        lock_file.write_text("0.0")
+        assert FileRateLimiter(lock_file).acquire() == 0
+        mock_sleep.assert_not_called()
+
+    def test_enabled_by_env(self, tmp_path, monkeypatch):
+        """EDINET_RATE_LIMIT_FILE で既定のリミッターが切り替わる"""
+        from corporate_reports import edinet
+
+        monkeypatch.setenv("EDINET_RATE_LIMIT_FILE", str(tmp_path / "edinet.lock"))
+        limiter = edinet.get_shared_rate_limiter()
+        assert isinstance(limiter, FileRateLimiter)
+        assert EdinetClient().rate_limiter is limiter
+
+
+def _status_response(status_code, headers=None):
+    response = Mock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.json.return_value = {"metadata": {"status": "200"}, "results": []}
+    return response
+
+
+class TestRetryPolicy:
+    """RetryPolicy のテスト"""
+
+    def test_exponential_backoff_without_jitter(self):
+        policy = RetryPolicy(backoff_factor=0.5, max_backoff=3, jitter=False)
+        assert [policy.delay(i) for i in range(4)] == [0.5, 1.0, 2.0, 3]
+
+    def test_jitter_within_bound(self):
+        policy = RetryPolicy(backoff_factor=1)
+        assert all(0 <= policy.delay(2) <= 4 for _ in range(20))
+
+    def test_retry_after_seconds(self):
+        assert RetryPolicy().delay(0, "7") == 7
+
+    def test_retry_after_http_date(self):
+        with patch("corporate_reports.edinet.time.time", return_value=0):
+            assert RetryPolicy().delay(0, "Thu, 01 Jan 1970 00:00:05 GMT") == 5
+
+    def test_retry_after_capped(self):
+        assert RetryPolicy(max_retry_after=10).delay(0, "3600") == 10
+
+
+class TestClientRetry:
+    """EdinetClient の再試行のテスト"""
+
+    @staticmethod
+    def _client(**kwargs):
+        return EdinetClient(
+            rate_limiter=RateLimiter(rate=1_000_000, burst=1_000),
+            retry=RetryPolicy(jitter=False, **kwargs),
+        )
+
+    @patch("corporate_reports.edinet.time.sleep")
+    def test_retries_5xx_then_succeeds(self, mock_sleep):
+        client = self._client()
+        with patch.object(
+            client.session,
+            "get",
+            side_effect=[
+                _status_response(503),
+                _status_response(502),
+                _status_response(200),
+            ],
+        ) as mock_get:
+            assert client.fetch_document_list("2025-03-27") == []
+
+        assert mock_get.call_count == 3
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [0.5, 1.0]
+
+    @patch("corporate_reports.edinet.time.sleep")
+    def test_honours_retry_after(self, mock_sleep):
+        client = self._client()
+        with patch.object(
+            client.session,
+            "get",
+            side_effect=[
+                _status_response(429, {"Retry-After": "2"}),
+                _status_response(200),
+            ],
+        ):
+            client.fetch_document_list("2025-03-27")
+
+        mock_sleep.assert_called_once_with(2.0)
+
+    @patch("corporate_reports.edinet.time.sleep")
+    def test_retries_connection_error(self, mock_sleep):
+        from requests.exceptions import ConnectionError
+
+        client = self._client()
+        with patch.object(
+            client.session,
+            "get",
+            side_effect=[ConnectionError("reset"), _status_response(200)],
+        ):
+            assert client.fetch_document_list("2025-03-27") == []
+
+    @patch("corporate_reports.edinet.time.sleep")
+    def test_gives_up_after_max_retries(self, mock_sleep):
+        client = self._client(max_retries=2)
+        with patch.object(
+            client.session, "get", return_value=_status_response(503)
+        ) as mock_get:
+            with pytest.raises(EdinetAPIError, match="503"):
+                client.fetch_document_list("2025-03-27")
+
+        assert mock_get.call_count == 3
+
+    @patch("corporate_reports.edinet.time.sleep")
+    def test_client_error_not_retried(self, mock_sleep):
+        from requests.exceptions import HTTPError
+
+        client = self._client()
+        response = _status_response(404)
+        response.raise_for_status.side_effect = HTTPError("404 Not Found")
+        with patch.object(client.session, "get", return_value=response) as mock_get:
+            with pytest.raises(EdinetAPIError, match="404"):
+                client.fetch_document_list("2025-03-27")
+
+        mock_get.assert_called_once()
+        mock_sleep.assert_not_called()
+
+
+class TestCircuitBreaker:
+    """CircuitBreaker のテスト"""
+
+    @patch("corporate_reports.edinet.time.monotonic", return_value=100.0)
+    def test_opens_after_threshold(self, mock_monotonic):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, fail_fast=True)
+        breaker.record_failure()
+        breaker.before_request()
+        breaker.record_failure()
+        assert breaker.is_open
+        with pytest.raises(EdinetAPIError, match="一時停止"):
+            breaker.before_request()
+
+    @patch("corporate_reports.edinet.time.monotonic")
+    def test_half_open_after_timeout(self, mock_monotonic):
+        mock_monotonic.return_value = 100.0
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+        breaker.record_failure()
+        breaker.record_failure()
+
+        mock_monotonic.return_value = 131.0
+        breaker.before_request()  # 1件だけ試行を許可
+        breaker.record_failure()
+        assert breaker.is_open  # 試行が失敗したら再び開く
+
+        mock_monotonic.return_value = 162.0
+        breaker.before_request()
+        breaker.record_success()
+        assert not breaker.is_open
+
+    @patch("corporate_reports.edinet.time.sleep")
+    def test_client_fails_fast_when_open(self, mock_sleep):
+        client = EdinetClient(
+            rate_limiter=RateLimiter(rate=1_000_000, burst=1_000),
+            retry=RetryPolicy(max_retries=5, jitter=False),
+            circuit_breaker=CircuitBreaker(failure_threshold=2, fail_fast=True),
+        )
+        with patch.object(
+            client.session, "get", return_value=_status_response(503)
+        ) as mock_get:
+            with pytest.raises(EdinetAPIError, match="一時停止"):
+                client.fetch_document_list("2025-03-27")
+            with pytest.raises(EdinetAPIError, match="一時停止"):
+                client.fetch_document_list("2025-03-28")
+
+        assert mock_get.call_count == 2
+
+    def test_waits_until_half_open(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        breaker.record_failure()
+        started = time.monotonic()
+        breaker.before_request()
+        assert time.monotonic() - started >= 0.04
+
+    def test_max_wait_exceeded(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, max_wait=0.01)
+        breaker.record_failure()
+        with pytest.raises(EdinetAPIError, match="一時停止"):
+            breaker.before_request()
+
+    def test_only_one_probe_while_half_open(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        breaker.record_failure()
+        breaker.before_request()  # この呼び出しが試行になる
+        waiter = threading.Thread(target=breaker.before_request)
+        waiter.start()
+        waiter.join(0.02)
+        assert waiter.is_alive()  # 試行の結果が出るまで待つ
+        breaker.record_success()
+        waiter.join(1)
+        assert not waiter.is_alive()
+
+
 class TestCheckApiKey:
     """check_api_key 関数のテスト"""
 
@@ -187,7 +710,7 @@ class TestCheckApiKey:
 class TestMainCLI:
     """main() 関数（CLI）のテスト"""
 
-    @patch("corporate_reports.cli.search_documents")
+    @patch("corporate_reports.edinet.search_documents")
     @patch(
         "sys.argv",
         ["corporate-reports", "edinet", "search", "--date", "2025-03-27"],
@@ -205,9 +728,10 @@ class TestMainCLI:
             sec_code=None,
             ordinance_code=None,
             form_code=None,
+            use_cache=True,
         )
 
-    @patch("corporate_reports.cli.download_document")
+    @patch("corporate_reports.edinet.download_document")
     @patch(
         "sys.argv",
         [
@@ -233,7 +757,7 @@ class TestMainCLI:
             doc_id="S100XXXX", doc_type="2", output_path="test.zip"
         )
 
-    @patch("corporate_reports.cli.search_documents")
+    @patch("corporate_reports.edinet.search_documents")
     @patch(
         "sys.argv",
         ["corporate-reports", "edinet", "search", "--date", "2025-03-27"],
@@ -249,6 +773,32 @@ class TestMainCLI:
 
         assert exc_info.value.code == 1
 
+    @patch("corporate_reports.edinet.search_documents")
+    def test_cli_shared_rate_limit(self, mock_search, tmp_path):
+        """--shared-rate-limit で既定クライアントが共有リミッターを使う"""
+        from corporate_reports import edinet
+        from corporate_reports.cli import main
+
+        mock_search.return_value = []
+        lock_file = str(tmp_path / "edinet.lock")
+        with patch(
+            "sys.argv",
+            [
+                "corporate-reports",
+                "edinet",
+                "--shared-rate-limit",
+                lock_file,
+                "search",
+                "--date",
+                "2025-03-27",
+            ],
+        ):
+            main()
+
+        limiter = edinet.get_default_client().rate_limiter
+        assert isinstance(limiter, FileRateLimiter)
+        assert str(limiter.path) == lock_file
+
     @patch("sys.argv", ["corporate-reports"])
     def test_cli_no_command(self):
         """コマンド未指定時"""
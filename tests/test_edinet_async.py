@@ -0,0 +1,141 @@
+"""
+EDINET 非同期クライアントのユニットテスト
+"""
+
+import asyncio
+import os
+import threading
+import time
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+os.environ["EDINET_API_KEY"] = "test_api_key_12345"
+
+from corporate_reports.edinet import EdinetAPIError, EdinetClient, RateLimiter
+from corporate_reports.edinet_async import AsyncEdinetClient, AsyncRateLimiter
+
+
+def _unlimited() -> AsyncRateLimiter:
+    """テストで待機が発生しないレートリミッター"""
+    return AsyncRateLimiter(RateLimiter(rate=1_000_000, burst=1_000))
+
+
+def _listing_response(results):
+    response = Mock()
+    response.json.return_value = {"metadata": {"status": "200"}, "results": results}
+    return response
+
+
+class TestAsyncRateLimiter:
+    """AsyncRateLimiter のテスト"""
+
+    @patch("corporate_reports.edinet.time.monotonic", return_value=100.0)
+    def test_waits_on_event_loop(self, mock_monotonic):
+        limiter = AsyncRateLimiter(RateLimiter(rate=2, burst=1))
+
+        async def run():
+            with patch(
+                "corporate_reports.edinet_async.asyncio.sleep", new=AsyncMock()
+            ) as mock_sleep:
+                waits = [await limiter.acquire() for _ in range(3)]
+                return waits, mock_sleep.await_count
+
+        waits, sleeps = asyncio.run(run())
+        assert waits == pytest.approx([0, 0.5, 1.0])
+        assert sleeps == 2
+
+    def test_shares_sync_limiter(self):
+        """同期クライアントと同じ RateLimiter を共有できる"""
+        client = EdinetClient()
+        async_client = AsyncEdinetClient(client=client)
+        assert async_client.rate_limiter.limiter is client.rate_limiter
+
+
+class TestAsyncEdinetClient:
+    """AsyncEdinetClient のテスト"""
+
+    def test_search_documents(self):
+        client = EdinetClient()
+        with patch.object(
+            client.session,
+            "get",
+            return_value=_listing_response(
+                [
+                    {"docID": "S100A", "secCode": "58190"},
+                    {"docID": "S100B", "secCode": "12340"},
+                ]
+            ),
+        ) as mock_get:
+
+            async def run():
+                async_client = AsyncEdinetClient(client, rate_limiter=_unlimited())
+                first = await async_client.search_documents("2025-03-27", "5819")
+                # 2回目はディスクキャッシュから返る
+                second = await async_client.search_documents("2025-03-27", "5819")
+                return first, second
+
+            first, second = asyncio.run(run())
+
+        assert [r["docID"] for r in first] == ["S100A"]
+        assert first == second
+        mock_get.assert_called_once()
+
+    def test_download_many_bounded_concurrency(self, tmp_path):
+        """同時実行数が max_concurrency を超えない"""
+        client = EdinetClient()
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def fake_get(url, **kwargs):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.02)
+            with lock:
+                state["active"] -= 1
+            response = Mock()
+            response.iter_content = Mock(return_value=[url.encode(), b"-body"])
+            return response
+
+        items = [(f"S100{i}", "2", str(tmp_path / f"S100{i}.pdf")) for i in range(10)]
+        with patch.object(client.session, "get", side_effect=fake_get):
+
+            async def run():
+                async with AsyncEdinetClient(
+                    client, max_concurrency=3, rate_limiter=_unlimited()
+                ) as async_client:
+                    return await async_client.download_many(items)
+
+            results = asyncio.run(run())
+
+        assert results == [path for _, _, path in items]
+        assert 1 < state["peak"] <= 3
+        assert (tmp_path / "S1000.pdf").read_bytes().endswith(b"S1000-body")
+
+    def test_download_many_reports_failures(self, tmp_path):
+        """1件の失敗で全体を中断しない"""
+        from requests.exceptions import RequestException
+
+        client = EdinetClient()
+
+        def fake_get(url, **kwargs):
+            if url.endswith("S100B"):
+                raise RequestException("Network error")
+            response = Mock()
+            response.iter_content = Mock(return_value=[b"data"])
+            return response
+
+        items = [
+            ("S100A", "2", str(tmp_path / "a.pdf")),
+            ("S100B", "2", str(tmp_path / "b.pdf")),
+        ]
+        with patch.object(client.session, "get", side_effect=fake_get):
+            results = asyncio.run(
+                AsyncEdinetClient(client, rate_limiter=_unlimited()).download_many(
+                    items
+                )
+            )
+
+        assert results[0] == str(tmp_path / "a.pdf")
+        assert isinstance(results[1], EdinetAPIError)
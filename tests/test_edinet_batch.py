@@ -0,0 +1,329 @@
+"""
+EDINET 一括ダウンロードのユニットテスト
+"""
+
+import json
+import os
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+os.environ["EDINET_API_KEY"] = "test_api_key_12345"
+
+from corporate_reports.edinet import (
+    CircuitBreaker,
+    EdinetClient,
+    RateLimiter,
+    RetryPolicy,
+)
+from corporate_reports.edinet_async import AsyncEdinetClient
+from corporate_reports.edinet_batch import (
+    MANIFEST_NAME,
+    DownloadManifest,
+    document_filename,
+    download_batch,
+    extract_batch,
+    file_sha256,
+)
+from tests.test_edinet_extract import _sample_zip_bytes
+
+
+def _response(body: bytes, status_code: int = 200):
+    response = Mock()
+    response.status_code = status_code
+    response.headers = {}
+    response.iter_content = Mock(return_value=[body])
+    return response
+
+
+@pytest.fixture
+def client():
+    sync_client = EdinetClient(rate_limiter=RateLimiter(rate=1_000_000, burst=1_000))
+    return AsyncEdinetClient(sync_client, max_concurrency=2)
+
+
+class TestDocumentFilename:
+    def test_extensions(self):
+        assert document_filename("S100A", "5") == "S100A_5.zip"
+        assert document_filename("S100A", "2") == "S100A_2.pdf"
+
+
+class TestDownloadManifest:
+    """DownloadManifest のテスト"""
+
+    def test_record_and_complete(self, tmp_path):
+        path = tmp_path / "S100A_2.pdf"
+        path.write_bytes(b"pdf")
+        manifest = DownloadManifest(tmp_path / MANIFEST_NAME)
+        entry = manifest.record("S100A", "2", path)
+
+        assert entry["file"] == "S100A_2.pdf"
+        assert entry["size"] == 3
+        reloaded = DownloadManifest(tmp_path / MANIFEST_NAME)
+        assert reloaded.is_complete("S100A", "2", verify=True)
+        assert not reloaded.is_complete("S100A", "5")
+
+    def test_size_mismatch_is_incomplete(self, tmp_path):
+        path = tmp_path / "S100A_2.pdf"
+        path.write_bytes(b"pdf")
+        manifest = DownloadManifest(tmp_path / MANIFEST_NAME)
+        manifest.record("S100A", "2", path)
+        path.write_bytes(b"truncated-or-replaced")
+        assert not manifest.is_complete("S100A", "2")
+
+    def test_hash_mismatch_only_with_verify(self, tmp_path):
+        path = tmp_path / "S100A_2.pdf"
+        path.write_bytes(b"pdf")
+        manifest = DownloadManifest(tmp_path / MANIFEST_NAME)
+        manifest.record("S100A", "2", path)
+        path.write_bytes(b"PDF")
+        assert manifest.is_complete("S100A", "2")
+        assert not manifest.is_complete("S100A", "2", verify=True)
+
+
+class TestResumeDownload:
+    """EdinetClient._save_document(resume=True) のテスト"""
+
+    def test_resume_appends_on_206(self, tmp_path):
+        output = tmp_path / "S100A_2.pdf"
+        (tmp_path / "S100A_2.pdf.part").write_bytes(b"head-")
+        client = EdinetClient()
+        with patch.object(
+            client.session, "get", return_value=_response(b"tail", 206)
+        ) as mock_get:
+            client._save_document("S100A", "2", str(output), resume=True)
+
+        assert mock_get.call_args.kwargs["headers"] == {"Range": "bytes=5-"}
+        assert output.read_bytes() == b"head-tail"
+        assert not (tmp_path / "S100A_2.pdf.part").exists()
+
+    def test_resume_restarts_when_range_ignored(self, tmp_path):
+        output = tmp_path / "S100A_2.pdf"
+        (tmp_path / "S100A_2.pdf.part").write_bytes(b"stale")
+        client = EdinetClient()
+        with patch.object(
+            client.session, "get", return_value=_response(b"full-body", 200)
+        ):
+            client._save_document("S100A", "2", str(output), resume=True)
+
+        assert output.read_bytes() == b"full-body"
+
+
+class TestDownloadBatch:
+    """download_batch のテスト"""
+
+    def test_downloads_and_skips_existing(self, tmp_path, client):
+        def fake_get(url, **kwargs):
+            return _response(url.rsplit("/", 1)[-1].encode())
+
+        with patch.object(client.client.session, "get", side_effect=fake_get) as g:
+            first = download_batch(
+                ["S100A", "S100B", "S100A"], "2", tmp_path, client=client
+            )
+            second = download_batch(
+                ["S100A", "S100B", "S100C"], "2", tmp_path, client=client
+            )
+
+        assert [r["status"] for r in first] == ["downloaded", "downloaded"]
+        assert [r["status"] for r in second] == ["skipped", "skipped", "downloaded"]
+        assert g.call_count == 3
+        assert (tmp_path / "S100B_2.pdf").read_bytes() == b"S100B"
+        manifest = json.loads((tmp_path / MANIFEST_NAME).read_text(encoding="utf-8"))
+        assert manifest["S100C:2"]["sha256"] == file_sha256(tmp_path / "S100C_2.pdf")
+
+    def test_failure_does_not_abort(self, tmp_path, client):
+        from requests.exceptions import RequestException
+
+        def fake_get(url, **kwargs):
+            if url.endswith("S100B"):
+                raise RequestException("Service Unavailable")
+            return _response(b"ok")
+
+        with patch.object(client.client.session, "get", side_effect=fake_get):
+            results = download_batch(
+                ["S100A", "S100B", "S100C"], "5", tmp_path, client=client
+            )
+
+        assert [r["status"] for r in results] == ["downloaded", "error", "downloaded"]
+        assert "Service Unavailable" in results[1]["message"]
+        assert not DownloadManifest(tmp_path / MANIFEST_NAME).get("S100B", "5")
+
+    def test_recovers_from_brief_outage(self, tmp_path):
+        sync_client = EdinetClient(
+            rate_limiter=RateLimiter(rate=1_000_000, burst=1_000),
+            retry=RetryPolicy(max_retries=3, backoff_factor=0.01, jitter=False),
+            circuit_breaker=CircuitBreaker(failure_threshold=3, reset_timeout=0.05),
+        )
+        outage_ends = time.monotonic() + 0.2
+
+        def fake_get(url, **kwargs):
+            if time.monotonic() < outage_ends:
+                return _response(b"", 503)
+            return _response(b"pdf")
+
+        doc_ids = [f"S100{i:03d}" for i in range(40)]
+        with patch.object(sync_client.session, "get", side_effect=fake_get):
+            results = download_batch(
+                doc_ids,
+                "2",
+                tmp_path,
+                client=AsyncEdinetClient(sync_client, max_concurrency=8),
+            )
+
+        # 障害中は half-open まで待つので、1件も失敗せずに回復する
+        assert [r["status"] for r in results] == ["downloaded"] * len(doc_ids)
+        assert not sync_client.circuit_breaker.is_open
+
+
+class TestDownloadBatchCLI:
+    """edinet download-batch CLI コマンドのテスト"""
+
+    def test_cli_doc_ids(self, tmp_path, capsys):
+        from corporate_reports.cli import main
+
+        ids_file = tmp_path / "ids.txt"
+        ids_file.write_text("S100B\n\nS100C\n", encoding="utf-8")
+        results = [
+            {"docID": d, "type": "5", "file": "", "status": "downloaded"}
+            for d in ("S100A", "S100B", "S100C")
+        ]
+        with (
+            patch(
+                "corporate_reports.edinet_batch.download_batch", return_value=results
+            ) as mock_batch,
+            patch(
+                "sys.argv",
+                [
+                    "corporate-reports",
+                    "edinet",
+                    "download-batch",
+                    "--doc-ids",
+                    "S100A",
+                    "--doc-ids-file",
+                    str(ids_file),
+                    "--type",
+                    "5",
+                    "--output-dir",
+                    str(tmp_path / "out"),
+                ],
+            ),
+        ):
+            main()
+
+        assert mock_batch.call_args.args[0] == ["S100A", "S100B", "S100C"]
+        summary = json.loads(capsys.readouterr().out)
+        assert summary["status"] == "success"
+        assert summary["downloaded"] == 3
+
+    def test_cli_failure_exit_code(self, tmp_path):
+        from corporate_reports.cli import main
+
+        results = [{"docID": "S100A", "type": "5", "file": "", "status": "error"}]
+        with (
+            patch(
+                "corporate_reports.edinet_batch.download_batch", return_value=results
+            ),
+            patch(
+                "sys.argv",
+                [
+                    "corporate-reports",
+                    "edinet",
+                    "download-batch",
+                    "--doc-ids",
+                    "S100A",
+                    "--type",
+                    "5",
+                    "--output-dir",
+                    str(tmp_path),
+                ],
+            ),
+        ):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+
+        assert exc_info.value.code == 1
+
+
+@pytest.fixture
+def sample_zips(tmp_path):
+    paths = []
+    for name in ("A", "B"):
+        path = tmp_path / f"S100{name}_5.zip"
+        path.write_bytes(_sample_zip_bytes(tmp_path))
+        paths.append(path)
+    return paths
+
+
+class TestExtractBatch:
+    """extract_batch のテスト"""
+
+    def test_extracts_and_reports_failures(self, tmp_path, sample_zips):
+        missing = tmp_path / "missing"
+        missing.mkdir()
+        results = list(
+            extract_batch([*sample_zips, missing, sample_zips[0]], max_workers=2)
+        )
+
+        by_path = {r["path"]: r for r in results}
+        assert len(results) == 3
+        for path in sample_zips:
+            assert by_path[str(path)]["status"] == "success"
+            assert by_path[str(path)]["経営指標等"]["当期"]["売上高"] == 12383109000
+        assert by_path[str(missing)]["status"] == "error"
+        assert "見つかりません" in by_path[str(missing)]["message"]
+
+    def test_empty(self):
+        assert list(extract_batch([])) == []
+
+
+class TestExtractBatchCLI:
+    """edinet extract-batch CLI コマンドのテスト"""
+
+    def test_cli_ndjson(self, tmp_path, sample_zips, capsys):
+        from corporate_reports.cli import main
+
+        with patch(
+            "sys.argv",
+            [
+                "corporate-reports",
+                "edinet",
+                "extract-batch",
+                "--glob",
+                str(tmp_path / "*_5.zip"),
+                "--workers",
+                "2",
+            ],
+        ):
+            main()
+
+        captured = capsys.readouterr()
+        lines = [json.loads(line) for line in captured.out.splitlines()]
+        assert sorted(r["path"] for r in lines) == [str(p) for p in sample_zips]
+        assert all(r["status"] == "success" for r in lines)
+        assert json.loads(captured.err) == {
+            "status": "success",
+            "success": 2,
+            "error": 0,
+        }
+
+    def test_cli_failure_exit_code(self, tmp_path, sample_zips, capsys):
+        from corporate_reports.cli import main
+
+        with patch(
+            "sys.argv",
+            [
+                "corporate-reports",
+                "edinet",
+                "extract-batch",
+                "--csv-dirs",
+                str(sample_zips[0]),
+                str(tmp_path / "missing"),
+            ],
+        ):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+
+        assert exc_info.value.code == 1
+        lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert sorted(r["status"] for r in lines) == ["error", "success"]
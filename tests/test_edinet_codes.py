@@ -0,0 +1,190 @@
+"""
+EDINET コードリストによる提出者解決のユニットテスト
+"""
+
+import json
+import os
+import zipfile
+from unittest.mock import patch
+
+import pytest
+
+os.environ["EDINET_API_KEY"] = "test_api_key_12345"
+
+from corporate_reports.edinet import DocumentListing, EdinetAPIError
+from corporate_reports.edinet_codes import (
+    EdinetCodeList,
+    Filer,
+    annual_report_window,
+    find_annual_reports,
+)
+
+CODE_LIST_CSV = (
+    "ダウンロード実行日,2025年03月27日現在,件数,3件\r\n"
+    '"ＥＤＩＮＥＴコード","提出者種別","上場区分","連結の有無","資本金","決算日",'
+    '"提出者名","提出者名（英字）","提出者名（ヨミ）","所在地","提出者業種",'
+    '"証券コード","提出者法人番号"\r\n'
+    '"E01350","内国法人・組合","上場","有","1000","12月31日","カナレ電気株式会社",'
+    '"Canare Electric Co.,Ltd.","カナレデンキ","神奈川県","電気機器","58190",'
+    '"4020001012345"\r\n'
+    '"E02144","内国法人・組合","上場","有","635401","3月31日","トヨタ自動車株式会社",'
+    '"TOYOTA MOTOR CORPORATION","トヨタジドウシャ","愛知県","輸送用機器","72030",'
+    '"1180301018771"\r\n'
+    '"E99999","外国法人・組合","非上場","無","","","ファンド",'
+    '"","","","その他","",""\r\n'
+)
+
+
+@pytest.fixture
+def code_list_path(tmp_path):
+    path = tmp_path / "EdinetcodeDlInfo.csv"
+    path.write_bytes(CODE_LIST_CSV.encode("cp932"))
+    return path
+
+
+class TestEdinetCodeList:
+    """EdinetCodeList のテスト"""
+
+    def test_parse_and_resolve(self, code_list_path):
+        codes = EdinetCodeList.load(code_list_path)
+
+        assert len(codes) == 3
+        filer = codes.resolve("5819")
+        assert filer is not None
+        assert filer.edinet_code == "E01350"
+        assert filer.jcn == "4020001012345"
+        assert filer.fiscal_year_end == "12-31"
+        assert filer.industry == "電気機器"
+        assert filer.name_en == "Canare Electric Co.,Ltd."
+        filer = codes.resolve("72030")
+        assert filer is not None
+        assert filer.name == "トヨタ自動車株式会社"
+        filer = codes.resolve("e02144")
+        assert filer is not None
+        assert filer.sec_code == "72030"
+        assert codes.resolve("9999") is None
+        filer = codes.resolve("E99999")
+        assert filer is not None
+        assert filer.fiscal_year_end == ""
+
+    def test_zip(self, tmp_path, code_list_path):
+        zip_path = tmp_path / "Edinetcode.zip"
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            zf.write(code_list_path, "EdinetcodeDlInfo.csv")
+        filer = EdinetCodeList.load(zip_path).resolve("5819")
+        assert filer is not None
+        assert filer.edinet_code == "E01350"
+
+    def test_parsed_cache_reused_until_source_changes(self, code_list_path):
+        EdinetCodeList.load(code_list_path)
+        with patch("corporate_reports.edinet_codes._read_code_list_file") as mock_read:
+            codes = EdinetCodeList.load(code_list_path)
+            mock_read.assert_not_called()
+        filer = codes.resolve("7203")
+        assert filer is not None
+        assert filer.edinet_code == "E02144"
+
+        code_list_path.write_bytes(
+            CODE_LIST_CSV.replace("12月31日", "6月30日").encode("cp932")
+        )
+        filer = EdinetCodeList.load(code_list_path).resolve("5819")
+        assert filer is not None
+        assert filer.fiscal_year_end == "06-30"
+
+    def test_default_path_from_env(self, code_list_path, monkeypatch):
+        monkeypatch.setenv("EDINET_CODE_LIST", str(code_list_path))
+        assert len(EdinetCodeList.load()) == 3
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(EdinetAPIError, match="見つかりません"):
+            EdinetCodeList.load(tmp_path / "missing.csv")
+
+
+class TestAnnualReportWindow:
+    @pytest.mark.parametrize(
+        "fiscal_year_end, year, expected",
+        [
+            ("12-31", 2024, ("2025-03-01", "2025-03-31")),
+            ("03-31", 2025, ("2025-06-01", "2025-06-30")),
+            ("02-29", 2025, ("2025-04-29", "2025-05-31")),
+            ("09-30", 2024, ("2024-12-01", "2024-12-31")),
+        ],
+    )
+    def test_window(self, fiscal_year_end, year, expected):
+        filer = Filer("E00001", fiscal_year_end=fiscal_year_end)
+        assert annual_report_window(filer, year) == expected
+
+    def test_unknown_fiscal_year_end(self):
+        with pytest.raises(EdinetAPIError):
+            annual_report_window(Filer("E00001"), 2024)
+
+
+class TestFindAnnualReports:
+    def test_scans_only_window(self):
+        report = {
+            "docID": "S100A",
+            "edinetCode": "E01350",
+            "ordinanceCode": "010",
+            "formCode": "030000",
+        }
+        other = {**report, "docID": "S100B", "formCode": "043000"}
+
+        def fake_listing(date):
+            return DocumentListing([report, other] if date == "2025-03-26" else [])
+
+        with patch(
+            "corporate_reports.edinet_codes.document_listing", side_effect=fake_listing
+        ) as mock_listing:
+            results = find_annual_reports(
+                Filer("E01350", fiscal_year_end="12-31"), 2024
+            )
+
+        assert results == [report]
+        dates = [c.args[0] for c in mock_listing.call_args_list]
+        assert dates[0] == "2025-03-01"
+        assert dates[-1] == "2025-03-31"
+        assert len(dates) == 31
+
+
+class TestCodesCLI:
+    def test_lookup(self, code_list_path, capsys):
+        from corporate_reports.cli import main
+
+        with patch(
+            "sys.argv",
+            [
+                "corporate-reports",
+                "edinet",
+                "codes",
+                "--code-list",
+                str(code_list_path),
+                "lookup",
+                "5819",
+                "--year",
+                "2024",
+            ],
+        ):
+            main()
+
+        output = json.loads(capsys.readouterr().out)
+        assert output[0]["edinet_code"] == "E01350"
+        assert output[0]["annualReportWindow"] == ["2025-03-01", "2025-03-31"]
+
+    def test_lookup_unknown_code(self, code_list_path):
+        from corporate_reports.cli import main
+
+        with patch(
+            "sys.argv",
+            [
+                "corporate-reports",
+                "edinet",
+                "codes",
+                "--code-list",
+                str(code_list_path),
+                "lookup",
+                "0000",
+            ],
+        ):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+        assert exc_info.value.code == 1
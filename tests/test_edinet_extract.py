@@ -3,8 +3,10 @@ EDINET CSV 抽出機能のユニットテスト
 """
 
 import csv
+import io
 import json
 import os
+import zipfile
 from pathlib import Path
 from unittest.mock import patch
 
@@ -14,9 +16,22 @@ os.environ["EDINET_API_KEY"] = "test_api_key_12345"
 
 from corporate_reports.edinet import (
     EdinetAPIError,
+    TextBlockRef,
+    extract_document,
+    extract_facts,
     extract_financial_data,
-    _parse_edinet_csv,
+    extract_financial_data_from_zip,
+    iter_edinet_csv,
+    iter_edinet_binary,
+    iter_edinet_rows,
+    iter_edinet_text,
+    load_element_map,
+    EdinetFact,
+    EdinetRow,
+    _iter_binary_rows,
+    _normalize_context,
     _parse_value,
+    _summarize_rows,
 )
 
 
@@ -300,6 +315,17 @@ def _write_sample_csv(
     return csv_path
 
 
+def _sample_zip_bytes(tmp_path: Path) -> bytes:
+    """CSV形式（type=5）と同じ構成の ZIP をメモリ上に作る"""
+    csv_path = _write_sample_csv(tmp_path)
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        zf.writestr("XBRL_TO_CSV/jpcrp030000-asr-001_E01350-000_header.txt", "")
+        zf.write(csv_path, f"XBRL_TO_CSV/{csv_path.name}")
+    csv_path.unlink()
+    return buf.getvalue()
+
+
 class TestParseValue:
     """_parse_value のテスト"""
 
@@ -319,15 +345,243 @@ class TestParseValue:
         assert _parse_value("") is None
 
 
-class TestParseEdinetCSV:
-    """_parse_edinet_csv のテスト"""
+class TestIterEdinetCSV:
+    """iter_edinet_csv / iter_edinet_rows のテスト"""
 
     def test_parse_rows(self, tmp_path):
         csv_path = _write_sample_csv(tmp_path)
-        rows = _parse_edinet_csv(csv_path)
+        rows = list(iter_edinet_csv(csv_path))
         assert len(rows) == len(SAMPLE_ROWS)
-        assert rows[0]["要素ID"] == "jpcrp_cor:NetSalesSummaryOfBusinessResults"
-        assert rows[0]["値"] == "9697800000"
+        assert rows[0].element_id == "jpcrp_cor:NetSalesSummaryOfBusinessResults"
+        assert rows[0].context_id == "Prior4YearDuration"
+        assert rows[0].unit == "円"
+        assert rows[0].value == "9697800000"
+
+    def test_is_lazy(self, tmp_path):
+        csv_path = _write_sample_csv(tmp_path)
+        rows = iter_edinet_csv(csv_path)
+        assert next(rows).value == "9697800000"
+        rows.close()
+
+    def test_filter_by_element(self, tmp_path):
+        csv_path = _write_sample_csv(tmp_path)
+        elements = {"jpcrp_cor:NumberOfEmployees"}
+        rows = list(iter_edinet_csv(csv_path, elements))
+        assert rows
+        assert {r.element_id for r in rows} == elements
+
+    def test_reordered_and_missing_columns(self):
+        text = io.StringIO('"値"\t"要素ID"\n"42"\t"jpcrp_cor:X"\n"short"\n')
+        assert list(iter_edinet_rows(text)) == [
+            ("jpcrp_cor:X", "", "", "", "", "", "", "", "42")
+        ]
+
+    def test_missing_element_column(self):
+        with pytest.raises(EdinetAPIError):
+            list(iter_edinet_rows(io.StringIO('"項目名"\t"値"\n')))
+
+
+class TestIterEdinetText:
+    """iter_edinet_text（一括デコードして分割する読み方）のテスト"""
+
+    def test_same_as_streaming(self, tmp_path):
+        csv_path = _write_sample_csv(tmp_path)
+        elements = {"jpcrp_cor:NumberOfEmployees"}
+        assert list(iter_edinet_csv(csv_path, bulk=True)) == list(
+            iter_edinet_csv(csv_path)
+        )
+        assert list(iter_edinet_csv(csv_path, elements, bulk=True)) == list(
+            iter_edinet_csv(csv_path, elements)
+        )
+
+    def test_falls_back_on_quoted_tab_newline(self):
+        rows = [
+            SAMPLE_HEADER,
+            ["jpcrp_cor:A", "", "CurrentYearDuration", "", "", "", "", "", "1"],
+            [
+                "jpcrp_cor:NoteTextBlock",
+                "",
+                "",
+                "",
+                "",
+                "",
+                "",
+                "",
+                '<p class="x">\t\r\n</p>',
+            ],
+            ["jpcrp_cor:B", "", "CurrentYearDuration", "", "", "", "", "", "2"],
+        ]
+        buf = io.StringIO(newline="")
+        csv.writer(buf, delimiter="\t", quoting=csv.QUOTE_ALL).writerows(rows)
+        text = buf.getvalue()
+
+        expected = list(iter_edinet_rows(io.StringIO(text, newline="")))
+        assert list(iter_edinet_text(text)) == expected
+        assert expected[1].value == '<p class="x">\t\r\n</p>'
+        # 対象外の要素なら読み飛ばしたまま分割で読める
+        assert [r.value for r in iter_edinet_text(text, {"jpcrp_cor:B"})] == ["2"]
+
+    def test_reordered_and_missing_columns(self):
+        text = '"値"\t"要素ID"\r\n"42"\t"jpcrp_cor:X"\r\n"short"\r\n'
+        assert list(iter_edinet_text(text)) == [
+            ("jpcrp_cor:X", "", "", "", "", "", "", "", "42")
+        ]
+        assert list(iter_edinet_text("")) == []
+
+
+# テキストブロック（セル内にクォート・タブ・改行、サロゲートペアの文字を含む）
+TEXT_BLOCK = '<p class="note">𠮷野家\t注記\r\n</p>'
+
+
+def _write_text_block_csv(dirpath: Path) -> Path:
+    """SAMPLE_ROWS の途中にテキストブロックの行を挟んだ CSV を書き出す"""
+    csv_path = dirpath / "jpcrp030000-asr-001_E01350-000_2024-12-31_01_2025-03-21.csv"
+    rows = [
+        *SAMPLE_ROWS[:2],
+        [
+            "jpcrp_cor:NotesTextBlock",
+            "注記",
+            "FilingDateInstant",
+            "",
+            "",
+            "",
+            "",
+            "",
+            TEXT_BLOCK,
+        ],
+        *SAMPLE_ROWS[2:],
+    ]
+    with open(csv_path, "w", encoding="utf-16le", newline="") as f:
+        writer = csv.writer(f, delimiter="\t", quoting=csv.QUOTE_ALL)
+        writer.writerow(SAMPLE_HEADER)
+        writer.writerows(rows)
+    return csv_path
+
+
+class TestIterEdinetBinary:
+    """iter_edinet_binary（長い値を TextBlockRef にする読み方）のテスト"""
+
+    def test_text_block_becomes_ref(self, tmp_path):
+        csv_path = _write_text_block_csv(tmp_path)
+        expected = list(iter_edinet_csv(csv_path))
+        rows = list(iter_edinet_csv(csv_path, text_pattern="*TextBlock"))
+
+        ref = rows[2].value
+        assert isinstance(ref, TextBlockRef)
+        assert ref.path == str(csv_path)
+        assert ref.read() == expected[2].value == TEXT_BLOCK
+        assert rows[2]._replace(value=ref.read()) == expected[2]
+        assert rows[:2] + rows[3:] == expected[:2] + expected[3:]
+
+    def test_max_value_chars(self, tmp_path):
+        csv_path = _write_text_block_csv(tmp_path)
+        rows = list(iter_edinet_csv(csv_path, max_value_chars=20))
+        refs = [r for r in rows if isinstance(r.value, TextBlockRef)]
+        assert {r.element_id for r in refs} == {"jpcrp_cor:NotesTextBlock"}
+
+    def test_ref_in_zip_member(self, tmp_path):
+        csv_path = _write_text_block_csv(tmp_path)
+        zip_path = tmp_path / "S100TEST_5.zip"
+        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.write(csv_path, f"XBRL_TO_CSV/{csv_path.name}")
+        with zipfile.ZipFile(zip_path) as zf:
+            member = zf.namelist()[0]
+            with zf.open(member) as raw:
+                rows = list(iter_edinet_binary(raw, path=str(zip_path), member=member))
+        ref = rows[2].value
+        assert isinstance(ref, TextBlockRef)
+        assert ref.read() == TEXT_BLOCK
+
+    def test_ref_without_path(self):
+        with pytest.raises(EdinetAPIError):
+            TextBlockRef("", "", 0, 2).read()
+
+    def test_bulk_and_refs(self, tmp_path):
+        csv_path = _write_text_block_csv(tmp_path)
+        with pytest.raises(EdinetAPIError):
+            list(iter_edinet_csv(csv_path, bulk=True, text_pattern="*TextBlock"))
+
+    def test_rows_across_chunks(self, tmp_path):
+        # U+0A00 U+3000 は奇数位置に b"\n\x00" を含むが改行ではない
+        text = '"a"\t"\u0a00\u3000"\r\n"b"\t"x\r\ny"\r\n"c"\t"z"'
+        data = text.encode("utf-16-le")
+        rows = list(_iter_binary_rows(io.BytesIO(data), chunk_size=7))
+        assert [row for _, _, row in rows] == [
+            '"a"\t"\u0a00\u3000"\r',
+            '"b"\t"x\r\ny"\r',
+            '"c"\t"z"',
+        ]
+        assert [(offset, size) for offset, size, _ in rows] == [
+            (0, 18),
+            (20, 22),
+            (44, 14),
+        ]
+
+    def test_extract_facts_skips_text_blocks(self, tmp_path):
+        _write_text_block_csv(tmp_path)
+        with patch("corporate_reports.edinet._parse_value", wraps=_parse_value) as mock:
+            result = extract_facts(tmp_path)
+        assert TEXT_BLOCK not in [c.args[0] for c in mock.call_args_list]
+        (tmp_path / "plain").mkdir()
+        _write_sample_csv(tmp_path / "plain")
+        assert result["facts"] == extract_facts(tmp_path / "plain")["facts"]
+
+
+def _row(element_id: str, context_id: str, value: str) -> EdinetRow:
+    return EdinetRow(element_id, "", context_id, "", "", "", "", "", value)
+
+
+class TestSummarizeRows:
+    """_summarize_rows（要素・コンテキストの振り分け表）のテスト"""
+
+    def test_normalize_context(self):
+        assert _normalize_context("Prior2YearDuration") == ("2期前", False)
+        assert _normalize_context("CurrentYearInstant_NonConsolidatedMember") == (
+            "当期",
+            True,
+        )
+        assert _normalize_context("FilingDateInstant") is None
+        assert _normalize_context("Prior5YearDuration") is None
+        # セグメントなどの軸がつくコンテキストは対象外
+        assert (
+            _normalize_context(
+                "CurrentYearDuration_jpcrp030000-asr_E01350-000ReportableSegmentMember"
+            )
+            is None
+        )
+
+    def test_dispatch(self):
+        rows = [
+            _row(
+                "jpcrp_cor:NetSalesSummaryOfBusinessResults",
+                "CurrentYearDuration",
+                "100",
+            ),
+            # 連結の指標は個別のコンテキストでは上書きしない
+            _row(
+                "jpcrp_cor:NetSalesSummaryOfBusinessResults",
+                "CurrentYearDuration_NonConsolidatedMember",
+                "90",
+            ),
+            # 個別の指標は NonConsolidatedMember からだけ取る
+            _row(
+                "jpcrp_cor:DividendPaidPerShareSummaryOfBusinessResults",
+                "Prior1YearDuration",
+                "1",
+            ),
+            _row(
+                "jpcrp_cor:DividendPaidPerShareSummaryOfBusinessResults",
+                "Prior1YearDuration_NonConsolidatedMember",
+                "50.5",
+            ),
+            _row("jpcrp_cor:NumberOfEmployees", "FilingDateInstant", "7"),
+            _row("jppfs_cor:NetSales", "CurrentYearDuration", "100"),
+        ]
+        summary = _summarize_rows(rows)
+
+        assert summary["当期"] == {"売上高": 100}
+        assert summary["1期前"] == {"1株配当": 50.5}
+        assert summary["4期前"] == {}
 
 
 class TestExtractFinancialData:
@@ -398,10 +652,222 @@ class TestExtractFinancialData:
         assert "jpcrp030000-asr" in result["source"]
 
 
+class TestExtractFromZip:
+    """ZIP からの直接抽出のテスト"""
+
+    def test_extract_from_zip_path(self, tmp_path):
+        zip_path = tmp_path / "S100XXXX_5.zip"
+        zip_path.write_bytes(_sample_zip_bytes(tmp_path))
+
+        result = extract_financial_data_from_zip(zip_path, use_cache=False)
+
+        assert result["経営指標等"]["当期"]["売上高"] == 12383109000
+        assert result["経営指標等"]["当期"]["1株配当"] == 55.00
+        assert result["source"].startswith(f"{zip_path}!XBRL_TO_CSV/")
+        # 展開したファイルを残さない
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["S100XXXX_5.zip"]
+
+    def test_extract_from_bytes(self, tmp_path):
+        result = extract_financial_data_from_zip(_sample_zip_bytes(tmp_path))
+        assert result["経営指標等"]["4期前"]["売上高"] == 9697800000
+        assert result["source"].startswith("XBRL_TO_CSV/jpcrp030000-asr-")
+
+    def test_extract_financial_data_accepts_zip(self, tmp_path):
+        zip_path = tmp_path / "report_csv.zip"
+        zip_path.write_bytes(_sample_zip_bytes(tmp_path))
+        result = extract_financial_data(zip_path)
+        assert result["経営指標等"]["当期"]["ROE"] == 0.0594
+
+    def test_member_not_found(self):
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, "w") as zf:
+            zf.writestr("XBRL_TO_CSV/jpaud-aar-cn-001.csv", "")
+        with pytest.raises(EdinetAPIError, match="jpcrp030000-asr"):
+            extract_financial_data_from_zip(buf.getvalue())
+
+    def test_bad_zip(self):
+        with pytest.raises(EdinetAPIError):
+            extract_financial_data_from_zip(b"not a zip")
+
+    def test_extract_document(self, tmp_path):
+        """書類管理番号からメモリ上で取得して抽出"""
+        data = _sample_zip_bytes(tmp_path)
+        with patch(
+            "corporate_reports.edinet.EdinetClient.fetch_document", return_value=data
+        ) as mock_fetch:
+            result = extract_document("S100XXXX")
+
+        mock_fetch.assert_called_once_with("S100XXXX", "5")
+        assert result["source"].startswith("S100XXXX!XBRL_TO_CSV/")
+        assert result["経営指標等"]["当期"]["売上高"] == 12383109000
+
+
+class TestExtractionCache:
+    """抽出結果キャッシュのテスト"""
+
+    def test_repeat_extraction_skips_parse(self, tmp_path):
+        csv_dir = tmp_path / "csv"
+        csv_dir.mkdir()
+        _write_sample_csv(csv_dir)
+        first = extract_financial_data(csv_dir)
+
+        with patch("corporate_reports.edinet.iter_edinet_binary") as mock_rows:
+            with patch("corporate_reports.edinet.hashlib.sha256") as mock_hash:
+                second = extract_financial_data(csv_dir)
+        mock_rows.assert_not_called()
+        # サイズ・更新時刻が同じならハッシュも計算しない
+        mock_hash.assert_not_called()
+        assert second == first
+
+    def test_same_content_at_another_path(self, tmp_path):
+        zip_bytes = _sample_zip_bytes(tmp_path)
+        a = tmp_path / "a.zip"
+        b = tmp_path / "b.zip"
+        a.write_bytes(zip_bytes)
+        b.write_bytes(zip_bytes)
+        extract_financial_data(a)
+
+        with patch("corporate_reports.edinet.iter_edinet_binary") as mock_rows:
+            result = extract_financial_data(b)
+            from_bytes = extract_financial_data_from_zip(zip_bytes)
+        mock_rows.assert_not_called()
+        assert result["source"].startswith(f"{b}!XBRL_TO_CSV/jpcrp030000-asr-")
+        assert from_bytes["source"].startswith("XBRL_TO_CSV/jpcrp030000-asr-")
+        assert result["経営指標等"]["当期"]["売上高"] == 12383109000
+
+    def test_changed_file_is_reparsed(self, tmp_path):
+        csv_path = _write_sample_csv(tmp_path)
+        extract_financial_data(tmp_path)
+
+        text = csv_path.read_text(encoding="utf-16le")
+        csv_path.write_text(text.replace("12383109000", "1"), encoding="utf-16le")
+        assert extract_financial_data(tmp_path)["経営指標等"]["当期"]["売上高"] == 1
+
+    def test_extractor_version_invalidates(self, tmp_path):
+        _write_sample_csv(tmp_path)
+        extract_financial_data(tmp_path)
+
+        with patch("corporate_reports.edinet._EXTRACTOR_VERSION", "changed"):
+            with patch(
+                "corporate_reports.edinet.iter_edinet_binary", wraps=iter_edinet_binary
+            ) as mock_rows:
+                extract_financial_data(tmp_path)
+                extract_financial_data(tmp_path, use_cache=False)
+        assert mock_rows.call_count == 2
+
+
+class TestExtractFacts:
+    """extract_facts のテスト"""
+
+    ELEMENT_MAP = {
+        "jpcrp_cor:NumberOfEmployees": "社員数",
+        "jpcrp_cor:PayoutRatioSummaryOfBusinessResults": {
+            "key": "配当性向（個別）",
+            "non_consolidated": True,
+        },
+        "jpcrp_cor:DilutedEarningsPerShareSummaryOfBusinessResults": "希薄化EPS",
+    }
+
+    def test_numeric_facts(self, tmp_path):
+        _write_sample_csv(tmp_path)
+        result = extract_facts(tmp_path)
+
+        facts = result["facts"]
+        # 値なし（－）の行は数値ファクトに含めない
+        assert len(facts) == len(SAMPLE_ROWS) - 1
+        assert facts[0] == EdinetFact(
+            "jpcrp_cor:NetSalesSummaryOfBusinessResults",
+            "Prior4YearDuration",
+            "四期前",
+            "その他",
+            "期間",
+            "JPY",
+            9697800000,
+        )
+        # 経営指標等は従来の抽出結果と一致する
+        assert result["経営指標等"] == extract_financial_data(tmp_path)["経営指標等"]
+        assert "指標" not in result
+
+    def test_dash_values_match_extract_financial_data(self, tmp_path):
+        """数値ファクトにならない "－" の経営指標も None として残す"""
+        csv_path = (
+            tmp_path / "jpcrp030000-asr-001_E01350-000_2024-12-31_01_2025-03-21.csv"
+        )
+        per = "jpcrp_cor:PriceEarningsRatioSummaryOfBusinessResults"
+        with open(csv_path, "w", encoding="utf-16le", newline="") as f:
+            writer = csv.writer(f, delimiter="\t", quoting=csv.QUOTE_ALL)
+            writer.writerow(SAMPLE_HEADER)
+            # サンプルの PER（当期）を値なしにする
+            writer.writerows(
+                [*row[:-1], "－"] if row[0] == per else row for row in SAMPLE_ROWS
+            )
+
+        result = extract_facts(tmp_path)
+        expected = extract_financial_data(tmp_path, use_cache=False)["経営指標等"]
+        assert result["経営指標等"] == expected
+        assert result["経営指標等"]["当期"]["PER"] is None
+        assert per not in {fact.element_id for fact in result["facts"]}
+
+    def test_element_map(self, tmp_path):
+        result = extract_facts(_sample_zip_bytes(tmp_path), self.ELEMENT_MAP)
+
+        # "－" の値は None として残る（経営指標等と同じ扱い）
+        assert result["指標"]["当期"] == {
+            "社員数": 295,
+            "配当性向（個別）": 0.3603,
+            "希薄化EPS": None,
+        }
+        assert result["指標"]["1期前"] == {}
+        assert result["source"].startswith("XBRL_TO_CSV/jpcrp030000-asr-")
+
+    def test_segment_rows_do_not_overwrite(self, tmp_path):
+        """セグメントの行が連結の値を上書きしない"""
+        csv_path = (
+            tmp_path / "jpcrp030000-asr-001_E01350-000_2024-12-31_01_2025-03-21.csv"
+        )
+        sales = "jpcrp_cor:NetSalesSummaryOfBusinessResults"
+        segment = next(
+            [
+                *row[:2],
+                "CurrentYearDuration_E01350-000ReportableSegmentMember",
+                *row[3:-1],
+                "1",
+            ]
+            for row in SAMPLE_ROWS
+            if row[0] == sales and row[2] == "CurrentYearDuration"
+        )
+        with open(csv_path, "w", encoding="utf-16le", newline="") as f:
+            writer = csv.writer(f, delimiter="\t", quoting=csv.QUOTE_ALL)
+            writer.writerow(SAMPLE_HEADER)
+            writer.writerows([*SAMPLE_ROWS, segment])
+
+        result = extract_facts(tmp_path, {sales: "売上高"})
+        expected = extract_financial_data(tmp_path, use_cache=False)["経営指標等"]
+        assert result["経営指標等"]["当期"]["売上高"] != 1
+        assert result["経営指標等"] == expected
+        assert result["指標"]["当期"] == {"売上高": expected["当期"]["売上高"]}
+
+    def test_invalid_element_map(self, tmp_path):
+        _write_sample_csv(tmp_path)
+        with pytest.raises(EdinetAPIError, match="不正"):
+            extract_facts(
+                tmp_path, {"jpcrp_cor:NumberOfEmployees": {"non_consolidated": True}}
+            )
+
+    def test_load_element_map(self, tmp_path):
+        path = tmp_path / "map.json"
+        path.write_text(json.dumps(self.ELEMENT_MAP), encoding="utf-8")
+        assert load_element_map(path) == self.ELEMENT_MAP
+
+        path.write_text("[]", encoding="utf-8")
+        with pytest.raises(EdinetAPIError):
+            load_element_map(path)
+
+
 class TestExtractCLI:
     """edinet extract CLI コマンドのテスト"""
 
-    @patch("corporate_reports.cli.extract_financial_data")
+    @patch("corporate_reports.edinet.extract_financial_data")
     @patch(
         "sys.argv",
         [
@@ -422,13 +888,49 @@ class TestExtractCLI:
         }
 
         main()
-        mock_extract.assert_called_once_with(csv_dir="/tmp/test_csv")
+        mock_extract.assert_called_once_with(csv_dir="/tmp/test_csv", use_cache=True)
 
         captured = capsys.readouterr()
         data = json.loads(captured.out)
         assert data["経営指標等"]["当期"]["売上高"] == 12383109000
 
-    @patch("corporate_reports.cli.extract_financial_data")
+    @patch("corporate_reports.edinet.extract_document")
+    @patch(
+        "sys.argv",
+        ["corporate-reports", "edinet", "extract", "--doc-id", "S100XXXX"],
+    )
+    def test_cli_extract_doc_id(self, mock_extract, capsys):
+        """extract --doc-id で書類管理番号から直接抽出"""
+        from corporate_reports.cli import main
+
+        mock_extract.return_value = {"source": "S100XXXX!x.csv", "経営指標等": {}}
+
+        main()
+        mock_extract.assert_called_once_with("S100XXXX", use_cache=True)
+        assert json.loads(capsys.readouterr().out)["source"] == "S100XXXX!x.csv"
+
+    @patch("corporate_reports.edinet.extract_financial_data")
+    @patch(
+        "sys.argv",
+        [
+            "corporate-reports",
+            "edinet",
+            "extract",
+            "--csv-dir",
+            "/tmp/test_csv",
+            "--no-cache",
+        ],
+    )
+    def test_cli_extract_no_cache(self, mock_extract, capsys):
+        """extract --no-cache でキャッシュを使わない"""
+        from corporate_reports.cli import main
+
+        mock_extract.return_value = {"source": "/tmp/test.csv", "経営指標等": {}}
+
+        main()
+        mock_extract.assert_called_once_with(csv_dir="/tmp/test_csv", use_cache=False)
+
+    @patch("corporate_reports.edinet.extract_financial_data")
     def test_cli_extract_to_file(self, mock_extract, tmp_path):
         """extract コマンドで --output にファイル保存"""
         from corporate_reports.cli import main
@@ -457,3 +959,33 @@ class TestExtractCLI:
         assert output_file.exists()
         data = json.loads(output_file.read_text(encoding="utf-8"))
         assert data["経営指標等"]["当期"]["売上高"] == 100
+
+    def test_cli_extract_facts_with_element_map(self, tmp_path, capsys):
+        """extract --element-map でファクトと利用者定義の指標を出力"""
+        from corporate_reports.cli import main
+
+        _write_sample_csv(tmp_path)
+        map_path = tmp_path / "map.json"
+        map_path.write_text(
+            json.dumps({"jpcrp_cor:NumberOfEmployees": "社員数"}), encoding="utf-8"
+        )
+        with patch(
+            "sys.argv",
+            [
+                "corporate-reports",
+                "edinet",
+                "extract",
+                "--csv-dir",
+                str(tmp_path),
+                "--element-map",
+                str(map_path),
+            ],
+        ):
+            main()
+
+        data = json.loads(capsys.readouterr().out)
+        assert data["指標"]["当期"] == {"社員数": 295}
+        assert data["facts"][0]["element_id"] == (
+            "jpcrp_cor:NetSalesSummaryOfBusinessResults"
+        )
+        assert data["facts"][0]["value"] == 9697800000
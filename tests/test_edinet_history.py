@@ -0,0 +1,138 @@
+"""
+複数年の有報からの長期時系列の組み立てのユニットテスト
+"""
+
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+os.environ["EDINET_API_KEY"] = "test_api_key_12345"
+
+from corporate_reports.edinet import EdinetAPIError
+from corporate_reports.edinet_history import stitch_history
+from tests.test_edinet_warehouse import ROE, write_filing
+
+FY2023 = "jpcrp030000-asr-001_E00001-000_2023-03-31_01_2023-06-28.csv"
+FY2024 = "jpcrp030000-asr-001_E00001-000_2024-03-31_01_2024-06-27.csv"
+FY2024_AMENDED = "jpcrp030000-asr-001_E00001-000_2024-03-31_02_2024-09-10.csv"
+
+
+def _extraction(source: str, summary: dict) -> dict:
+    return {"source": f"S100A_5.zip!XBRL_TO_CSV/{source}", "経営指標等": summary}
+
+
+class TestStitchHistory:
+    """stitch_history のテスト"""
+
+    def test_latest_filing_wins(self):
+        history = stitch_history(
+            [
+                # 新しい順に渡しても提出日順に重ねる
+                _extraction(
+                    FY2024,
+                    {
+                        "当期": {"売上高": 130, "ROE": 0.07},
+                        "1期前": {"売上高": 121, "ROE": None},
+                    },
+                ),
+                _extraction(
+                    FY2023,
+                    {
+                        "当期": {"売上高": 120, "ROE": 0.06},
+                        "4期前": {"売上高": 100},
+                        "3期前": {},
+                    },
+                ),
+            ]
+        )
+
+        assert history["edinetCode"] == "E00001"
+        assert list(history["経営指標等"]) == ["2019", "2023", "2024"]
+        assert history["経営指標等"]["2023"] == {"売上高": 121, "ROE": 0.06}
+        assert history["provenance"]["2023"] == {"売上高": FY2024, "ROE": FY2023}
+        assert history["restated"] == [
+            {
+                "fiscalYear": 2023,
+                "key": "売上高",
+                "value": 121,
+                "previous": 120,
+                "source": FY2024,
+            }
+        ]
+        assert history["filings"] == [FY2023, FY2024]
+
+    def test_amendment_overrides_original(self):
+        history = stitch_history(
+            [
+                _extraction(FY2024_AMENDED, {"当期": {"売上高": 131}}),
+                _extraction(FY2024, {"当期": {"売上高": 130}}),
+            ]
+        )
+        assert history["経営指標等"]["2024"]["売上高"] == 131
+        assert history["provenance"]["2024"]["売上高"] == FY2024_AMENDED
+
+    def test_multiple_companies(self):
+        other = FY2024.replace("E00001", "E00002")
+        extractions = [
+            _extraction(FY2024, {"当期": {"売上高": 130}}),
+            _extraction(other, {"当期": {"売上高": 5}}),
+        ]
+        with pytest.raises(EdinetAPIError, match="E00001, E00002"):
+            stitch_history(extractions)
+        history = stitch_history(extractions, edinet_code="E00002")
+        assert history["経営指標等"] == {"2024": {"売上高": 5}}
+
+    def test_unknown_source(self):
+        with pytest.raises(EdinetAPIError):
+            stitch_history([{"source": "x.csv", "経営指標等": {}}])
+
+
+class TestHistoryCLI:
+    """edinet history CLI コマンドのテスト"""
+
+    def test_saved_json_and_new_filing(self, tmp_path, capsys):
+        from corporate_reports.cli import main
+
+        saved = tmp_path / "fy2023.ndjson"
+        saved.write_text(
+            json.dumps(
+                {
+                    "path": "a",
+                    "status": "success",
+                    **_extraction(FY2023, {"当期": {"ROE": 0.06}}),
+                },
+                ensure_ascii=False,
+            )
+            + "\n"
+            + json.dumps({"path": "b", "status": "error", "message": "x"})
+            + "\n",
+            encoding="utf-8",
+        )
+        csv_dir = write_filing(
+            tmp_path,
+            "E00001",
+            "2024-03-31",
+            "2024-06-27",
+            {(ROE, "CurrentYearDuration"): "0.07"},
+        )
+        with patch(
+            "sys.argv",
+            [
+                "corporate-reports",
+                "edinet",
+                "history",
+                "--json",
+                str(saved),
+                "--csv-dirs",
+                str(csv_dir),
+                "--workers",
+                "1",
+            ],
+        ):
+            main()
+
+        history = json.loads(capsys.readouterr().out)
+        assert history["経営指標等"]["2023"] == {"ROE": 0.06}
+        assert history["経営指標等"]["2024"] == {"ROE": 0.07}
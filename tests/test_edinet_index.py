@@ -0,0 +1,507 @@
+"""
+EDINET 書類一覧インデックスのユニットテスト
+"""
+
+import json
+import os
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+import pytest
+
+os.environ["EDINET_API_KEY"] = "test_api_key_12345"
+
+from corporate_reports.edinet import JST, EdinetAPIError
+from corporate_reports.edinet_index import (
+    EdinetIndex,
+    filter_watch_list,
+    search_documents_range,
+)
+
+LISTINGS = {
+    "2025-03-26": [
+        {
+            "docID": "S100A",
+            "submitDateTime": "2025-03-26 15:00",
+            "secCode": "58190",
+            "edinetCode": "E01350",
+            "ordinanceCode": "010",
+            "formCode": "030000",
+            "docTypeCode": "120",
+            "filerName": "カナレ電気株式会社",
+        },
+        {
+            "docID": "S100B",
+            "submitDateTime": "2025-03-26 16:00",
+            "secCode": "99910",
+            "edinetCode": "E00000",
+            "ordinanceCode": "010",
+            "formCode": "043000",
+            "docTypeCode": "140",
+        },
+    ],
+    "2025-03-27": [
+        {
+            "docID": "S100C",
+            "submitDateTime": "2025-03-27 09:00",
+            "secCode": "58190",
+            "edinetCode": "E01350",
+            "ordinanceCode": "010",
+            "formCode": "030001",
+            "docTypeCode": "130",
+            "parentDocID": "S100A",
+        },
+        # 書類管理番号のない行は取り込まない
+        {"docID": None},
+    ],
+}
+
+
+def _fake_fetch(date, use_cache=True):
+    return LISTINGS.get(date, [])
+
+
+@pytest.fixture
+def index(tmp_path):
+    with patch(
+        "corporate_reports.edinet_index.fetch_document_list", side_effect=_fake_fetch
+    ):
+        with EdinetIndex(tmp_path / "index.sqlite3") as idx:
+            idx.build("2025-03-26", "2025-03-28")
+            yield idx
+
+
+class TestEdinetIndexBuild:
+    """EdinetIndex.build のテスト"""
+
+    def test_build_summary(self, tmp_path):
+        with patch(
+            "corporate_reports.edinet_index.fetch_document_list",
+            side_effect=_fake_fetch,
+        ) as mock_fetch:
+            with EdinetIndex(tmp_path / "index.sqlite3") as idx:
+                summary = idx.build("2025-03-26", "2025-03-28")
+
+        assert summary == {"dates": 3, "skipped": 0, "documents": 3}
+        assert mock_fetch.call_count == 3
+
+    def test_build_skips_ingested_past_dates(self, tmp_path):
+        """取り込み済みの過去日は再取得しない"""
+        path = tmp_path / "index.sqlite3"
+        with patch(
+            "corporate_reports.edinet_index.fetch_document_list",
+            side_effect=_fake_fetch,
+        ) as mock_fetch:
+            with EdinetIndex(path) as idx:
+                idx.build("2025-03-26", "2025-03-27")
+            with EdinetIndex(path) as idx:
+                summary = idx.build("2025-03-26", "2025-03-28")
+
+        assert summary["skipped"] == 2
+        assert summary["dates"] == 1
+        assert mock_fetch.call_count == 3
+
+    def test_build_refetches_day_ingested_while_today(self, tmp_path):
+        """当日のうちに取り込んだ日は、翌日以降の build で取り直す"""
+        path = tmp_path / "index.sqlite3"
+        listings = {**LISTINGS, "2025-03-28": [{"docID": "S100D"}]}
+
+        def fetch(date, use_cache=True):
+            return listings.get(date, [])
+
+        with patch(
+            "corporate_reports.edinet_index.fetch_document_list", side_effect=fetch
+        ) as mock_fetch:
+            with (
+                patch("corporate_reports.edinet_index.datetime", _FixedDatetime),
+                EdinetIndex(path) as idx,
+            ):
+                idx.build("2025-03-26", "2025-03-28")
+            mock_fetch.reset_mock()
+
+            listings["2025-03-28"] = [{"docID": "S100D"}, {"docID": "S100E"}]
+            with EdinetIndex(path) as idx:
+                summary = idx.build("2025-03-26", "2025-03-28")
+                assert idx.get("S100E") is not None
+                assert idx.is_complete("2025-03-28")
+
+        assert summary["skipped"] == 2
+        assert [c.args[0] for c in mock_fetch.call_args_list] == ["2025-03-28"]
+
+    def test_build_refresh_bypasses_listing_cache(self, tmp_path):
+        with patch(
+            "corporate_reports.edinet_index.fetch_document_list",
+            side_effect=_fake_fetch,
+        ) as mock_fetch:
+            with EdinetIndex(tmp_path / "index.sqlite3") as idx:
+                idx.build("2025-03-26", "2025-03-26")
+                summary = idx.build("2025-03-26", "2025-03-26", refresh=True)
+
+        assert summary["dates"] == 1
+        assert [c.kwargs for c in mock_fetch.call_args_list] == [
+            {"use_cache": True},
+            {"use_cache": False},
+        ]
+
+    def test_build_invalid_range(self, tmp_path):
+        with EdinetIndex(tmp_path / "index.sqlite3") as idx:
+            with pytest.raises(EdinetAPIError):
+                idx.build("2025-03-28", "2025-03-26")
+
+
+class TestEdinetIndexSearch:
+    """EdinetIndex.search のテスト"""
+
+    def test_search_by_sec_code(self, index):
+        results = index.search(sec_code="5819")
+        assert [r["docID"] for r in results] == ["S100A", "S100C"]
+
+    def test_search_by_form_code_and_range(self, index):
+        results = index.search(
+            date_from="2025-03-26", date_to="2025-03-26", form_code="030000"
+        )
+        assert [r["docID"] for r in results] == ["S100A"]
+
+    def test_search_date_to_is_inclusive(self, index):
+        results = index.search(date_from="2025-03-27", date_to="2025-03-27")
+        assert [r["docID"] for r in results] == ["S100C"]
+
+    def test_search_returns_raw_listing(self, index):
+        results = index.search(edinet_code="E01350", doc_type_code="120")
+        assert results == [LISTINGS["2025-03-26"][0]]
+
+    def test_search_documents_range(self, index):
+        results = search_documents_range(
+            "2025-01-01", sec_code="58190", ordinance_code="010", index_path=index.path
+        )
+        assert [r["docID"] for r in results] == ["S100A", "S100C"]
+
+
+class _FixedDatetime(datetime):
+    """sync の「当日」を 2025-03-28 (JST) に固定する"""
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2025, 3, 28, 12, 0, tzinfo=JST)
+
+
+class _NextDayDatetime(datetime):
+    """_FixedDatetime の翌日（2025-03-29 JST）"""
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2025, 3, 29, 12, 0, tzinfo=JST)
+
+
+@pytest.fixture
+def fixed_today():
+    with patch("corporate_reports.edinet_index.datetime", _FixedDatetime):
+        yield
+
+
+class TestEdinetIndexSync:
+    """EdinetIndex.sync のテスト"""
+
+    def test_first_sync_requires_from(self, tmp_path, fixed_today):
+        with EdinetIndex(tmp_path / "index.sqlite3") as idx:
+            with pytest.raises(EdinetAPIError, match="--from"):
+                idx.sync()
+
+    def test_sync_advances_watermark_to_yesterday(self, tmp_path, fixed_today):
+        with (
+            patch(
+                "corporate_reports.edinet_index.fetch_document_list",
+                side_effect=_fake_fetch,
+            ) as mock_fetch,
+            EdinetIndex(tmp_path / "index.sqlite3") as idx,
+        ):
+            summary = idx.sync(date_from="2025-03-26")
+
+        assert summary["dates"] == 3
+        assert summary["to"] == "2025-03-28"
+        # 当日分は提出が続くのでウォーターマークは前日まで
+        assert summary["watermark"] == "2025-03-27"
+        assert [r["docID"] for r in summary["new_documents"]] == [
+            "S100A",
+            "S100B",
+            "S100C",
+        ]
+        assert mock_fetch.call_count == 3
+
+    def test_resync_fetches_only_new_dates(self, tmp_path, fixed_today):
+        path = tmp_path / "index.sqlite3"
+        late_filing = {"docID": "S100D", "secCode": "58190", "formCode": "030000"}
+        listings = {**LISTINGS, "2025-03-28": []}
+
+        def fetch(date, use_cache=True):
+            return listings.get(date, [])
+
+        with patch(
+            "corporate_reports.edinet_index.fetch_document_list", side_effect=fetch
+        ) as mock_fetch:
+            with EdinetIndex(path) as idx:
+                idx.sync(date_from="2025-03-26")
+            mock_fetch.reset_mock()
+
+            listings["2025-03-28"] = [late_filing]
+            with EdinetIndex(path) as idx:
+                second = idx.sync()
+                third = idx.sync()
+
+        assert second["from"] == "2025-03-28"
+        assert second["new_documents"] == [late_filing]
+        # 同じ日を取り直しても既知の書類は新着にしない
+        assert third["new_documents"] == []
+        assert [c.args[0] for c in mock_fetch.call_args_list] == [
+            "2025-03-28",
+            "2025-03-28",
+        ]
+
+    def test_sync_skips_complete_dates(self, tmp_path, fixed_today):
+        """build 済みで完了している日は取り直さず、キャッシュも当日分以外は使う"""
+        with (
+            patch(
+                "corporate_reports.edinet_index.fetch_document_list",
+                side_effect=_fake_fetch,
+            ) as mock_fetch,
+            EdinetIndex(tmp_path / "index.sqlite3") as idx,
+        ):
+            idx.build("2025-03-26", "2025-03-27")
+            mock_fetch.reset_mock()
+            first = idx.sync(date_from="2025-03-26")
+            second = idx.sync()
+
+        assert first["skipped"] == 2
+        assert first["dates"] == 1
+        assert first["watermark"] == "2025-03-27"
+        assert second["skipped"] == 0
+        # まだ取り込んでいない日はキャッシュを使い、当日のうちに取り込んだ日だけ取り直す
+        assert [(c.args[0], c.kwargs) for c in mock_fetch.call_args_list] == [
+            ("2025-03-28", {"use_cache": True}),
+            ("2025-03-28", {"use_cache": False}),
+        ]
+
+    def test_resync_refetches_day_synced_while_today(self, tmp_path, fixed_today):
+        """前回当日だった日は翌日の sync でキャッシュを使わず取り直す"""
+        path = tmp_path / "index.sqlite3"
+        listings = {"2025-03-28": [{"docID": "S100D"}]}
+
+        def get(url, params, **kwargs):
+            response = Mock()
+            response.json.return_value = {
+                "metadata": {"status": "200"},
+                "results": list(listings.get(params["date"], [])),
+            }
+            return response
+
+        # 書類一覧のディスクキャッシュも通す（前回の一覧はキャッシュに残っている）
+        with (
+            patch("corporate_reports.edinet.EdinetClient._get", side_effect=get),
+            patch("corporate_reports.edinet.time.sleep"),
+        ):
+            with EdinetIndex(path) as idx:
+                first = idx.sync(date_from="2025-03-28")
+            # 初回が当日だけでも次回は --from なしで再開できる
+            assert first["watermark"] == "2025-03-27"
+
+            listings["2025-03-28"].append({"docID": "S100E"})
+            with (
+                patch("corporate_reports.edinet_index.datetime", _NextDayDatetime),
+                EdinetIndex(path) as idx,
+            ):
+                second = idx.sync()
+                assert idx.get("S100E") is not None
+
+        assert second["from"] == "2025-03-28"
+        assert [r["docID"] for r in second["new_documents"]] == ["S100E"]
+        assert second["watermark"] == "2025-03-28"
+
+
+AMENDMENTS = [
+    {
+        "docID": "S100D",
+        "submitDateTime": "2025-03-28 10:00",
+        "secCode": "58190",
+        "edinetCode": "E01350",
+        "ordinanceCode": "010",
+        "formCode": "030001",
+        "docTypeCode": "130",
+        "parentDocID": "S100A",
+        "withdrawalStatus": "0",
+    },
+    {
+        "docID": "S100E",
+        "submitDateTime": "2025-03-28 11:00",
+        "secCode": "58190",
+        "edinetCode": "E01350",
+        "ordinanceCode": "010",
+        "formCode": "030001",
+        "docTypeCode": "130",
+        "parentDocID": "S100C",
+        "withdrawalStatus": "2",
+    },
+]
+
+
+class TestAmendmentChain:
+    """訂正報告書の系列と最新版の解決のテスト"""
+
+    @pytest.fixture
+    def amended(self, index):
+        index.ingest("2025-03-28", AMENDMENTS)
+        return index
+
+    def test_chain_from_any_member(self, amended):
+        for doc_id in ("S100A", "S100C", "S100E"):
+            chain = amended.amendment_chain(doc_id)
+            assert [r["docID"] for r in chain] == ["S100A", "S100C", "S100D", "S100E"]
+        assert amended.original_doc_id("S100E") == "S100A"
+        assert [r["docID"] for r in amended.amendment_chain("S100B")] == ["S100B"]
+
+    def test_latest_effective_skips_withdrawn(self, amended):
+        assert amended.latest_effective("S100A")["docID"] == "S100D"
+        assert amended.latest_effective("S100B")["docID"] == "S100B"
+        assert amended.latest_effective("S999Z") is None
+
+    def test_resolve_latest(self, amended):
+        assert amended.resolve_latest(["S100A", "S100B", "S100C", "S999Z"]) == [
+            "S100D",
+            "S100B",
+            "S999Z",
+        ]
+
+    def test_watched_amendments(self, amended):
+        docs = LISTINGS["2025-03-27"][:1] + AMENDMENTS
+        matched = amended.watched_amendments(docs, ["5819"], form_code="030000")
+        assert [r["docID"] for r in matched] == ["S100C", "S100D", "S100E"]
+        assert amended.watched_amendments(docs, ["5819"], form_code="043000") == []
+
+    def test_amendment_of_unindexed_original(self, index):
+        orphan = {**AMENDMENTS[0], "docID": "S100F", "parentDocID": "S000X"}
+        matched = index.watched_amendments([orphan], ["5819"], form_code="030000")
+        assert matched == [orphan]
+        assert index.original_doc_id("S100F") == "S100F"
+
+
+class TestFilterWatchList:
+    def test_filter(self):
+        docs = LISTINGS["2025-03-26"] + LISTINGS["2025-03-27"][:1]
+        assert [r["docID"] for r in filter_watch_list(docs, ["5819"])] == [
+            "S100A",
+            "S100C",
+        ]
+        assert [
+            r["docID"]
+            for r in filter_watch_list(docs, ["58190", "9991"], form_code="043000")
+        ] == ["S100B"]
+
+
+class TestIndexCLI:
+    """edinet index CLI コマンドのテスト"""
+
+    def test_cli_index_build_and_search(self, tmp_path, capsys):
+        from corporate_reports.cli import main
+
+        db = str(tmp_path / "index.sqlite3")
+        with (
+            patch(
+                "corporate_reports.edinet_index.fetch_document_list",
+                side_effect=_fake_fetch,
+            ),
+            patch(
+                "sys.argv",
+                [
+                    "corporate-reports",
+                    "edinet",
+                    "index",
+                    "--index",
+                    db,
+                    "build",
+                    "--from",
+                    "2025-03-26",
+                    "--to",
+                    "2025-03-27",
+                ],
+            ),
+        ):
+            main()
+        summary = json.loads(capsys.readouterr().out)
+        assert summary["status"] == "success"
+        assert summary["documents"] == 3
+
+        with patch(
+            "sys.argv",
+            [
+                "corporate-reports",
+                "edinet",
+                "index",
+                "--index",
+                db,
+                "search",
+                "--sec-code",
+                "5819",
+                "--form-code",
+                "030000",
+            ],
+        ):
+            main()
+        results = json.loads(capsys.readouterr().out)
+        assert [r["docID"] for r in results] == ["S100A"]
+
+    def test_cli_sync_downloads_watch_list(self, tmp_path, capsys, fixed_today):
+        from corporate_reports.cli import main
+
+        results = [{"docID": "S100A", "type": "5", "file": "", "status": "downloaded"}]
+        with (
+            patch(
+                "corporate_reports.edinet_index.fetch_document_list",
+                side_effect=_fake_fetch,
+            ),
+            patch(
+                "corporate_reports.edinet_batch.download_batch", return_value=results
+            ) as mock_batch,
+            patch(
+                "sys.argv",
+                [
+                    "corporate-reports",
+                    "edinet",
+                    "sync",
+                    "--index",
+                    str(tmp_path / "index.sqlite3"),
+                    "--from",
+                    "2025-03-26",
+                    "--watch",
+                    "5819",
+                    "--form-code",
+                    "030000",
+                    "--output-dir",
+                    str(tmp_path / "out"),
+                ],
+            ),
+        ):
+            main()
+
+        output = json.loads(capsys.readouterr().out)
+        assert output["status"] == "success"
+        assert output["new"] == 3
+        # 原本に一致した訂正報告書も拾い、訂正済みの原本は取得しない
+        assert output["matched"] == ["S100A", "S100C"]
+        assert mock_batch.call_args.args[0] == ["S100C"]
+
+    def test_cli_index_chain(self, tmp_path, capsys):
+        from corporate_reports.cli import main
+
+        db = tmp_path / "index.sqlite3"
+        with EdinetIndex(db) as idx:
+            idx.ingest("2025-03-26", LISTINGS["2025-03-26"])
+            idx.ingest("2025-03-27", LISTINGS["2025-03-27"])
+            idx.ingest("2025-03-28", AMENDMENTS)
+
+        argv = ["corporate-reports", "edinet", "index", "--index", str(db)]
+        with patch("sys.argv", argv + ["chain", "S100C"]):
+            main()
+
+        output = json.loads(capsys.readouterr().out)
+        assert output["original"] == "S100A"
+        assert output["latest"] == "S100D"
+        assert len(output["chain"]) == 4
@@ -0,0 +1,146 @@
+"""
+EDINET カセット（記録・再生）とローカルモックサーバーのユニットテスト
+"""
+
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+os.environ["EDINET_API_KEY"] = "test_api_key_12345"
+
+from corporate_reports import edinet
+from corporate_reports.edinet import (
+    EdinetAPIError,
+    EdinetClient,
+    RateLimiter,
+    RetryPolicy,
+)
+from corporate_reports.edinet_mock import Cassette, MockEdinetServer, use_cassette
+
+LISTING = {
+    "metadata": {"status": "200"},
+    "results": [
+        {"docID": "S100A", "secCode": "58190", "formCode": "030000"},
+        {"docID": "S100B", "secCode": "99910", "formCode": "043000"},
+    ],
+}
+
+
+@pytest.fixture
+def cassette_dir(tmp_path):
+    path = tmp_path / "cassette"
+    (path / "documents").mkdir(parents=True)
+    (path / "files").mkdir()
+    (path / "documents" / "2025-03-26.json").write_text(
+        json.dumps(LISTING), encoding="utf-8"
+    )
+    (path / "files" / "S100A_2").write_bytes(b"%PDF-1.4 sample")
+    (path / "files" / "S100A_2.json").write_text(
+        json.dumps({"content_type": "application/pdf"}), encoding="utf-8"
+    )
+    return path
+
+
+def _client(**kwargs) -> EdinetClient:
+    return EdinetClient(rate_limiter=RateLimiter(rate=1_000_000, burst=1_000), **kwargs)
+
+
+class TestCassette:
+    def test_key_ignores_subscription_key(self, tmp_path):
+        cassette = Cassette(tmp_path)
+        url = (
+            "https://x/api/v2/documents.json?date=2025-03-26&type=2&Subscription-Key=k"
+        )
+        assert cassette.key(url) == tmp_path / "documents" / "2025-03-26.json"
+        url = "https://x/api/v2/documents/S100A?type=5&Subscription-Key=k"
+        assert cassette.key(url) == tmp_path / "files" / "S100A_5"
+        assert cassette.key("https://x/api/v2/other") is None
+
+
+class TestReplay:
+    """use_cassette(mode="replay") のテスト"""
+
+    def test_search_and_download_offline(self, cassette_dir, tmp_path):
+        client = _client()
+        use_cassette(client, cassette_dir)
+
+        results = client.search_documents("2025-03-26", sec_code="5819")
+        output = client.download_document("S100A", "2", str(tmp_path / "a.pdf"))
+
+        assert [r["docID"] for r in results] == ["S100A"]
+        assert (tmp_path / "a.pdf").read_bytes() == b"%PDF-1.4 sample"
+        assert output == str(tmp_path / "a.pdf")
+
+    def test_unrecorded_request_fails(self, cassette_dir, tmp_path):
+        client = _client()
+        use_cassette(client, cassette_dir)
+        with pytest.raises(EdinetAPIError, match="404"):
+            client.download_document("S100Z", "2", str(tmp_path / "z.pdf"))
+
+    def test_invalid_mode(self, cassette_dir):
+        with pytest.raises(EdinetAPIError):
+            use_cassette(_client(), cassette_dir, mode="rewind")
+
+    def test_default_client_from_env(self, cassette_dir, monkeypatch):
+        monkeypatch.setenv("EDINET_CASSETTE", str(cassette_dir))
+        results = edinet.fetch_document_list("2025-03-26", use_cache=False)
+        assert len(results) == 2
+
+
+class TestMockEdinetServer:
+    """MockEdinetServer のテスト（実際にローカルで HTTP 通信する）"""
+
+    def test_serves_cassette(self, cassette_dir, tmp_path):
+        with MockEdinetServer(cassette_dir) as server:
+            client = _client(base_url=server.base_url)
+            results = client.fetch_document_list("2025-03-26", use_cache=False)
+            data = client.fetch_document("S100A", "2")
+            with pytest.raises(EdinetAPIError):
+                client.fetch_document("S100Z", "2")
+
+        assert [r["docID"] for r in results] == ["S100A", "S100B"]
+        assert data == b"%PDF-1.4 sample"
+        assert server.stats == {"requests": 3, "throttled": 0, "not_found": 1}
+
+    def test_base_url_from_env(self, cassette_dir, monkeypatch):
+        with MockEdinetServer(cassette_dir) as server:
+            monkeypatch.setenv("EDINET_BASE_URL", server.base_url)
+            assert _client().fetch_document("S100A", "2") == b"%PDF-1.4 sample"
+
+    def test_injected_429_is_retried(self, cassette_dir):
+        with MockEdinetServer(cassette_dir, error_rate=1.0) as server:
+            client = _client(
+                base_url=server.base_url,
+                retry=RetryPolicy(max_retries=2, backoff_factor=0),
+            )
+            with patch("corporate_reports.edinet.time.sleep") as mock_sleep:
+                with pytest.raises(EdinetAPIError, match="429"):
+                    client.fetch_document("S100A", "2")
+
+        assert server.stats["throttled"] == 3
+        # Retry-After: 1 に従って待つ
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [1.0, 1.0]
+
+    def test_record_through_server(self, cassette_dir, tmp_path):
+        """サーバー経由で記録したカセットは元のカセットと同じ内容になる"""
+        recorded = tmp_path / "recorded"
+        with MockEdinetServer(cassette_dir) as server:
+            client = _client(base_url=server.base_url)
+            use_cassette(client, recorded, mode="record")
+            client.fetch_document_list("2025-03-26", use_cache=False)
+            client.fetch_document("S100A", "2")
+
+        assert (
+            json.loads(
+                (recorded / "documents" / "2025-03-26.json").read_text(encoding="utf-8")
+            )
+            == LISTING
+        )
+        assert (recorded / "files" / "S100A_2").read_bytes() == b"%PDF-1.4 sample"
+        meta = json.loads((recorded / "files" / "S100A_2.json").read_text())
+        assert meta["content_type"] == "application/pdf"
+        for path in recorded.rglob("*"):
+            if path.is_file():
+                assert b"test_api_key_12345" not in path.read_bytes()
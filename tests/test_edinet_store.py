@@ -0,0 +1,146 @@
+"""
+EDINET 書類のコンテンツアドレス型ストアのユニットテスト
+"""
+
+import json
+import os
+from unittest.mock import Mock, patch
+
+import pytest
+
+os.environ["EDINET_API_KEY"] = "test_api_key_12345"
+
+from corporate_reports.edinet import (
+    EdinetAPIError,
+    EdinetClient,
+    RateLimiter,
+    extract_document,
+)
+from corporate_reports.edinet_store import BlobStore
+from tests.test_edinet_extract import _sample_zip_bytes
+
+
+def _response(body: bytes):
+    response = Mock()
+    response.status_code = 200
+    response.iter_content = Mock(return_value=[body])
+    return response
+
+
+@pytest.fixture
+def client():
+    return EdinetClient(rate_limiter=RateLimiter(rate=1_000_000, burst=1_000))
+
+
+@pytest.fixture
+def store(tmp_path, client):
+    with BlobStore(tmp_path / "store", client=client) as s:
+        yield s
+
+
+class TestBlobStore:
+    """BlobStore のテスト"""
+
+    def test_fetch_once_then_local(self, store, client):
+        with patch.object(
+            client.session, "get", return_value=_response(b"pdf")
+        ) as mock_get:
+            first = store.fetch("S100A", "2")
+            second = store.fetch("S100A", "2")
+
+        assert first == second
+        assert first.read_bytes() == b"pdf"
+        assert first.parent.parent == store.root / "blobs"
+        assert mock_get.call_count == 1
+        assert not any((store.root / "tmp").iterdir())
+
+    def test_identical_content_shares_blob(self, store, client):
+        with patch.object(client.session, "get", return_value=_response(b"same")):
+            a = store.fetch("S100A", "2")
+            b = store.fetch("S100B", "2")
+
+        assert a == b
+        assert store.stats() == {"refs": 2, "blobs": 1, "bytes": 4}
+
+    def test_missing_blob_is_refetched(self, store, client):
+        with patch.object(
+            client.session, "get", return_value=_response(b"pdf")
+        ) as mock_get:
+            blob = store.fetch("S100A", "2")
+            os.chmod(blob, 0o644)
+            blob.unlink()
+            assert store.lookup("S100A", "2") is None
+            store.fetch("S100A", "2")
+
+        assert mock_get.call_count == 2
+
+    @pytest.mark.parametrize("mode", ["hardlink", "symlink", "copy"])
+    def test_link_modes(self, store, client, tmp_path, mode):
+        with patch.object(client.session, "get", return_value=_response(b"pdf")):
+            out = store.link("S100A", "2", tmp_path / "ws" / "a.pdf", mode=mode)
+        blob = store.lookup("S100A", "2")
+
+        assert out.read_bytes() == b"pdf"
+        assert (out.stat().st_ino == blob.stat().st_ino) == (mode != "copy")
+        assert out.is_symlink() == (mode == "symlink")
+
+    def test_link_replaces_existing_file(self, store, client, tmp_path):
+        out = tmp_path / "a.pdf"
+        out.write_bytes(b"old")
+        with patch.object(client.session, "get", return_value=_response(b"new")):
+            store.link("S100A", "2", out)
+        assert out.read_bytes() == b"new"
+
+    def test_invalid_link_mode(self, store, tmp_path):
+        with pytest.raises(EdinetAPIError):
+            store.link("S100A", "2", tmp_path / "a.pdf", mode="move")
+
+    def test_extract_document_from_store(self, store, client, tmp_path):
+        zip_bytes = _sample_zip_bytes(tmp_path)
+        with patch.object(
+            client.session, "get", return_value=_response(zip_bytes)
+        ) as mock_get:
+            first = extract_document("S100A", store=store)
+            second = extract_document("S100A", store=store)
+
+        assert first == second
+        assert first["source"].startswith("S100A!XBRL_TO_CSV/jpcrp030000-asr-")
+        assert first["経営指標等"]["当期"]["売上高"] == 12383109000
+        assert mock_get.call_count == 1
+
+
+class TestStoreCLI:
+    def test_download_twice_hits_store(self, tmp_path, capsys):
+        from corporate_reports.cli import main
+
+        store_dir = tmp_path / "store"
+        with patch(
+            "corporate_reports.edinet.requests.Session.get",
+            return_value=_response(b"pdf"),
+        ) as mock_get:
+            for workspace in ("a", "b"):
+                with patch(
+                    "sys.argv",
+                    [
+                        "corporate-reports",
+                        "edinet",
+                        "--store",
+                        str(store_dir),
+                        "download",
+                        "--doc-id",
+                        "S100A",
+                        "--type",
+                        "2",
+                        "--output",
+                        str(tmp_path / workspace / "report.pdf"),
+                    ],
+                ):
+                    main()
+
+        assert mock_get.call_count == 1
+        outputs = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert [o["status"] for o in outputs] == ["success", "success"]
+        a = tmp_path / "a" / "report.pdf"
+        b = tmp_path / "b" / "report.pdf"
+        assert a.read_bytes() == b.read_bytes() == b"pdf"
+        assert a.stat().st_ino == b.stat().st_ino
@@ -0,0 +1,214 @@
+"""
+財務ファクトのウェアハウスのユニットテスト
+"""
+
+import csv
+import json
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+os.environ["EDINET_API_KEY"] = "test_api_key_12345"
+
+from corporate_reports.edinet import EdinetAPIError, parse_asr_filename
+from corporate_reports.edinet_warehouse import FactWarehouse, resolve_metric
+from tests.test_edinet_extract import SAMPLE_HEADER
+
+ROE = "jpcrp_cor:RateOfReturnOnEquitySummaryOfBusinessResults"
+DIVIDEND = "jpcrp_cor:DividendPaidPerShareSummaryOfBusinessResults"
+
+
+def write_filing(
+    root: Path,
+    edinet_code: str,
+    period_end: str,
+    submit_date: str,
+    values: dict[tuple[str, str], str],
+    submission_no: str = "01",
+) -> Path:
+    """{(要素ID, コンテキストID): 値} から有報 CSV ディレクトリを作る"""
+    csv_dir = root / f"{edinet_code}_{period_end}_{submission_no}"
+    (csv_dir / "XBRL_TO_CSV").mkdir(parents=True)
+    name = (
+        f"jpcrp030000-asr-001_{edinet_code}-000_{period_end}_{submission_no}"
+        f"_{submit_date}.csv"
+    )
+    with open(
+        csv_dir / "XBRL_TO_CSV" / name, "w", encoding="utf-16le", newline=""
+    ) as f:
+        writer = csv.writer(f, delimiter="\t", quoting=csv.QUOTE_ALL)
+        writer.writerow(SAMPLE_HEADER)
+        for (element_id, context_id), value in values.items():
+            writer.writerow([element_id, "", context_id, "", "", "", "pure", "", value])
+    return csv_dir
+
+
+@pytest.fixture
+def filings(tmp_path):
+    return [
+        write_filing(
+            tmp_path,
+            "E00001",
+            "2023-03-31",
+            "2023-06-28",
+            {
+                (ROE, "Prior1YearDuration"): "0.05",
+                (ROE, "CurrentYearDuration"): "0.06",
+                (DIVIDEND, "CurrentYearDuration_NonConsolidatedMember"): "20",
+                # セグメントの値はパネルに使わない
+                (ROE, "CurrentYearDuration_ReportableSegmentMember"): "0.5",
+                ("jpcrp_cor:CompanyNameCoverPage", "FilingDateInstant"): "テキスト",
+            },
+        ),
+        write_filing(
+            tmp_path,
+            "E00001",
+            "2024-03-31",
+            "2024-06-27",
+            {
+                # 前期の値が修正再表示された
+                (ROE, "Prior1YearDuration"): "0.061",
+                (ROE, "CurrentYearDuration"): "0.07",
+            },
+        ),
+        write_filing(
+            tmp_path,
+            "E00002",
+            "2023-12-31",
+            "2024-03-28",
+            {(ROE, "CurrentYearDuration"): "0.1"},
+        ),
+    ]
+
+
+class TestParseAsrFilename:
+    def test_parse(self):
+        info = parse_asr_filename(
+            "S100A_5.zip!XBRL_TO_CSV/"
+            "jpcrp030000-asr-001_E01350-000_2024-12-31_02_2025-04-10.csv"
+        )
+        assert info is not None
+        assert info.edinet_code == "E01350"
+        assert info.period_end == "2024-12-31"
+        assert info.submission_no == 2
+        assert info.submit_date == "2025-04-10"
+        assert info.fiscal_year("当期") == 2024
+        assert info.fiscal_year("4期前") == 2020
+
+    def test_not_asr(self):
+        assert parse_asr_filename("jpaud-aar-cn-001_E01350-000.csv") is None
+
+
+class TestFactWarehouse:
+    """FactWarehouse のテスト"""
+
+    def test_panel_latest_filing_wins(self, tmp_path, filings):
+        with FactWarehouse(tmp_path / "facts.sqlite3") as warehouse:
+            summary = warehouse.ingest_many(filings, max_workers=2)
+            panel = warehouse.panel("ROE")
+
+        assert summary == {"ingested": 3, "skipped": 0, "error": 0, "facts": 7}
+        assert [(r["edinetCode"], r["fiscalYear"], r["value"]) for r in panel] == [
+            ("E00001", 2022, 0.05),
+            ("E00001", 2023, 0.061),
+            ("E00001", 2024, 0.07),
+            ("E00002", 2023, 0.1),
+        ]
+        assert panel[1]["filingName"].endswith("_2024-06-27.csv")
+
+    def test_panel_filters(self, tmp_path, filings):
+        with FactWarehouse(tmp_path / "facts.sqlite3") as warehouse:
+            for source in filings:
+                warehouse.ingest(source)
+            by_year = warehouse.panel("ROE", year_from=2023, year_to=2023)
+            by_code = warehouse.panel(ROE, edinet_codes=["E00002"])
+            dividend = warehouse.panel("1株配当")
+            consolidated_dividend = warehouse.panel(DIVIDEND)
+            unknown = warehouse.panel("jpcrp_cor:Unknown")
+
+        assert [r["value"] for r in by_year] == [0.061, 0.1]
+        assert [r["edinetCode"] for r in by_code] == ["E00002"]
+        assert [(r["fiscalYear"], r["value"]) for r in dividend] == [(2023, 20)]
+        assert consolidated_dividend == []
+        assert unknown == []
+
+    def test_reingest_skips_and_persists(self, tmp_path, filings):
+        db = tmp_path / "facts.sqlite3"
+        with FactWarehouse(db) as warehouse:
+            assert warehouse.ingest(filings[0]) == 4
+        with FactWarehouse(db) as warehouse:
+            with patch("corporate_reports.edinet_warehouse.extract_facts") as mock:
+                assert warehouse.ingest(filings[0]) is None
+                mock.assert_not_called()
+            assert warehouse.ingest(filings[0], refresh=True) == 4
+            assert warehouse.stats() == {"filings": 1, "companies": 1, "facts": 4}
+            assert warehouse.panel("ROE")[0]["value"] == 0.05
+
+    def test_failure_does_not_abort(self, tmp_path, filings):
+        missing = tmp_path / "missing"
+        missing.mkdir()
+        with FactWarehouse(tmp_path / "facts.sqlite3") as warehouse:
+            summary = warehouse.ingest_many([filings[2], missing], max_workers=1)
+            assert warehouse.stats()["filings"] == 1
+        assert summary["error"] == 1
+        assert summary["ingested"] == 1
+
+    def test_resolve_metric(self):
+        assert resolve_metric("ROE") == (ROE, False)
+        assert resolve_metric("配当性向") == (
+            "jpcrp_cor:PayoutRatioSummaryOfBusinessResults",
+            True,
+        )
+        with pytest.raises(EdinetAPIError):
+            resolve_metric("unknown")
+
+
+class TestWarehouseCLI:
+    """edinet warehouse CLI コマンドのテスト"""
+
+    def test_ingest_and_panel(self, tmp_path, filings, capsys):
+        from corporate_reports.cli import main
+
+        db = str(tmp_path / "facts.sqlite3")
+        with patch(
+            "sys.argv",
+            [
+                "corporate-reports",
+                "edinet",
+                "warehouse",
+                "--db",
+                db,
+                "ingest",
+                "--glob",
+                str(tmp_path / "E*"),
+                "--workers",
+                "2",
+            ],
+        ):
+            main()
+        summary = json.loads(capsys.readouterr().out)
+        assert summary["status"] == "success"
+        assert summary["ingested"] == 3
+
+        with patch(
+            "sys.argv",
+            [
+                "corporate-reports",
+                "edinet",
+                "warehouse",
+                "--db",
+                db,
+                "panel",
+                "ROE",
+                "--from-year",
+                "2023",
+                "--wide",
+            ],
+        ):
+            main()
+        assert json.loads(capsys.readouterr().out) == {
+            "E00001": {"2023": 0.061, "2024": 0.07},
+            "E00002": {"2023": 0.1},
+        }